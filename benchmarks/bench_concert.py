@@ -0,0 +1,89 @@
+"""Benchmark memory and construction time of Concert against the old plain class.
+
+Usage:
+    python benchmarks/bench_concert.py [--count N] [--repeat N]
+
+The old class (per-instance ``__dict__`` and a ``datetime.now()`` call per
+object) is reproduced here as the baseline. Records mimic parsed listings:
+each has its own title/url/description strings while venue, town and
+source repeat across events, as they do in real loads.
+"""
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.base_scraper import Concert, start_batch  # noqa: E402
+
+
+class LegacyConcert:
+    """The Concert class before slots and batch timestamps."""
+
+    def __init__(self, title, venue, town, date, url=None, description=None, address=None, source=None):
+        self.title = title
+        self.venue = venue
+        self.town = town
+        self.date = date
+        self.url = url
+        self.description = description
+        self.address = address
+        self.source = source
+        self.scraped_at = datetime.now().isoformat()
+
+
+TOWNS = ["Boston", "Cambridge", "Somerville", "Newton", "Waltham", "Arlington", "Lexington"]
+
+
+def make_records(count: int):
+    """Build constructor kwargs the way a parser would: fresh strings per record."""
+    return [
+        {
+            "title": f"Family Concert {i}",
+            "venue": "".join(["Venue ", str(i % 50)]),
+            "town": "".join([TOWNS[i % len(TOWNS)]]),
+            "date": f"2025-06-{i % 28 + 1:02d}T10:00:00",
+            "url": f"https://example.com/events/{i}",
+            "description": f"Songs and stories for young kids, event {i}",
+            "address": f"{i} Main St",
+            "source": "".join(["Mock", "Data"]),
+        }
+        for i in range(count)
+    ]
+
+
+def measure_memory(cls, records):
+    """Return bytes allocated to build the objects, excluding the input records."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(**r) for r in records]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Concerts built per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per class")
+    args = parser.parse_args()
+
+    start_batch()
+    print(f"{'class':<16}{'MB':>10}{'bytes/obj':>11}{'build ms':>10}{'objs/s':>12}")
+    for name, cls in [("LegacyConcert", LegacyConcert), ("Concert", Concert)]:
+        memory = measure_memory(cls, make_records(args.count))
+        records = make_records(args.count)
+        seconds = min(timeit.repeat(lambda: [cls(**r) for r in records], number=1, repeat=args.repeat))
+        print(
+            f"{name:<16}{memory / 1e6:>10.1f}{memory / args.count:>11.0f}"
+            f"{seconds * 1000:>10.1f}{args.count / seconds:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark incremental aggregate-cube updates and queries against regrouping the history.
+
+Usage:
+    python benchmarks/bench_cube.py [--history N] [--run N]
+
+A history of listings is counted into the cube once. A run then brings
+``--run`` listings: mostly unchanged, some new, some moved to another month.
+The baseline regroups the whole history with pandas, as answering from
+``concerts.csv`` must (without even re-reading the file). Loading the
+cube for a query reads only its cell counts; an update also replays the
+membership log, once per run.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.config import BOSTON_METRO_TOWNS, SOURCE_PRIORITY  # noqa: E402
+from scraper.cube import AggregateCube  # noqa: E402
+from scraper.gazetteer import VENUES  # noqa: E402
+
+TITLES = ["Kids Rock Concert", "Family Folk Festival", "Jazz Night", "Youth Orchestra", "Indie Band Showcase"]
+
+
+def listing(rng: random.Random, eid: int):
+    town = rng.choice(BOSTON_METRO_TOWNS)
+    return {
+        "event_id": f"e{eid}",
+        "title": rng.choice(TITLES),
+        "town": town,
+        "venue": rng.choice(VENUES[town]),
+        "source": rng.choice(SOURCE_PRIORITY),
+        "start": f"{rng.choice([2024, 2025])}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00-04:00",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=1_000_000, help="Listings already counted")
+    parser.add_argument("--run", type=int, default=5_000, help="Listings in the new run")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    history = [listing(rng, i) for i in range(args.history)]
+    path = Path(tempfile.mkdtemp()) / "cube"
+
+    start = time.perf_counter()
+    cube = AggregateCube(str(path))
+    cube.rebuild(history)
+    build = time.perf_counter() - start
+    cube.save()
+
+    # A run: 80% seen before unchanged, 10% new, 10% moved to another month
+    run = []
+    for i in range(args.run):
+        if i % 10 < 8:
+            run.append(history[rng.randrange(args.history)])
+        elif i % 10 == 8:
+            run.append(listing(rng, args.history + i))
+        else:
+            moved = dict(history[rng.randrange(args.history)])
+            moved["start"] = "2026-01-15T10:00:00-05:00"
+            run.append(moved)
+
+    start = time.perf_counter()
+    cube = AggregateCube(str(path))
+    len(cube)
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    len(cube.members)
+    replay = time.perf_counter() - start
+    start = time.perf_counter()
+    result = cube.update(run)
+    update = time.perf_counter() - start
+    start = time.perf_counter()
+    cube.save()
+    save = time.perf_counter() - start
+
+    frame = pd.DataFrame(history + run).drop_duplicates("event_id", keep="last")
+    frame["month"] = frame["start"].str.slice(0, 7)
+    frame["child_friendly"] = frame["title"].str.lower().str.contains("kids|family|youth")
+    start = time.perf_counter()
+    frame.groupby(["town", "month", "source", "venue", "child_friendly"], observed=True).size()
+    regroup = time.perf_counter() - start
+
+    queries = 1000
+    start = time.perf_counter()
+    for _ in range(queries):
+        cube.group(["month"], town="Somerville", child_friendly=True)
+    cube_query = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for _ in range(20):
+        frame[(frame["town"] == "Somerville") & frame["child_friendly"]].groupby("month").size()
+    pandas_query = (time.perf_counter() - start) / 20
+
+    print(f"{args.history:,} listings counted, run of {args.run:,}: {result}")
+    print(f"initial count of the history:        {build:8.2f}s")
+    print(f"load counts (all a query reads):     {load * 1000:8.1f} ms")
+    print(f"replay memberships (to update):      {replay:8.2f}s")
+    print(f"incremental update:                  {update * 1000:8.1f} ms")
+    print(f"save (append changes, write counts): {save * 1000:8.1f} ms")
+    print(f"pandas regroup of the whole history: {regroup * 1000:8.1f} ms  ({regroup / update:.0f}x the update)")
+    print(f"per query, cube rollup:              {cube_query * 1000:8.3f} ms")
+    print(f"per query, pandas filter + groupby:  {pandas_query * 1000:8.3f} ms  ({pandas_query / cube_query:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
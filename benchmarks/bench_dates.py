@@ -0,0 +1,87 @@
+"""Benchmark date normalization with per-source format memoization against trial and error.
+
+Usage:
+    python benchmarks/bench_dates.py [--count N]
+
+Dates are generated in the formats real sources use, grouped by source as
+they are in a scrape batch. The baseline tries every known format in turn
+for each date with an uncached ``strptime``, as a parser without
+memoization must.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper import dates  # noqa: E402
+from scraper.dates import FORMATS, DateNormalizer  # noqa: E402
+
+SCRAPED = datetime(2025, 6, 1)
+
+
+def make_dates(count: int):
+    """Return (date, source) pairs in each source's own format."""
+    rng = random.Random(0)
+    writers = {
+        "Boston.gov": lambda d: d.strftime("%A, %B %d, %Y · %I:%M%p") + (d + timedelta(hours=2)).strftime(" - %I:%M%p"),
+        "Boston Public Library": lambda d: d.strftime("%A, %B %-d"),
+        "BostonCentral": lambda d: d.strftime("%b %-d"),
+        "Eventbrite": lambda d: d.strftime("%Y-%m-%dT%H:%M:%S"),
+        "Cambridge Public Library": lambda d: d.strftime("%Y-%m-%dT%H:%M:%S-04:00"),
+    }
+    pairs = []
+    for source, write in writers.items():
+        for _ in range(count // len(writers)):
+            day = SCRAPED + timedelta(days=rng.randrange(200), hours=rng.randrange(9, 20))
+            pairs.append((write(day), source))
+    return pairs
+
+
+def trial_and_error(pairs, tz):
+    for value, _ in pairs:
+        for date_format in FORMATS:
+            if date_format.parse(value, tz, SCRAPED) is not None:
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="Dates to parse")
+    args = parser.parse_args()
+
+    pairs = make_dates(args.count)
+    normalizer = DateNormalizer()
+
+    cached = dates._strptime
+    dates._strptime = datetime.strptime
+    start = time.perf_counter()
+    trial_and_error(pairs, normalizer.tz)
+    baseline = time.perf_counter() - start
+    dates._strptime = cached
+
+    start = time.perf_counter()
+    trial_and_error(pairs, normalizer.tz)
+    trial_cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value, source in pairs:
+        normalizer.parse(value, source, SCRAPED)
+    memoized = time.perf_counter() - start
+
+    print(f"{len(pairs):,} dates")
+    print(f"trial and error:               {baseline:6.2f}s  {len(pairs) / baseline:>10,.0f} dates/s")
+    print(f"trial and error, cached days:  {trial_cached:6.2f}s  {len(pairs) / trial_cached:>10,.0f} dates/s")
+    print(
+        f"memoized format, cached days:  {memoized:6.2f}s  {len(pairs) / memoized:>10,.0f} dates/s"
+        f"  ({baseline / memoized:.1f}x)"
+    )
+    print(f"outcomes: {dict(normalizer.totals())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark blocked deduplication against all-pairs comparison.
+
+Usage:
+    python benchmarks/bench_dedup.py [--sizes N [N ...]] [--pairwise-max N]
+
+Synthetic listings spread over a year and the metro towns, with a third of
+the concerts listed again by a second source under a slightly different
+title and venue. All-pairs comparison is only timed up to
+``--pairwise-max`` listings, since it grows quadratically.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.config import BOSTON_METRO_TOWNS  # noqa: E402
+from scraper.dedup import Deduplicator, _Listing  # noqa: E402
+
+WORDS = ["kids", "family", "rock", "jazz", "folk", "songs", "stories", "orchestra", "chorus", "dance", "party", "music"]
+
+
+def make_listings(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    listings = []
+    while len(listings) < count:
+        day = (start + timedelta(days=rng.randrange(365))).isoformat()
+        title = " ".join(rng.sample(WORDS, 4)).title()
+        record = {
+            "title": title,
+            "venue": f"Hall {rng.randrange(40)}",
+            "town": rng.choice(BOSTON_METRO_TOWNS),
+            "date": f"{day}T{rng.choice(['10', '14', '19'])}:00:00",
+            "source": "Eventbrite",
+        }
+        listings.append(record)
+        if rng.random() < 1 / 3:
+            listings.append(dict(record, title=f"{title}!", venue=f"The {record['venue']}", source="Time Out Boston"))
+    return listings[:count]
+
+
+def pairwise(dedup: Deduplicator, records):
+    """Compare every listing with every earlier group, ignoring blocks."""
+    groups = []
+    for record in records:
+        listing = _Listing(record)
+        for group in groups:
+            if dedup.block_key(group[0].record) == dedup.block_key(record) and dedup.is_duplicate(group[0], listing):
+                group.append(listing)
+                break
+        else:
+            groups.append([listing])
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000, 100_000])
+    parser.add_argument("--pairwise-max", type=int, default=5_000)
+    args = parser.parse_args()
+
+    dedup = Deduplicator()
+    print(f"{'listings':>10}{'concerts':>10}{'blocked ms':>12}{'pairwise ms':>13}")
+    for size in args.sizes:
+        records = make_listings(size)
+        started = time.perf_counter()
+        merged = dedup.deduplicate(records)
+        blocked_ms = (time.perf_counter() - started) * 1000
+
+        pairwise_ms = "-"
+        if size <= args.pairwise_max:
+            started = time.perf_counter()
+            pairwise(dedup, records)
+            pairwise_ms = f"{(time.perf_counter() - started) * 1000:.0f}"
+        print(f"{size:>10}{len(merged):>10}{blocked_ms:>12.0f}{pairwise_ms:>13}")
+
+
+if __name__ == "__main__":
+    main()
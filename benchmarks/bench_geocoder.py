@@ -0,0 +1,73 @@
+"""Benchmark geocoding a large batch of concerts with and without the address cache.
+
+Usage:
+    python benchmarks/bench_geocoder.py [--count N]
+
+Concerts repeat the mock dataset's venues with varied spellings of their
+addresses, as listings from several sources do. The baseline resolves every
+concert against the gazetteer; the geocoder resolves each distinct address
+once, first with an empty cache and then with the cache the first run
+saved.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.gazetteer import VENUES  # noqa: E402
+from scraper.geocoder import Geocoder  # noqa: E402
+from scraper.table import ConcertTable  # noqa: E402
+
+
+def make_records(count: int):
+    rng = random.Random(0)
+    venues = [(venue, town) for town, names in VENUES.items() for venue in names]
+    spellings = ["{number} Main Street, {town}, MA", "{number} Main St, {town}", "{number} Main St., {town} MA", ""]
+    records = []
+    for i in range(count):
+        venue, town = rng.choice(venues)
+        address = rng.choice(spellings).format(number=len(venue), town=town)
+        records.append({"title": f"Concert {i}", "venue": venue, "town": town, "address": address})
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Concerts to geocode")
+    args = parser.parse_args()
+
+    records = make_records(args.count)
+    cache_path = str(Path(tempfile.mkdtemp()) / "geocode_cache.json")
+
+    geocoder = Geocoder(cache_path=cache_path)
+    start = time.perf_counter()
+    for record in records:
+        geocoder.locate(record["venue"], record["address"], record["town"])
+    baseline = time.perf_counter() - start
+
+    timings = {}
+    for label in ("empty cache", "warm cache"):
+        table = ConcertTable.from_concerts(records)
+        table.frame  # Build the frame outside the timing
+        start = time.perf_counter()
+        geocoder = table.geocode(Geocoder(cache_path=cache_path))
+        geocoder.save()
+        timings[label] = (time.perf_counter() - start, geocoder.resolved)
+
+    print(f"{len(records):,} concerts")
+    print(f"gazetteer per concert:    {baseline:6.2f}s  {len(records) / baseline:>10,.0f} concerts/s")
+    for label, (elapsed, resolved) in timings.items():
+        print(
+            f"geocoder, {label + ':':<14} {elapsed:6.2f}s  {len(records) / elapsed:>10,.0f} concerts/s"
+            f"  ({baseline / elapsed:.1f}x, {resolved} addresses resolved)"
+        )
+    print(f"precision: {dict(geocoder.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark heat-map binning and serving precomputed grids against rebinning per request.
+
+Usage:
+    python benchmarks/bench_heatmap.py [--count N] [--requests N]
+
+Concerts are scattered around the metro venues over two years. The
+baseline bins each (level, window) grid separately with ``np.histogram2d``,
+as a server answering each request from raw events must. The engine bins
+every event once and derives the rest; requests then slice saved grids.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper import config  # noqa: E402
+from scraper.geocoder import VENUE_COORDINATES  # noqa: E402
+from scraper.heatmap import HeatmapGrids, gaussian_smooth  # noqa: E402
+from scraper.table import ConcertTable  # noqa: E402
+
+
+def make_table(count: int) -> ConcertTable:
+    rng = np.random.default_rng(0)
+    venues = np.array(list(VENUE_COORDINATES.values()))
+    picks = rng.integers(len(venues), size=count)
+    first = datetime(2024, 7, 1)
+    starts = [(first + timedelta(days=int(d))).isoformat() for d in rng.integers(730, size=count)]
+    frame = pd.DataFrame(
+        {
+            "title": "Concert",
+            "venue": "Hall",
+            "latitude": venues[picks, 0] + rng.normal(0, 0.002, count),
+            "longitude": venues[picks, 1] + rng.normal(0, 0.002, count),
+            "start": starts,
+        }
+    )
+    table = ConcertTable()
+    table.extend(frame)
+    return table
+
+
+def histogram(latitudes, longitudes, cells):
+    south, west, north, east = config.HEATMAP_BOUNDS
+    counts, _, _ = np.histogram2d(latitudes, longitudes, bins=cells, range=[[south, north], [west, east]])
+    return gaussian_smooth(counts[None, ::-1], config.HEATMAP_SMOOTHING)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Concerts to bin")
+    parser.add_argument("--requests", type=int, default=100, help="Tile requests to serve")
+    args = parser.parse_args()
+
+    table = make_table(args.count)
+    frame = table.frame
+    latitudes = frame["latitude"].to_numpy(dtype=np.float64)
+    longitudes = frame["longitude"].to_numpy(dtype=np.float64)
+    months = table.dates().dt.strftime("%Y-%m").to_numpy(dtype=str)
+
+    start = time.perf_counter()
+    grids = HeatmapGrids.build(table)
+    build = time.perf_counter() - start
+    path = Path(tempfile.mkdtemp()) / "heatmap.npz"
+    grids.save(str(path))
+    grids = HeatmapGrids.load(str(path))
+    # Window masks are given to the baseline for free
+    masks = {window: slice(None) if window == "all" else np.char.startswith(months, window) for window in grids.windows}
+
+    start = time.perf_counter()
+    for window, mask in masks.items():
+        for cells in grids.levels:
+            histogram(latitudes[mask], longitudes[mask], cells)
+    separate = time.perf_counter() - start
+
+    rng = random.Random(0)
+    requests = [(rng.choice(grids.levels), rng.choice(grids.windows)) for _ in range(args.requests)]
+    start = time.perf_counter()
+    for cells, window in requests:
+        histogram(latitudes[masks[window]], longitudes[masks[window]], cells)
+    rebin = (time.perf_counter() - start) / len(requests)
+
+    size = config.HEATMAP_TILE_SIZE
+    start = time.perf_counter()
+    for cells, window in requests:
+        per_side = cells // min(size, cells)
+        grids.tile(cells, window, rng.randrange(per_side), rng.randrange(per_side)).copy()
+    served = (time.perf_counter() - start) / len(requests)
+
+    print(f"{args.count:,} concerts, levels {grids.levels}, {len(grids.windows)} windows, {path.stat().st_size:,} bytes")
+    print(f"histogram2d per level and window: {separate:7.2f}s")
+    print(f"bin once and derive:              {build:7.2f}s  ({separate / build:.1f}x)")
+    print(f"per request, rebinning raw events: {rebin * 1000:9.2f} ms")
+    print(f"per request, precomputed tile:     {served * 1000:9.4f} ms  ({rebin / served:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
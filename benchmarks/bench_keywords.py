@@ -0,0 +1,45 @@
+"""Benchmark child-friendly filtering: nested any() scan vs the compiled matcher.
+
+Usage:
+    python benchmarks/bench_keywords.py [--events N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.config import CHILD_FRIENDLY_KEYWORDS  # noqa: E402
+from scraper.keywords import CHILD_FRIENDLY  # noqa: E402
+
+WORDS = "jazz rock evening concert orchestra live show music hall tour night band folk songs".split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000, help="Synthetic events to filter")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = WORDS * 4 + CHILD_FRIENDLY_KEYWORDS
+    texts = [" ".join(rng.choices(vocabulary, k=12)).title() for _ in range(args.events)]
+
+    start = time.perf_counter()
+    old = [any(keyword.lower() in text.lower() for keyword in CHILD_FRIENDLY_KEYWORDS) for text in texts]
+    old_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = CHILD_FRIENDLY.search_many(texts)
+    new_s = time.perf_counter() - start
+
+    assert old == new
+    print(f"{args.events} events, {sum(new)} child-friendly")
+    print(f"nested any():     {old_s:.2f}s")
+    print(f"compiled matcher: {new_s:.2f}s ({old_s / new_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
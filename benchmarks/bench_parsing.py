@@ -0,0 +1,73 @@
+"""Benchmark parse-and-extract time per page: BeautifulSoup path vs lxml fast path.
+
+Usage:
+    python benchmarks/bench_parsing.py [--html-dir DIR] [--scale N] [--repeat N]
+
+By default the saved pages in tests/fixtures are used. Each page body is
+repeated ``--scale`` times so the page approaches the size of a real
+listing page. Pass ``--html-dir`` to benchmark other saved pages; files are
+matched to sites by the same names as the fixtures.
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.parsers import EXTRACTORS  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+PAGES = [
+    ("boston_gov", "boston_gov_events.html", "https://www.boston.gov", {}),
+    (
+        "library",
+        "library_calendar.html",
+        "https://www.bpl.org",
+        {"town": "Boston", "source": "Boston Public Library", "default_venue": "Boston Public Library"},
+    ),
+    ("timeout", "timeout_listing.html", "https://www.timeout.com", {}),
+    ("boston_com", "boston_com_listing.html", "https://www.boston.com", {}),
+    ("boston_central", "boston_central_events.html", "https://www.bostoncentral.com", {}),
+]
+
+
+def scale_page(content: bytes, scale: int) -> bytes:
+    """Repeat the page body ``scale`` times."""
+    head, sep, rest = content.partition(b"<body>")
+    body, end, tail = rest.partition(b"</body>")
+    if not sep or not end:
+        return content
+    return head + sep + body * scale + end + tail
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html-dir", type=Path, default=FIXTURES, help="Directory of saved pages")
+    parser.add_argument("--scale", type=int, default=40, help="Times to repeat each page body")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per page")
+    args = parser.parse_args()
+
+    print(f"{'site':<16}{'size':>10}{'records':>9}{'soup ms':>10}{'fast ms':>10}{'speedup':>9}")
+    for site, filename, base_url, options in PAGES:
+        path = args.html_dir / filename
+        if not path.exists():
+            print(f"{site:<16}{'missing':>10}")
+            continue
+        content = scale_page(path.read_bytes(), args.scale)
+        fast, soup = EXTRACTORS[site]
+
+        records = fast(content, "utf-8", base_url, **options)
+        soup_ms = min(timeit.repeat(lambda: soup(content, "utf-8", base_url, **options), number=1, repeat=args.repeat)) * 1000
+        fast_ms = min(timeit.repeat(lambda: fast(content, "utf-8", base_url, **options), number=1, repeat=args.repeat)) * 1000
+
+        print(
+            f"{site:<16}{len(content) // 1024:>8}KB{len(records):>9}"
+            f"{soup_ms:>10.2f}{fast_ms:>10.2f}{soup_ms / fast_ms:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
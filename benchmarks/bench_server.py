@@ -0,0 +1,137 @@
+"""Benchmark the query server's indexes against re-reading the saved concerts per request.
+
+Usage:
+    python benchmarks/bench_server.py [--count N] [--requests N] [--clients N]
+
+Concerts are spread over the metro towns and two years. The baseline
+answers a town and date-range request the way a handler reading
+``concerts.json`` would: load the file, filter and sort. The index answers
+from bisections. The HTTP part sends requests from several client threads
+while the dataset is rewritten and hot-swapped, and counts failures.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.config import BOSTON_METRO_TOWNS, SOURCE_PRIORITY  # noqa: E402
+from scraper.server import ConcertIndex, ConcertServer  # noqa: E402
+from scraper.writers import atomic_open  # noqa: E402
+
+
+def make_concerts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    first = datetime(2024, 7, 1, 10)
+    return [
+        {
+            "event_id": f"e{i}",
+            "title": f"Concert {i}",
+            "venue": "Hall",
+            "town": rng.choice(BOSTON_METRO_TOWNS),
+            "source": rng.choice(SOURCE_PRIORITY),
+            "start": (first + timedelta(hours=rng.randrange(730 * 24))).isoformat() + "-04:00",
+        }
+        for i in range(count)
+    ]
+
+
+def requests_for(count: int):
+    rng = random.Random(1)
+    queries = []
+    for _ in range(count):
+        since = datetime(2024, 7, 1) + timedelta(days=rng.randrange(700))
+        until = since + timedelta(days=30)
+        queries.append((rng.choice(BOSTON_METRO_TOWNS), since.date().isoformat(), until.date().isoformat()))
+    return queries
+
+
+def reread(path: Path, town: str, since: str, until: str):
+    with open(path) as f:
+        concerts = json.load(f)
+    matches = [c for c in concerts if c["town"] == town and since <= c["start"][:10] <= until]
+    return sorted(matches, key=lambda c: c["start"])[:50]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Saved concerts")
+    parser.add_argument("--requests", type=int, default=10_000, help="Requests to send")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent HTTP clients")
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "concerts.json"
+    path.write_text(json.dumps(make_concerts(args.count)))
+    queries = requests_for(args.requests)
+
+    start = time.perf_counter()
+    for town, since, until in queries[:10]:
+        reread(path, town, since, until)
+    baseline = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    index = ConcertIndex.load(str(path))
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for town, since, until in queries:
+        index.page(index.query(town=town, since=since, until=until), 0, 50)
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    server = ConcertServer(("127.0.0.1", 0), str(path), reload_interval=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    failures = []
+    pending = iter(queries)
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                query = next(pending, None)
+            if query is None:
+                return
+            town, since, until = query
+            url = f"http://127.0.0.1:{server.server_port}/concerts?town={town}&since={since}&until={until}"
+            request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+            except OSError as e:
+                failures.append(e)
+
+    versions = {server.index.version}
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(args.clients)]
+    for thread in clients:
+        thread.start()
+    # Rewrite the dataset mid-run, as main.py would, and wait for the swap
+    with atomic_open(path) as f:
+        json.dump(make_concerts(args.count, seed=2), f)
+    while server.index.version in versions and any(thread.is_alive() for thread in clients):
+        time.sleep(0.01)
+    versions.add(server.index.version)
+    for thread in clients:
+        thread.join()
+    http = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    print(f"{args.count:,} concerts, {len(queries):,} town + 30-day requests")
+    print(f"per request, re-read concerts.json: {baseline * 1000:8.1f} ms")
+    print(f"per request, index query + page:    {indexed * 1000:8.3f} ms  ({baseline / indexed:,.0f}x)")
+    print(f"index build:                        {build:8.2f}s")
+    print(
+        f"HTTP, {args.clients} clients: {len(queries) / http:,.0f} requests/s, "
+        f"{len(versions) - 1} hot swap(s), {len(failures)} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
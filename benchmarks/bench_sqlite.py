@@ -0,0 +1,78 @@
+"""Benchmark SQLite bulk upserts and indexed queries on a large historical table.
+
+Usage:
+    python benchmarks/bench_sqlite.py [--rows N] [--db PATH]
+
+Builds a database of ``--rows`` synthetic concerts spread over ten years of
+dates, the metro towns and a handful of sources, then times the query
+shapes used by query.py. The database is kept between runs; delete it (or
+pass another --db) to rebuild.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.config import BOSTON_METRO_TOWNS, SOURCE_PRIORITY  # noqa: E402
+from scraper.sqlite_store import ConcertStore  # noqa: E402
+
+
+def generate(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    start = date(2016, 1, 1)
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(3650))
+        yield {
+            "event_id": f"{i:016x}",
+            "title": f"Family Concert {i}",
+            "venue": f"Venue {rng.randrange(500)}",
+            "town": rng.choice(BOSTON_METRO_TOWNS),
+            "date": f"{day.isoformat()}T{rng.randrange(9, 20):02d}:00:00",
+            "url": f"https://example.com/events/{i}",
+            "description": "Songs and stories for young children and their families",
+            "source": rng.choice(SOURCE_PRIORITY),
+            "scraped_at": "2026-01-01T00:00:00",
+        }
+
+
+QUERIES = [
+    ("town + month", {"town": "Cambridge", "since": "2024-06-01", "until": "2024-06-30"}),
+    ("source + week", {"source": "Eventbrite", "since": "2025-03-01", "until": "2025-03-07"}),
+    ("venue", {"venue": "Venue 42", "since": "2025-01-01"}),
+    ("one day", {"since": "2023-12-24", "until": "2023-12-24"}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the benchmark table")
+    parser.add_argument("--db", default="data/bench_concerts.db", help="Database path")
+    args = parser.parse_args()
+
+    with ConcertStore(args.db) as store:
+        existing = len(store)
+        if existing < args.rows:
+            started = time.perf_counter()
+            store.save(generate(args.rows))
+            elapsed = time.perf_counter() - started
+            print(f"Inserted {args.rows:,} rows in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
+        print(f"Table holds {len(store):,} rows")
+
+        print(f"{'query':<16}{'rows':>8}{'query ms':>10}{'count ms':>10}")
+        for name, filters in QUERIES:
+            started = time.perf_counter()
+            rows = store.query(limit=1000, **filters)
+            query_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            store.count(**filters)
+            count_ms = (time.perf_counter() - started) * 1000
+            print(f"{name:<16}{len(rows):>8}{query_ms:>10.1f}{count_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
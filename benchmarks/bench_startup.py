@@ -0,0 +1,49 @@
+"""Benchmark CLI startup: wall time of fresh interpreters running common entry points.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N]
+
+Each case runs in a new process, so module caches do not carry over. The
+bare interpreter is timed too; subtract it to get the cost of our imports.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES = {
+    "python (bare interpreter)": ["-c", "pass"],
+    "main.py --help": ["main.py", "--help"],
+    "import main": ["-c", "import main"],
+    "load mock scraper": ["-c", "from scraper.expanded_mock_scraper import ExpandedMockScraper"],
+    "load one scraper (boston)": ["-c", "from scraper.registry import build_jobs; build_jobs(['boston'])"],
+    "load all scrapers": ["-c", "from scraper.registry import build_jobs, scraper_names; build_jobs(scraper_names())"],
+    "first ConcertTable frame (pandas)": ["-c", "from scraper.table import ConcertTable; ConcertTable().frame"],
+}
+
+
+def time_case(args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the median is reported")
+    args = parser.parse_args()
+
+    for name, case in CASES.items():
+        print(f"{name:<36} {time_case(case, args.repeat) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,18 @@
 
 import argparse
 import logging
-import os
 
-from scraper.config import BOSTON_METRO_TOWNS, CHILD_FRIENDLY_KEYWORDS, CONCERTS_CSV, CONCERTS_JSON
-from scraper.boston_events_scraper import BostonEventsScaper
-from scraper.eventbrite_scraper import EventbriteScraper
-from scraper.library_events_scraper import BostonPublicLibraryScaper, CambridgePublicLibraryScaper
-from scraper.web_search_scraper import TimeOutBostonScraper, BostonComScraper, BostonCentralScraper
+from scraper import config
+from scraper.config import (
+    BOSTON_METRO_TOWNS,
+    CONCERTS_CSV,
+    CONCERTS_JSON,
+    CONCERTS_JSONL,
+    PARSE_WORKERS,
+    SCRAPER_WORKERS,
+    SOURCE_DEADLINE,
+)
+from scraper.registry import build_jobs, scraper_names
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +22,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def log_date_metrics(normalizer):
+    """Log how many dates were parsed, missing or unparseable, per source."""
+    totals = normalizer.totals()
+    logger.info(
+        f"Normalized dates: {totals['parsed']} parsed, {totals['missing']} missing, "
+        f"{totals['unparseable']} unparseable"
+    )
+    for source, stats in sorted(normalizer.stats.items(), key=lambda item: str(item[0])):
+        if stats["unparseable"]:
+            logger.warning(f"  {source}: {stats['unparseable']} unparseable dates (format: {normalizer.format_for(source)})")
+
+
+def log_geocode_metrics(geocoder):
+    """Log how many concerts were placed, by precision, and how many addresses were new."""
+    stats = geocoder.stats
+    located = sum(count for precision, count in stats.items() if precision != "unresolved")
+    by_precision = ", ".join(
+        f"{count} by {precision}" for precision, count in stats.most_common() if precision != "unresolved"
+    )
+    logger.info(
+        f"Geocoded {located} of {located + stats['unresolved']} concerts ({by_precision or 'none'}); "
+        f"{geocoder.resolved} new address(es) resolved"
+    )
+
+
+def log_health_summary(health):
+    """Log each source's circuit breaker state and recent health."""
+    from scraper.health import CLOSED
+
+    logger.info("=" * 60)
+    logger.info("Source health (last runs):")
+    for row in health.summary():
+        line = (
+            f"  {row['source']}: {row['state']}, {row['success_rate']:.0%} ok, "
+            f"median {row['median_elapsed']:.1f}s, {row['mean_events']:.1f} events/run"
+        )
+        if row["failures"]:
+            line += f", {row['failures']} failed or empty run(s) in a row"
+        if row["state"] != CLOSED:
+            line += f", next probe after {row['retry_at']}"
+        logger.info(line)
+
+
 def main():
     """Run all scrapers and save results."""
     parser = argparse.ArgumentParser(description="Scrape concert data from Boston metro area")
@@ -28,16 +76,114 @@ def main():
     parser.add_argument(
         "--scrapers",
         nargs="+",
-        choices=["boston", "libraries", "timeout", "bostoncom", "bostoncentral", "eventbrite", "all"],
+        choices=scraper_names() + ["all"],
         default=["all"],
         help="Which scrapers to run (default: all)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCRAPER_WORKERS,
+        help=f"Number of scrapers to run concurrently (default: {SCRAPER_WORKERS})",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=SOURCE_DEADLINE,
+        help=f"Seconds each scraper may run before it is abandoned (default: {SOURCE_DEADLINE})",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help=f"Processes used to parse pages; 0 parses inline (default: {PARSE_WORKERS})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download and re-parse listing pages instead of using the HTTP cache",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=config.STREAMING_OUTPUT,
+        help=f"Stream results to {CONCERTS_JSONL} and {CONCERTS_CSV} one concert at a time",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Keep every listing instead of merging the same concert listed by several sources",
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help=f"Also upsert results into the SQLite database {config.SQLITE_PATH} (query it with query.py)",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help=f"Also write results (the whole dataset with --upsert) to the Parquet dataset {config.PARQUET_DIR}, "
+        "partitioned by town and month (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--heatmap",
+        action="store_true",
+        help=f"Also bin the saved concerts into heat-map grids at several zoom levels and time windows, "
+        f"written to {config.HEATMAP_PATH}",
+    )
+    parser.add_argument(
+        "--cube",
+        action="store_true",
+        help=f"Also count every scraped listing into the aggregate cube in {config.CUBE_DIR} "
+        "(query it with query.py --cube)",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help=f"Merge results into the dataset in {config.DATASET_DIR} and write out the whole dataset, "
+        "instead of replacing the output with this run's results",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=config.EVENTBRITE_INCREMENTAL,
+        help=f"Ask Eventbrite only for events changed since the last sync recorded in "
+        f"{config.EVENTBRITE_CURSOR_PATH} (combine with --upsert to keep earlier results)",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="With --incremental, backfill the whole Eventbrite window and reset the sync cursor",
+    )
+    parser.add_argument(
+        "--ignore-health",
+        action="store_true",
+        help="Run every selected source, even those whose circuit breaker is open after repeated failures",
+    )
+    parser.add_argument(
+        "--reset-health",
+        action="store_true",
+        help=f"Close every circuit breaker recorded in {config.HEALTH_PATH} before running",
+    )
     args = parser.parse_args()
 
+    # Heavy imports wait until the arguments are valid, so --help stays fast
+    from scraper.base_scraper import start_batch
+    from scraper.dedup import deduplicate
+    from scraper.keywords import CHILD_FRIENDLY
+    from scraper.table import ConcertTable
+
+    if args.no_cache:
+        config.HTTP_CACHE_ENABLED = False
+    config.PARSE_WORKERS = args.parse_workers
+    config.EVENTBRITE_INCREMENTAL = args.incremental
+    config.EVENTBRITE_FULL_SYNC = args.full_sync
+
     logger.info("Starting concert scraping...")
+    start_batch()
     logger.info(f"Target towns: {', '.join(BOSTON_METRO_TOWNS)}")
 
-    all_concerts = []
+    all_concerts = ConcertTable()
 
     # Use mock data if requested
     if args.use_mock:
@@ -51,90 +197,133 @@ def main():
         # Run real web scrapers
         scrapers_to_run = args.scrapers
         if "all" in scrapers_to_run:
-            scrapers_to_run = ["boston", "libraries", "timeout", "bostoncom", "bostoncentral", "eventbrite"]
-
-        # Boston.gov events
-        if "boston" in scrapers_to_run:
-            logger.info("=" * 60)
-            logger.info("Running Boston.gov scraper...")
-            boston_scraper = BostonEventsScaper()
-            all_concerts.extend(boston_scraper.scrape())
-
-        # Library events
-        if "libraries" in scrapers_to_run:
-            logger.info("=" * 60)
-            logger.info("Running Library Events scrapers...")
-
-            bpl_scraper = BostonPublicLibraryScaper()
-            all_concerts.extend(bpl_scraper.scrape())
-
-            cpl_scraper = CambridgePublicLibraryScaper()
-            all_concerts.extend(cpl_scraper.scrape())
-
-        # Time Out Boston
-        if "timeout" in scrapers_to_run:
-            logger.info("=" * 60)
-            logger.info("Running Time Out Boston scraper...")
-            timeout_scraper = TimeOutBostonScraper()
-            all_concerts.extend(timeout_scraper.scrape())
-
-        # Boston.com
-        if "bostoncom" in scrapers_to_run:
-            logger.info("=" * 60)
-            logger.info("Running Boston.com scraper...")
-            bostoncom_scraper = BostonComScraper()
-            all_concerts.extend(bostoncom_scraper.scrape())
-
-        # BostonCentral
-        if "bostoncentral" in scrapers_to_run:
-            logger.info("=" * 60)
-            logger.info("Running BostonCentral scraper...")
-            bostoncentral_scraper = BostonCentralScraper()
-            all_concerts.extend(bostoncentral_scraper.scrape())
-
-        # Eventbrite (only if API key is set)
-        if "eventbrite" in scrapers_to_run:
-            if os.getenv("EVENTBRITE_API_KEY"):
-                logger.info("=" * 60)
-                logger.info("Running Eventbrite scraper...")
-                eventbrite = EventbriteScraper(location="Boston, MA")
-                all_concerts.extend(eventbrite.scrape())
-            else:
-                logger.info("=" * 60)
-                logger.info("Skipping Eventbrite scraper (no API key set)")
-                logger.info("To use Eventbrite, set EVENTBRITE_API_KEY environment variable")
+            scrapers_to_run = scraper_names()
+
+        from scraper.health import HealthStore
+        from scraper.pipeline import shutdown_parse_pool
+        from scraper.runner import run_scrapers
+
+        health = HealthStore() if config.HEALTH_ENABLED else None
+        if health is not None and args.reset_health:
+            health.reset()
+
+        jobs = build_jobs(scrapers_to_run)
+        logger.info("=" * 60)
+        logger.info(f"Running {len(jobs)} scrapers with {args.workers} worker(s)...")
+
+        try:
+            results = run_scrapers(
+                jobs,
+                workers=args.workers,
+                deadline=args.deadline,
+                health=health,
+                skip_open=not args.ignore_health,
+            )
+            for result in results:
+                all_concerts.extend(result.concerts)
+        finally:
+            shutdown_parse_pool()
+            if health is not None:
+                health.save()
+
+        if health is not None:
+            log_health_summary(health)
+
+    # Normalize dates into start/end timestamps
+    normalizer = all_concerts.normalize_dates()
+    log_date_metrics(normalizer)
 
     # Filter for child-friendly concerts
     logger.info("=" * 60)
     logger.info("Filtering for child-friendly concerts...")
-    child_friendly_concerts = []
-    for concert in all_concerts:
-        text = f"{concert.title} {concert.description or ''}".lower()
-        if any(keyword.lower() in text for keyword in CHILD_FRIENDLY_KEYWORDS):
-            child_friendly_concerts.append(concert)
+    child_friendly_concerts = all_concerts.filter_keywords(CHILD_FRIENDLY)
 
     logger.info(
         f"Found {len(child_friendly_concerts)} child-friendly concerts "
         f"out of {len(all_concerts)} total concerts"
     )
 
+    if config.DEDUP_ENABLED and not args.no_dedup:
+        child_friendly_concerts = ConcertTable.from_concerts(deduplicate(child_friendly_concerts.iter_records()))
+        logger.info(f"{len(child_friendly_concerts)} concerts after merging duplicate listings")
+
+    if config.GEOCODE_ENABLED and child_friendly_concerts:
+        geocoder = child_friendly_concerts.geocode()
+        geocoder.save()
+        log_geocode_metrics(geocoder)
+
+    for town, count in child_friendly_concerts.count_by("town").items():
+        logger.info(f"  {town}: {count}")
+
     # Save results
-    if child_friendly_concerts:
+    output_json = CONCERTS_JSONL if args.streaming else CONCERTS_JSON
+    saved_concerts = child_friendly_concerts
+    if args.upsert:
+        logger.info("=" * 60)
+        logger.info("Updating dataset...")
+
+        from scraper.dataset import Dataset
+
+        dataset = Dataset()
+        dataset.upsert(child_friendly_concerts.iter_records())
+        if args.streaming:
+            dataset.export(jsonl_path=CONCERTS_JSONL, csv_path=CONCERTS_CSV)
+        else:
+            dataset.export(json_path=CONCERTS_JSON, csv_path=CONCERTS_CSV)
+
+        if args.heatmap or args.parquet:
+            saved_concerts = ConcertTable.from_concerts(dataset.records())
+        logger.info(f"Dataset of {len(dataset)} concerts saved to:")
+        logger.info(f"  - {output_json}")
+        logger.info(f"  - {CONCERTS_CSV}")
+    elif child_friendly_concerts:
         logger.info("=" * 60)
         logger.info("Saving results...")
 
-        # Save using a temporary scraper instance
-        from scraper.mock_scraper import MockDataScraper
-        saver = MockDataScraper()
-        saver.concerts = child_friendly_concerts
-        saver.save_results()
+        if args.streaming:
+            from scraper.writers import write_concerts
+
+            write_concerts(child_friendly_concerts.iter_records(), CONCERTS_JSONL, CONCERTS_CSV)
+        else:
+            child_friendly_concerts.save(CONCERTS_JSON, CONCERTS_CSV)
 
         logger.info(f"Results saved to:")
-        logger.info(f"  - {CONCERTS_JSON}")
+        logger.info(f"  - {output_json}")
         logger.info(f"  - {CONCERTS_CSV}")
     else:
         logger.warning("No child-friendly concerts found. No files saved.")
 
+    if args.heatmap and saved_concerts:
+        from scraper.heatmap import HeatmapGrids
+
+        if config.GEOCODE_ENABLED:
+            saved_concerts.geocode().save()  # Only events saved by earlier runs can lack coordinates
+        HeatmapGrids.build(saved_concerts).save()
+
+    if args.cube and all_concerts:
+        from scraper.cube import AggregateCube
+        from scraper.dataset import Dataset
+
+        # Every listing, not only the child-friendly ones, so the flag is a dimension
+        listings = all_concerts.iter_records()
+        if config.DEDUP_ENABLED and not args.no_dedup:
+            listings = deduplicate(listings)
+        cube = AggregateCube()
+        cube.sync(Dataset(config.CUBE_LISTINGS_DIR), listings)
+        cube.save()
+
+    if args.parquet and saved_concerts:
+        from scraper.parquet_export import write_parquet
+
+        write_parquet(saved_concerts)
+
+    if args.sqlite and child_friendly_concerts:
+        from scraper.sqlite_store import ConcertStore
+
+        with ConcertStore() as store:
+            store.save(child_friendly_concerts.iter_records())
+            logger.info(f"SQLite database {store.path} holds {len(store)} concerts")
+
     logger.info("=" * 60)
     logger.info("Scraping complete!")
 
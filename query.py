@@ -0,0 +1,96 @@
+"""Query saved concerts from the SQLite database.
+
+Examples:
+    python query.py --town Cambridge --since 2025-06-01 --until 2025-06-30
+    python query.py --source Eventbrite --count
+    python query.py --since 2025-07-04T00:00 --json
+    python query.py --cube --town Somerville --child-friendly yes --by month
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from scraper import config
+from scraper.cube import DIMENSIONS, AggregateCube
+from scraper.sqlite_store import ConcertStore
+
+
+def query_cube(args, parser: argparse.ArgumentParser):
+    """Print counts from the aggregate cube."""
+    if args.since or args.until:
+        parser.error("--since and --until need the database; filter the cube with --month")
+    filters = {
+        "town": args.town,
+        "source": args.source,
+        "venue": args.venue,
+        "month": args.month,
+        "child_friendly": None if args.child_friendly is None else args.child_friendly == "yes",
+    }
+    filters = {dimension: value for dimension, value in filters.items() if value is not None}
+
+    cube = AggregateCube(args.cube_dir)
+    len(cube)  # Load before timing the query
+    started = time.perf_counter()
+    if args.by:
+        groups = cube.group(args.by, **filters)
+    else:
+        total = cube.count(**filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.by:
+        for key, count in groups.items():
+            print("\t".join(str(value) for value in key) + f"\t{count}")
+        print(f"{len(groups)} groups in {elapsed_ms:.2f} ms", file=sys.stderr)
+    else:
+        print(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query concerts saved with main.py --sqlite")
+    parser.add_argument("--db", default=config.SQLITE_PATH, help=f"Database path (default: {config.SQLITE_PATH})")
+    parser.add_argument("--town", help="Only concerts in this town")
+    parser.add_argument("--since", help="Only concerts on or after this ISO date/datetime")
+    parser.add_argument("--until", help="Only concerts on or before this ISO date/datetime")
+    parser.add_argument("--source", help="Only concerts from this source, e.g. Boston.gov")
+    parser.add_argument("--venue", help="Only concerts at this venue")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum rows to print; 0 for all (default: 100)")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matching concerts")
+    parser.add_argument("--json", action="store_true", help="Print matching concerts as JSON Lines")
+    parser.add_argument(
+        "--cube",
+        action="store_true",
+        help="Count listings from the aggregate cube written by main.py --cube instead of querying the database",
+    )
+    parser.add_argument("--cube-dir", default=config.CUBE_DIR, help=f"Cube directory (default: {config.CUBE_DIR})")
+    parser.add_argument("--month", help="With --cube, only listings in this month (YYYY-MM)")
+    parser.add_argument("--child-friendly", choices=["yes", "no"], help="With --cube, only (non-)child-friendly listings")
+    parser.add_argument("--by", nargs="+", choices=DIMENSIONS, help="With --cube, count per value of these dimensions")
+    args = parser.parse_args()
+
+    if args.cube:
+        query_cube(args, parser)
+        return
+
+    filters = {"town": args.town, "since": args.since, "until": args.until, "source": args.source, "venue": args.venue}
+    started = time.perf_counter()
+    with ConcertStore(args.db) as store:
+        if args.count:
+            print(store.count(**filters))
+            rows = None
+        else:
+            rows = store.query(limit=args.limit or None, **filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if rows is not None:
+        for row in rows:
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print("\t".join(str(row[c] or "") for c in ("date_norm", "town", "venue", "title", "source")))
+        print(f"{len(rows)} concerts in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
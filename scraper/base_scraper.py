@@ -1,22 +1,71 @@
-"""Base scraper class for concert data collection."""
+"""Base scraper class for concert data collection.
+
+The network and parsing stack (requests, lxml, the parse pool) is imported
+by the methods that use it, so loading a scraper class, or running from
+mock data, does not pay for it.
+"""
 
-import json
 import logging
+import sys
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from scraper import config
+from scraper.sqlite_store import ConcertStore
+from scraper.table import ConcertTable
+from scraper.writers import write_concerts
+
+if TYPE_CHECKING:
+    import requests
+
+    from scraper.pipeline import FetchedPage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+_batch_timestamp: Optional[str] = None
+
+
+def start_batch(timestamp: datetime = None) -> str:
+    """Start a scrape batch; concerts created from now on share its timestamp."""
+    global _batch_timestamp
+    _batch_timestamp = (timestamp or datetime.now()).isoformat()
+    return _batch_timestamp
+
+
+def batch_timestamp() -> str:
+    """Return the current batch timestamp, starting a batch if none is open."""
+    return _batch_timestamp or start_batch()
+
+
 class Concert:
-    """Represents a concert event."""
+    """Represents a concert event.
+
+    Concerts are slotted, and ``scraped_at`` defaults to the timestamp of the
+    current batch (see ``start_batch``) instead of a clock read per object,
+    so loads of millions of events stay compact and cheap to build.
+    """
+
+    __slots__ = (
+        "title",
+        "venue",
+        "town",
+        "date",
+        "start",
+        "end",
+        "url",
+        "description",
+        "address",
+        "latitude",
+        "longitude",
+        "source",
+        "scraped_at",
+        "sources",
+    )
 
     def __init__(
         self,
@@ -28,16 +77,32 @@ class Concert:
         description: str = None,
         address: str = None,
         source: str = None,
+        scraped_at: str = None,
+        sources: List[Dict] = None,
+        start: str = None,
+        end: str = None,
+        latitude: float = None,
+        longitude: float = None,
     ):
         self.title = title
-        self.venue = venue
-        self.town = town
+        # Low-cardinality fields share one string object per distinct value
+        self.venue = sys.intern(venue) if type(venue) is str else venue
+        self.town = sys.intern(town) if type(town) is str else town
+        # Free text as the source wrote it
         self.date = date
+        # Timezone-aware ISO timestamps parsed from ``date`` (see scraper.dates)
+        self.start = start
+        self.end = end
         self.url = url
         self.description = description
         self.address = address
-        self.source = source
-        self.scraped_at = datetime.now().isoformat()
+        # Venue coordinates, from the source or scraper.geocoder
+        self.latitude = latitude
+        self.longitude = longitude
+        self.source = sys.intern(source) if type(source) is str else source
+        self.scraped_at = scraped_at or _batch_timestamp or start_batch()
+        # Provenance of an event merged from several listings (see scraper.dedup)
+        self.sources = sources
 
     def to_dict(self) -> Dict:
         """Convert concert to dictionary."""
@@ -46,11 +111,16 @@ class Concert:
             "venue": self.venue,
             "town": self.town,
             "date": self.date,
+            "start": self.start,
+            "end": self.end,
             "url": self.url,
             "description": self.description,
             "address": self.address,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "source": self.source,
             "scraped_at": self.scraped_at,
+            "sources": self.sources,
         }
 
 
@@ -58,42 +128,152 @@ class BaseScraper(ABC):
     """Base class for concert scrapers."""
 
     def __init__(self):
-        self.concerts: List[Concert] = []
+        # Scrapers append Concert objects or extracted record dicts
+        self.concerts: ConcertTable = ConcertTable()
+        # Monotonic time by which scrape() should finish, set by the runner
+        self.deadline: Optional[float] = None
+        # Only events changed since the last run are scraped, so finding none is normal
+        self.incremental = False
 
     @abstractmethod
-    def scrape(self) -> List[Concert]:
+    def scrape(self) -> Union[ConcertTable, List[Concert]]:
         """Scrape concert data from source."""
         pass
 
-    def save_results(self):
-        """Save scraped concerts to JSON and CSV files."""
+    def fetch(self, url: str, **kwargs) -> "requests.Response":
+        """GET a URL through the shared keep-alive session for its host.
+
+        Requests are paced per host and throttled responses retried (see
+        ``scraper.fetcher.HostScheduler``). Keyword arguments are passed to
+        ``requests.Session.get``. Waiting for the host, retries and each
+        attempt's timeouts all fit in the time left before ``self.deadline``.
+        """
+        import requests
+
+        from scraper.fetcher import get_session_pool
+
+        max_timeout = None
+        if self.deadline is not None:
+            max_timeout = self.deadline - time.monotonic()
+            if max_timeout <= 0:
+                raise requests.Timeout(f"Deadline exceeded before fetching {url}")
+        return get_session_pool().get(url, max_timeout=max_timeout, **kwargs)
+
+    def fetch_page(self, url: str, records_key: str = None, **kwargs) -> "FetchedPage":
+        """Fetch stage: download a listing page.
+
+        With the HTTP cache enabled, the page is requested conditionally.
+        When the server answers 304 or sends a body identical to last time,
+        the returned page carries the records extracted on the previous run
+        and needs no parsing, provided they were extracted with the settings
+        ``records_key`` (see ``scraper.parsers.extractor_key``).
+        """
+        from scraper.http_cache import get_http_cache
+        from scraper.parsers import declared_encoding
+        from scraper.pipeline import FetchedPage
+
+        if not config.HTTP_CACHE_ENABLED:
+            response = self.fetch(url, **kwargs)
+            response.raise_for_status()
+            return FetchedPage(url, response.content, declared_encoding(response))
+
+        cache = get_http_cache()
+        headers = dict(kwargs.pop("headers", None) or {})
+        response = self.fetch(url, headers={**headers, **cache.conditional_headers(url, records_key)}, **kwargs)
+
+        if response.status_code == 304:
+            records = cache.get_records(url, records_key)
+            if records is not None:
+                logger.info(f"Not modified, reusing {len(records)} cached records: {url}")
+                return FetchedPage(url, records=records)
+            response = self.fetch(url, headers=headers, **kwargs)
+
+        response.raise_for_status()
+        if cache.store(url, response, records_key):
+            records = cache.get_records(url, records_key)
+            if records is not None:
+                logger.info(f"Page unchanged, reusing {len(records)} cached records: {url}")
+                return FetchedPage(url, records=records)
+
+        return FetchedPage(url, response.content, declared_encoding(response))
+
+    def parse_page(self, page: "FetchedPage", site: str, **options) -> Future:
+        """Parse stage: extract event records from a fetched page.
+
+        ``site`` names an extractor in ``scraper.parsers.EXTRACTORS``; the
+        page is parsed against ``self.base_url`` on the parse pool. Returns a
+        future of ``Concert`` keyword argument dicts.
+        """
+        from scraper.http_cache import get_http_cache
+        from scraper.parsers import extractor_key
+        from scraper.pipeline import get_parse_pool
+
+        if page.records is not None:
+            future = Future()
+            future.set_result(page.records)
+            return future
+
+        def cache_records(f: Future):
+            if not f.cancelled() and f.exception() is None:
+                get_http_cache().store_records(page.url, f.result(), extractor_key(site, self.base_url, options))
+
+        future = get_parse_pool().submit(site, page.content, page.encoding, self.base_url, **options)
+        if config.HTTP_CACHE_ENABLED:
+            future.add_done_callback(cache_records)
+        return future
+
+    def fetch_records(self, url: str, site: str, **options) -> Future:
+        """Fetch a listing page and queue it for parsing; see fetch_page and parse_page."""
+        from scraper.parsers import extractor_key
+
+        page = self.fetch_page(url, records_key=extractor_key(site, self.base_url, options))
+        return self.parse_page(page, site, **options)
+
+    def save_results(self, streaming: bool = None):
+        """Save scraped concerts to JSON and CSV files.
+
+        In streaming mode (default ``config.STREAMING_OUTPUT``) concerts are
+        written one at a time to JSON Lines and CSV, straight from the table's
+        column buffers, without pandas.
+        """
         if not self.concerts:
             logger.warning("No concerts to save")
             return
 
-        # Convert to list of dictionaries
-        concerts_data = [concert.to_dict() for concert in self.concerts]
+        if config.STREAMING_OUTPUT if streaming is None else streaming:
+            concerts = self.concerts
+            if isinstance(concerts, ConcertTable):
+                concerts = concerts.iter_records()
+            write_concerts(concerts, config.CONCERTS_JSONL, config.CONCERTS_CSV)
+            return
 
-        # Save as JSON
-        Path(config.CONCERTS_JSON).parent.mkdir(parents=True, exist_ok=True)
-        with open(config.CONCERTS_JSON, "w") as f:
-            json.dump(concerts_data, f, indent=2)
-        logger.info(f"Saved {len(concerts_data)} concerts to {config.CONCERTS_JSON}")
+        ConcertTable.from_concerts(self.concerts).save(config.CONCERTS_JSON, config.CONCERTS_CSV)
 
-        # Save as CSV
-        df = pd.DataFrame(concerts_data)
-        df.to_csv(config.CONCERTS_CSV, index=False)
-        logger.info(f"Saved {len(concerts_data)} concerts to {config.CONCERTS_CSV}")
+    def save_to_sqlite(self, path: str = None):
+        """Upsert scraped concerts into the SQLite store (default ``config.SQLITE_PATH``)."""
+        if not self.concerts:
+            logger.warning("No concerts to save")
+            return
 
-    def filter_child_friendly(self, keywords: List[str]) -> List[Concert]:
-        """Filter concerts for child-friendly events."""
-        filtered = []
-        keywords_lower = [k.lower() for k in keywords]
+        concerts = self.concerts
+        if isinstance(concerts, ConcertTable):
+            concerts = concerts.iter_records()
+        with ConcertStore(path) as store:
+            store.save(concerts)
+
+    def save_parquet(self, directory: str = None):
+        """Write scraped concerts to the town/month-partitioned Parquet dataset (needs pyarrow)."""
+        from scraper.parquet_export import write_parquet
+
+        if not self.concerts:
+            logger.warning("No concerts to save")
+            return
 
-        for concert in self.concerts:
-            text = f"{concert.title} {concert.description or ''}".lower()
-            if any(keyword in text for keyword in keywords_lower):
-                filtered.append(concert)
+        write_parquet(self.concerts, directory)
+
+    def filter_child_friendly(self, keywords: List[str]) -> ConcertTable:
+        """Filter concerts for child-friendly events."""
+        filtered = ConcertTable.from_concerts(self.concerts).filter_keywords(keywords)
 
         logger.info(
             f"Filtered {len(filtered)} child-friendly concerts from {len(self.concerts)} total"
@@ -1,13 +1,14 @@
 """Scraper for Boston.gov calendar events."""
 
 import logging
-from datetime import datetime
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List
 
 import requests
-from bs4 import BeautifulSoup
 
-from scraper.base_scraper import BaseScraper, Concert
+from scraper import config
+from scraper.base_scraper import BaseScraper
+from scraper.table import ConcertTable
 
 logger = logging.getLogger(__name__)
 
@@ -15,69 +16,74 @@ logger = logging.getLogger(__name__)
 class BostonEventsScaper(BaseScraper):
     """Scraper for Boston.gov events calendar."""
 
-    def __init__(self):
+    def __init__(self, page_window: int = None, max_pages: int = None):
         super().__init__()
         self.base_url = "https://www.boston.gov"
         self.events_url = f"{self.base_url}/events"
+        self.page_window = page_window or config.BOSTON_GOV_PAGE_WINDOW
+        self.max_pages = max_pages or config.BOSTON_GOV_MAX_PAGES
 
-    def scrape(self) -> List[Concert]:
-        """Scrape events from Boston.gov events page."""
-        logger.info("Scraping Boston.gov events...")
+    def _page_url(self, page: int) -> str:
+        return f"{self.events_url}?page={page}" if page > 0 else self.events_url
 
-        try:
-            # Fetch multiple pages to get more events
-            for page in range(3):  # Get first 3 pages
-                url = f"{self.events_url}?page={page}" if page > 0 else self.events_url
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, "lxml")
+    def scrape(self) -> ConcertTable:
+        """Scrape events from Boston.gov events page.
 
-                # Look for event detail drawers
-                events = soup.find_all("div", class_="event-details")
+        Pages are fetched ``page_window`` at a time and extracted as they
+        arrive. The first page that has no events, or only events already
+        seen on other pages, marks the end of the calendar; no pages past it
+        are requested.
+        """
+        logger.info("Scraping Boston.gov events...")
 
-                for event in events:
+        seen = set()
+        end_page = self.max_pages  # Exclusive; lowered once the real end is found
+        next_page = 0
+        pending: Dict[Future, int] = {}
+
+        with ThreadPoolExecutor(max_workers=self.page_window, thread_name_prefix="boston-gov") as executor:
+            while True:
+                while next_page < end_page and len(pending) < self.page_window:
+                    future = executor.submit(self._page_records, next_page)
+                    pending[future] = next_page
+                    next_page += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = pending.pop(future)
                     try:
-                        # Extract title from link
-                        title_link = event.find("a")
-                        if not title_link:
-                            continue
-                        title = title_link.get_text(strip=True)
-                        url = title_link.get("href", "")
-                        if url and not url.startswith("http"):
-                            url = f"{self.base_url}{url}"
-
-                        # Extract time/date info
-                        time_elem = event.find("p", class_="cd m-t100")
-                        date = time_elem.get_text(strip=True) if time_elem else ""
-
-                        # Extract location
-                        location_elem = event.find(text=lambda t: t and ("Virtual" in t or "Boston" in t or "," in t))
-                        venue = location_elem.strip() if location_elem else "Boston"
-
-                        # Extract description from following paragraphs
-                        desc_elems = event.find_all("p")
-                        description = " ".join([p.get_text(strip=True) for p in desc_elems if p.get_text(strip=True)])
-
-                        concert = Concert(
-                            title=title,
-                            venue=venue,
-                            town="Boston",
-                            date=date,
-                            url=url,
-                            description=description,
-                            source="Boston.gov",
-                        )
-                        self.concerts.append(concert)
-
-                    except Exception as e:
-                        logger.debug(f"Error parsing event: {e}")
+                        records = future.result()
+                    except requests.RequestException as e:
+                        logger.error(f"Error scraping Boston.gov page {page + 1}: {e}")
+                        end_page = min(end_page, page)
                         continue
 
-                logger.info(f"Processed page {page + 1}, total events: {len(self.concerts)}")
-
-            logger.info(f"Found {len(self.concerts)} events from Boston.gov")
-
-        except requests.RequestException as e:
-            logger.error(f"Error scraping Boston.gov: {e}")
-
+                    new_events = 0
+                    for record in records:
+                        key = (record["title"], record["url"], record["date"])
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        self.concerts.append(record)
+                        new_events += 1
+
+                    logger.info(
+                        f"Processed page {page + 1}, {new_events} new events, total events: {len(self.concerts)}"
+                    )
+                    if not new_events:
+                        end_page = min(end_page, page)
+
+                # Drop requests for pages past the end of the calendar
+                for future, page in list(pending.items()):
+                    if page >= end_page:
+                        future.cancel()
+                        del pending[future]
+
+        logger.info(f"Found {len(self.concerts)} events from Boston.gov across {end_page} pages")
         return self.concerts
+
+    def _page_records(self, page: int) -> List[Dict]:
+        """Fetch one calendar page and wait for its parsed records."""
+        return self.fetch_records(self._page_url(page), "boston_gov").result()
@@ -1,5 +1,8 @@
 """Configuration for the concert scraper."""
 
+# Time zone of scraped dates that carry no UTC offset (see scraper/dates.py)
+LOCAL_TIMEZONE = "America/New_York"
+
 # Boston metro area towns to search
 BOSTON_METRO_TOWNS = [
     "Waltham",
@@ -24,7 +27,126 @@ CHILD_FRIENDLY_KEYWORDS = [
     "all ages",
 ]
 
+# Keywords that mark a listing as music-related, per source
+LIBRARY_MUSIC_KEYWORDS = ["music", "concert", "sing", "performance", "orchestra", "band"]
+BOSTON_COM_MUSIC_KEYWORDS = ["concert", "music", "show", "performance", "band", "singer"]
+
 # Output file paths
 OUTPUT_DIR = "data"
 CONCERTS_JSON = f"{OUTPUT_DIR}/concerts.json"
 CONCERTS_CSV = f"{OUTPUT_DIR}/concerts.csv"
+CONCERTS_JSONL = f"{OUTPUT_DIR}/concerts.jsonl"
+# Stream results to CONCERTS_JSONL and CONCERTS_CSV one concert at a time
+# instead of building them in memory (False: pretty-printed CONCERTS_JSON)
+STREAMING_OUTPUT = False
+# SQLite storage backend (main.py --sqlite, query.py)
+SQLITE_PATH = f"{OUTPUT_DIR}/concerts.db"
+
+# Parquet export partitioned by town and month (main.py --parquet; needs pyarrow)
+PARQUET_DIR = f"{OUTPUT_DIR}/parquet"
+
+# Cross-source deduplication (see scraper/dedup.py)
+DEDUP_ENABLED = True
+DEDUP_TITLE_SIMILARITY = 0.85  # Minimum similarity ratio of normalized titles
+# When listings are merged, fields are taken from the first source in this list
+SOURCE_PRIORITY = [
+    "Boston.gov",
+    "Boston Public Library",
+    "Cambridge Public Library",
+    "Eventbrite",
+    "Time Out Boston",
+    "Boston.com",
+    "BostonCentral",
+]
+
+# Offline geocoding of venues and addresses (see scraper/geocoder.py)
+GEOCODE_ENABLED = True
+GEOCODE_CACHE_PATH = f"{OUTPUT_DIR}/geocode_cache.json"
+GEOCODE_CACHE_MAX_ENTRIES = 50_000  # Addresses kept; the least recently used are evicted
+
+# Heat-map density grids (main.py --heatmap; see scraper/heatmap.py)
+HEATMAP_PATH = f"{OUTPUT_DIR}/heatmap.npz"
+HEATMAP_BOUNDS = (42.22, -71.30, 42.48, -70.98)  # South, west, north, east
+HEATMAP_LEVELS = [32, 64, 128, 256]  # Cells per side at each zoom level; each doubles the last
+HEATMAP_SMOOTHING = 1.0  # Gaussian sigma in cells of each level (0: raw counts)
+HEATMAP_TILE_SIZE = 32  # Cells per side of a served tile
+
+# Aggregate cube of listing counts by town, month, source, venue and
+# child-friendliness (main.py --cube, query.py --cube; see scraper/cube.py)
+CUBE_DIR = f"{OUTPUT_DIR}/cube"
+CUBE_LISTINGS_DIR = f"{CUBE_DIR}/listings"  # Dataset of every listing the cube counts
+
+# Read-only query server over the saved concerts (server.py; see scraper/server.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+SERVER_PAGE_SIZE = 50  # Concerts per page unless the request gives a limit
+SERVER_MAX_PAGE_SIZE = 500
+SERVER_RELOAD_INTERVAL = 2.0  # Seconds between checks for a newly written dataset
+SERVER_GZIP_MIN_BYTES = 1024  # Smaller responses are sent uncompressed
+SERVER_RESPONSE_CACHE_ENTRIES = 1024  # Encoded responses kept per dataset version
+
+# Incremental dataset that each run upserts into (see scraper/dataset.py)
+DATASET_DIR = f"{OUTPUT_DIR}/dataset"
+
+# Scraper orchestration
+SCRAPER_WORKERS = 1  # Number of sources scraped concurrently
+SOURCE_DEADLINE = 120  # Seconds each source may run before it is abandoned
+
+# Per-source health history and circuit breaker (see scraper/health.py)
+HEALTH_ENABLED = True
+HEALTH_PATH = f"{OUTPUT_DIR}/health.json"
+HEALTH_FAILURE_THRESHOLD = 3  # Failed or empty runs in a row before a source is skipped
+HEALTH_COOLDOWN = 6 * 3600  # Seconds a source is skipped before it is probed again
+HEALTH_MAX_COOLDOWN = 7 * 24 * 3600  # Cap on the cooldown, which doubles per failed probe
+HEALTH_HISTORY = 20  # Runs kept per source
+
+# HTTP fetching
+HTTP_USER_AGENT = "local-children-concerts/0.1 (+https://github.com/evan-anderson/local-children-concerts)"
+HTTP_DEFAULT_SETTINGS = {
+    "pool_maxsize": 2,  # Keep-alive connections kept per host
+    "connect_timeout": 10,  # Seconds
+    "read_timeout": 30,  # Seconds
+    # Politeness, shared by every scraper in the process (see fetcher.HostScheduler)
+    "max_in_flight": 2,  # Requests to the host at once
+    "min_interval": 0.25,  # Seconds between request starts
+    "max_retries": 3,  # Retries after a throttled response or connection error
+    "backoff_base": 1.0,  # Seconds; doubled per retry, with jitter
+    "backoff_max": 60,  # Seconds; longer Retry-After values are not waited for
+}
+# Per-host overrides of HTTP_DEFAULT_SETTINGS
+HTTP_HOST_SETTINGS = {
+    "www.boston.gov": {"pool_maxsize": 4, "max_in_flight": 4, "min_interval": 0.1},
+    "www.timeout.com": {"pool_maxsize": 3, "max_in_flight": 3},
+    # Eventbrite requests are already paced by the API quota token bucket
+    "www.eventbriteapi.com": {"pool_maxsize": 4, "read_timeout": 20, "max_in_flight": 4, "min_interval": 0},
+}
+# Responses that mean "slow down and try again"
+HTTP_RETRY_STATUSES = [429, 502, 503, 504]
+
+# Conditional-GET cache for listing pages
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = f"{OUTPUT_DIR}/http_cache"
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Boston.gov pagination
+BOSTON_GOV_PAGE_WINDOW = 4  # Pages fetched concurrently
+BOSTON_GOV_MAX_PAGES = 50  # Safety cap on pages per run
+
+# Eventbrite API
+EVENTBRITE_SEARCH_WORKERS = 3  # Search terms fetched concurrently
+EVENTBRITE_MAX_PAGES = 20  # Safety cap on result pages per search term
+# Token bucket sized to the API quota of 2,000 calls per hour per key
+EVENTBRITE_RATE_LIMIT = 2000 / 3600  # Requests per second
+EVENTBRITE_BURST = 10  # Requests allowed back to back before throttling
+# Incremental sync (main.py --incremental): ask only for events changed since
+# the last complete sync of each search term, recorded in the cursor file
+EVENTBRITE_INCREMENTAL = False
+EVENTBRITE_FULL_SYNC = False  # Ignore the cursor and backfill the whole window once
+EVENTBRITE_CURSOR_PATH = f"{OUTPUT_DIR}/eventbrite_cursor.json"
+EVENTBRITE_SYNC_OVERLAP = 15 * 60  # Seconds re-requested before the last sync, for clock skew
+
+# Parse listing pages with precompiled lxml XPath (False: original BeautifulSoup path)
+FAST_PARSE = True
+
+# Parser worker processes (0 parses inline on the fetching thread)
+PARSE_WORKERS = 0
@@ -0,0 +1,341 @@
+"""Incrementally maintained aggregate cube of concert counts.
+
+Listings are counted by town, event month, source, venue and whether they
+are child-friendly. Every subset of those dimensions is kept as a rollup
+(32 in all), so "family concerts in Somerville per month" reads one rollup
+instead of regrouping the whole history, and a count with every filter
+given is a single dictionary lookup.
+
+The cube remembers the cell each event ID is counted in. An update only
+touches events that are new or whose cell changed, moving their count from
+the old cell to the new one; ``remove`` takes events out. ``sync`` keeps
+the cube in step with a dataset: ``main.py`` upserts every scraped listing,
+child-friendly or not, after deduplication into a dataset of its own
+(``config.CUBE_LISTINGS_DIR``) and applies that upsert's changes, so a
+concert listed by two sources counts once.
+
+On disk the cube is a directory laid out like the dataset's:
+
+- ``cells.json`` holds the count of every non-empty cell. It is small and
+  rewritten on every save, and is all a query reads; rollups are rebuilt
+  from it on load. It also records the version of the dataset last synced.
+- ``members.jsonl`` is an append-only log of memberships, one
+  ``[event_id, *cell]`` line per change (``[event_id]`` once removed), so a
+  save writes only what the run changed. It is read only to update the
+  cube, and compacted once it holds more lines than events counted.
+"""
+
+import json
+import logging
+import os
+from itertools import combinations
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scraper import config
+from scraper.dataset import Dataset, UpsertResult, event_id
+from scraper.keywords import CHILD_FRIENDLY, KeywordMatcher
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("town", "month", "source", "venue", "child_friendly")
+
+Cell = Tuple  # One value per dimension, in DIMENSIONS order
+Rollups = Dict[Tuple[int, ...], Dict[Tuple, int]]
+
+# Every subset of dimension positions, each in DIMENSIONS order
+_ROLLUPS: List[Tuple[int, ...]] = [
+    positions for size in range(len(DIMENSIONS) + 1) for positions in combinations(range(len(DIMENSIONS)), size)
+]
+_BASE = tuple(range(len(DIMENSIONS)))
+
+
+def _projection(positions: Tuple[int, ...]) -> Callable[[Cell], Tuple]:
+    """Return a function taking a cell to its key in the rollup of ``positions``."""
+    if len(positions) == 1:
+        getter = itemgetter(positions[0])
+        return lambda cell: (getter(cell),)
+    if not positions:
+        return lambda cell: ()
+    return itemgetter(*positions)
+
+
+_PROJECTIONS = [(positions, _projection(positions)) for positions in _ROLLUPS]
+
+
+def _month(record: Dict) -> Optional[str]:
+    """Return the ``YYYY-MM`` of a record's normalized start, or of an ISO date."""
+    for value in (record.get("start"), record.get("date")):
+        if isinstance(value, str) and len(value) >= 7 and value[:4].isdigit() and value[4] == "-":
+            return value[:7]
+    return None
+
+
+class AggregateCube:
+    """Concert counts per town, month, source, venue and child-friendliness, with every rollup."""
+
+    # Compact the membership log once it holds this many lines per counted event
+    COMPACT_RATIO = 2
+
+    def __init__(self, directory: str = None, matcher: KeywordMatcher = None):
+        self.directory = Path(directory or config.CUBE_DIR)
+        self.cells_path = self.directory / "cells.json"
+        self.log_path = self.directory / "members.jsonl"
+        self.matcher = matcher or CHILD_FRIENDLY
+        self._rollups: Optional[Rollups] = None
+        self._members: Optional[Dict[str, Cell]] = None
+        self._log_lines = 0
+        self._pending: List[list] = []  # Membership lines not yet appended to the log
+        self._rewrite = False  # Whether the log must be rewritten instead of appended to
+        self._dataset_version: Optional[str] = None
+
+    # -- State ----------------------------------------------------------------
+
+    @property
+    def rollups(self) -> Rollups:
+        """Counts per key for every subset of dimension positions."""
+        if self._rollups is None:
+            self._rollups = {positions: {} for positions in _ROLLUPS}
+            if self.cells_path.exists():
+                try:
+                    with open(self.cells_path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data["dimensions"] != list(DIMENSIONS):
+                        raise ValueError(f"dimensions {data['dimensions']}")
+                    self._apply({tuple(row[:-1]): row[-1] for row in data["cells"]})
+                    self._log_lines = data["log_lines"]
+                    self._dataset_version = data.get("dataset_version")
+                except (ValueError, KeyError, TypeError, IndexError) as e:
+                    logger.warning(f"Ignoring unreadable aggregate cube {self.cells_path} ({e}); counting from scratch")
+                    self._reset()
+        return self._rollups
+
+    @property
+    def dataset_version(self) -> Optional[str]:
+        """Version of the dataset the cube was last synced with (see ``sync``)."""
+        self.rollups
+        return self._dataset_version
+
+    @property
+    def members(self) -> Dict[str, Cell]:
+        """The cell each counted event ID is in, replayed from the membership log."""
+        if self._members is None:
+            self.rollups  # Says how many log lines the saved counts include
+            self._members = {}
+            if self.log_path.exists():
+                with open(self.log_path, encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+                if len(lines) > self._log_lines:
+                    # Appended by a run that stopped before saving its counts
+                    logger.warning(f"Ignoring {self.log_path} past line {self._log_lines}")
+                    del lines[self._log_lines :]
+                    self._rewrite = True
+                for eid, *cell in self._parse(lines):
+                    if cell:
+                        self._members[eid] = tuple(cell)
+                    else:
+                        self._members.pop(eid, None)
+        return self._members
+
+    def _parse(self, lines: List[str]) -> List[list]:
+        try:
+            return json.loads("[" + ",".join(lines) + "]")  # One parse in C instead of one per line
+        except ValueError:
+            rows = []
+            for line in lines:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping unreadable line in {self.log_path}")
+            return rows
+
+    def _reset(self):
+        self._dataset_version = None
+        self._rollups = {positions: {} for positions in _ROLLUPS}
+        self._members = {}
+        self._pending = []
+        self._rewrite = True
+
+    def __len__(self) -> int:
+        """Number of events counted."""
+        return self.rollups[()].get((), 0)
+
+    def _apply(self, deltas: Dict[Cell, int]):
+        """Add per-cell count changes to every rollup.
+
+        Changes are gathered per cell first, so a batch costs one update per
+        distinct cell and rollup rather than per event.
+        """
+        for positions, project in _PROJECTIONS:
+            counts = self._rollups[positions]
+            for cell, delta in deltas.items():
+                if not delta:
+                    continue
+                key = project(cell)
+                total = counts.get(key, 0) + delta
+                if total:
+                    counts[key] = total
+                else:
+                    del counts[key]
+
+    def cell(self, record: Dict) -> Cell:
+        """Return the cell a record is counted in."""
+        text = f"{record.get('title') or ''} {record.get('description') or ''}"
+        return (
+            record.get("town"),
+            _month(record),
+            record.get("source"),
+            record.get("venue"),
+            self.matcher.search(text),
+        )
+
+    # -- Updates --------------------------------------------------------------
+
+    def update(self, records: Iterable[Dict]) -> UpsertResult:
+        """Count new events and move changed ones to their new cell.
+
+        Events already counted in the same cell cost a lookup; events not in
+        ``records`` stay counted.
+        """
+        members = self.members
+        result = UpsertResult()
+        deltas: Dict[Cell, int] = {}
+        for record in records:
+            eid = record.get("event_id") or event_id(record)
+            cell = self.cell(record)
+            old = members.get(eid)
+            if old == cell:
+                result.unchanged += 1
+                continue
+            if old is None:
+                result.added.append(eid)
+            else:
+                deltas[old] = deltas.get(old, 0) - 1
+                result.updated.append(eid)
+            deltas[cell] = deltas.get(cell, 0) + 1
+            members[eid] = cell
+            self._pending.append([eid, *cell])
+        self._apply(deltas)
+        logger.info(f"Updated aggregate cube: {result}, {len(members)} events counted")
+        return result
+
+    def remove(self, event_ids: Iterable[str]) -> int:
+        """Stop counting events; returns how many were counted."""
+        members = self.members
+        deltas: Dict[Cell, int] = {}
+        for eid in event_ids:
+            cell = members.pop(eid, None)
+            if cell is not None:
+                deltas[cell] = deltas.get(cell, 0) - 1
+                self._pending.append([eid])
+        self._apply(deltas)
+        return -sum(deltas.values())
+
+    def sync(self, dataset: Dataset, records: Iterable[Dict]) -> UpsertResult:
+        """Upsert ``records`` into ``dataset`` and apply the same changes to the cube.
+
+        Events the upsert dropped (merged into another event) are removed.
+        If the dataset is not at the version the cube last synced, e.g. on the
+        first sync or after the dataset was upserted without the cube, the
+        cube is recounted from the dataset instead. Returns the upsert's result.
+        """
+        in_step = self.dataset_version is not None and self.dataset_version == dataset.version
+        # Keyed as the dataset keys them, so removals and recounts match
+        records = [{**record, "event_id": event_id(record)} for record in records]
+        changes = dataset.upsert(records)
+        if in_step:
+            self.update(records)
+            self.remove(changes.removed)
+        else:
+            logger.info(f"Aggregate cube is not at the version of {dataset.directory}; recounting")
+            self.rebuild(dataset.records())
+        self._dataset_version = dataset.version
+        return changes
+
+    def rebuild(self, records: Iterable[Dict]) -> UpsertResult:
+        """Recount from scratch, e.g. after the cell definition changed."""
+        self._reset()
+        return self.update(records)
+
+    # -- Queries --------------------------------------------------------------
+
+    def _rollup(self, dimensions: Iterable[str]) -> Tuple[Tuple[int, ...], Dict[Tuple, int]]:
+        unknown = set(dimensions) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions {sorted(unknown)}; dimensions are {list(DIMENSIONS)}")
+        positions = tuple(i for i, dimension in enumerate(DIMENSIONS) if dimension in dimensions)
+        return positions, self.rollups[positions]
+
+    def count(self, **filters) -> int:
+        """Return how many events match every given dimension value, e.g. ``count(town="Somerville")``."""
+        positions, counts = self._rollup(filters)
+        return counts.get(tuple(filters[DIMENSIONS[i]] for i in positions), 0)
+
+    def group(self, by: Sequence[str], **filters) -> Dict[Tuple, int]:
+        """Return counts per value of the ``by`` dimensions among events matching ``filters``.
+
+        Keys are tuples of the ``by`` values in the order given. This reads
+        only the rollup of ``by`` and the filtered dimensions, whose size
+        depends on how many distinct values there are, not on how many
+        events were counted.
+        """
+        positions, counts = self._rollup(set(by) | set(filters))
+        names = [DIMENSIONS[i] for i in positions]
+        wanted = [(names.index(dimension), value) for dimension, value in filters.items()]
+        order = [names.index(dimension) for dimension in by]
+        groups: Dict[Tuple, int] = {}
+        for key, count in counts.items():
+            if all(key[i] == value for i, value in wanted):
+                group = tuple(key[i] for i in order)
+                groups[group] = groups.get(group, 0) + count
+        return dict(sorted(groups.items(), key=lambda item: tuple(str(v) for v in item[0])))
+
+    # -- Persistence ----------------------------------------------------------
+
+    def save(self):
+        """Append this run's membership changes to the log and write the cell counts."""
+        if self._rollups is None:
+            return  # Never loaded, so nothing changed
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._rewrite:
+            self._write_log()
+        elif self._pending:
+            with open(self.log_path, "a", encoding="utf-8") as log:
+                log.writelines(json.dumps(line) + "\n" for line in self._pending)
+                log.flush()
+                os.fsync(log.fileno())
+            self._log_lines += len(self._pending)
+            self._pending = []
+        self._save_cells()
+        if self._members is not None and self._log_lines > self.COMPACT_RATIO * max(len(self._members), 1):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the membership log with one line per counted event."""
+        before = self._log_lines
+        self._write_log()
+        self._save_cells()
+        logger.info(f"Compacted aggregate cube log from {before} to {self._log_lines} lines")
+
+    def _write_log(self):
+        members = self.members
+        with atomic_open(self.log_path, encoding="utf-8") as f:
+            f.writelines(json.dumps([eid, *cell]) + "\n" for eid, cell in members.items())
+        self._log_lines = len(members)
+        self._pending = []
+        self._rewrite = False
+
+    def _save_cells(self):
+        cells = [[*cell, count] for cell, count in self.rollups[_BASE].items()]
+        with atomic_open(self.cells_path, encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dimensions": list(DIMENSIONS),
+                    "log_lines": self._log_lines,
+                    "dataset_version": self._dataset_version,
+                    "cells": cells,
+                },
+                f,
+            )
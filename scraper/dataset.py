@@ -0,0 +1,211 @@
+"""Incremental concert dataset keyed by stable event IDs.
+
+Every run upserts its results into the dataset instead of replacing it, so
+rerunning a single source keeps what the other sources found earlier.
+
+On disk the dataset is two files:
+
+- ``events.jsonl`` is an append-only log of record versions. A record is
+  appended only when its event is new or its content changed; the last line
+  for an event ID is the current version.
+- ``index.json`` holds, per event ID, a hash of the current content and the
+  ``first_seen``/``last_seen`` timestamps. Only this small file is rewritten
+  for events that were seen again unchanged. It also holds a ``version``
+  token that changes whenever an event is added, changed or removed, so
+  data derived from the dataset can tell whether it is still current.
+
+An event stored on its own is removed once a later run merges its listing
+into another event (it appears in that event's ``sources``).
+
+The log is compacted once superseded versions outnumber live events.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from scraper import config
+from scraper.writers import FIELDS, atomic_open, write_concerts
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify an event; the same event scraped twice gets the same ID
+ID_FIELDS = ["source", "url", "title", "date", "venue"]
+DATASET_FIELDS = ["event_id"] + FIELDS + ["first_seen", "last_seen"]
+# Per-run or bookkeeping fields that do not count as a content change
+_VOLATILE_FIELDS = {"event_id", "scraped_at", "first_seen", "last_seen"}
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def event_id(record: Dict) -> str:
+    """Return a stable ID for an event from its normalized source, URL, title, date and venue."""
+    parts = [_normalize(record.get(field)) for field in ID_FIELDS]
+    parts[1] = parts[1].rstrip("/")
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:16]
+
+
+def _content_hash(record: Dict) -> str:
+    content = {k: v for k, v in record.items() if k not in _VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def _as_record(concert) -> Dict:
+    return dict(concert) if isinstance(concert, dict) else concert.to_dict()
+
+
+class UpsertResult:
+    """What an upsert changed in the dataset."""
+
+    def __init__(self):
+        self.added: List[str] = []
+        self.updated: List[str] = []
+        self.removed: List[str] = []
+        self.unchanged = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"UpsertResult(added={len(self.added)}, updated={len(self.updated)}, "
+            f"removed={len(self.removed)}, unchanged={self.unchanged})"
+        )
+
+
+class Dataset:
+    """Concert dataset on disk that grows by upsert."""
+
+    # Compact the log once it holds this many lines per live event
+    COMPACT_RATIO = 2
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory or config.DATASET_DIR)
+        self.log_path = self.directory / "events.jsonl"
+        self.index_path = self.directory / "index.json"
+        self._index: Optional[Dict[str, Dict]] = None
+        self._log_lines = 0
+        self._version: Optional[str] = None
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        """Content hash and first/last seen timestamps per event ID."""
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path) as f:
+                    data = json.load(f)
+                self._index = data["events"]
+                self._log_lines = data["log_lines"]
+                self._version = data.get("version")
+        return self._index
+
+    @property
+    def version(self) -> Optional[str]:
+        """Token that changes whenever an event is added, changed or removed; None if never saved."""
+        self.index
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def upsert(self, concerts: Iterable, seen_at: str = None) -> UpsertResult:
+        """Merge concerts into the dataset.
+
+        New and changed events are appended to the log; events seen again
+        unchanged only get their ``last_seen`` moved to ``seen_at`` (default:
+        now). Events missing from ``concerts`` are kept as they are, except
+        those merged into one of them by deduplication, which are removed.
+        """
+        seen_at = seen_at or datetime.now().isoformat()
+        index = self.index
+        result = UpsertResult()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            for concert in concerts:
+                record = _as_record(concert)
+                eid = event_id(record)
+                for listing in record.get("sources") or []:
+                    merged_id = listing.get("event_id")
+                    if merged_id and merged_id != eid and index.pop(merged_id, None) is not None:
+                        result.removed.append(merged_id)
+                digest = _content_hash(record)
+                entry = index.get(eid)
+                if entry is not None and entry["hash"] == digest:
+                    entry["last_seen"] = max(entry["last_seen"], seen_at)
+                    result.unchanged += 1
+                    continue
+
+                if entry is None:
+                    entry = index[eid] = {"first_seen": seen_at}
+                    result.added.append(eid)
+                else:
+                    result.updated.append(eid)
+                entry["hash"] = digest
+                entry["last_seen"] = seen_at
+                record.pop("first_seen", None)
+                record.pop("last_seen", None)
+                record["event_id"] = eid
+                log.write(json.dumps(record))
+                log.write("\n")
+                self._log_lines += 1
+            log.flush()
+            os.fsync(log.fileno())
+
+        if result.added or result.updated or result.removed or self._version is None:
+            self._version = uuid.uuid4().hex
+        self._save_index()
+        if self._log_lines > self.COMPACT_RATIO * max(len(index), 1):
+            self.compact()
+        logger.info(f"Upserted into dataset: {result}, {len(index)} events in total")
+        return result
+
+    def records(self) -> Iterator[Dict]:
+        """Yield the current version of every event, with its event ID and first/last seen times."""
+        index = self.index
+        latest: Dict[str, Dict] = {}
+        if self.log_path.exists():
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash; the index never recorded it
+                        logger.warning(f"Skipping unreadable line in {self.log_path}")
+                        continue
+                    entry = index.get(record.get("event_id"))
+                    if entry is not None and _content_hash(record) == entry["hash"]:
+                        latest[record["event_id"]] = record
+
+        for eid, record in latest.items():
+            entry = index[eid]
+            yield {**record, "first_seen": entry["first_seen"], "last_seen": entry["last_seen"]}
+
+    def compact(self):
+        """Rewrite the log with only the current version of each event."""
+        count = 0
+        with atomic_open(self.log_path, encoding="utf-8") as f:
+            for record in self.records():
+                record.pop("first_seen")
+                record.pop("last_seen")
+                f.write(json.dumps(record))
+                f.write("\n")
+                count += 1
+        logger.info(f"Compacted dataset log from {self._log_lines} to {count} lines")
+        self._log_lines = count
+        self._save_index()
+
+    def export(self, json_path: str = None, jsonl_path: str = None, csv_path: str = None) -> int:
+        """Write the whole dataset to JSON, JSON Lines and/or CSV."""
+        return write_concerts(
+            self.records(), jsonl_path=jsonl_path, csv_path=csv_path, json_path=json_path, fields=DATASET_FIELDS
+        )
+
+    def _save_index(self):
+        with atomic_open(self.index_path, encoding="utf-8") as f:
+            json.dump({"log_lines": self._log_lines, "version": self.version, "events": self.index}, f)
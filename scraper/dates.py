@@ -0,0 +1,239 @@
+"""Normalization of scraped dates into timezone-aware start/end timestamps.
+
+Each source writes dates its own way: ISO 8601 from ``datetime``
+attributes and the Eventbrite API, free text like ``Saturday, June 14, 2025
+· 11:00AM - 3:00PM`` from Boston.gov, ``Sept 5 2025``, or ``Aug 10`` with no
+year. Every
+known format is a regex plus a ``strptime`` pattern. The first format that
+parses a value is remembered for its source, so a batch from one source
+costs a dictionary lookup, a match and a ``strptime`` per date rather than
+trying every format.
+
+Timestamps are expressed in ``config.LOCAL_TIMEZONE``, which is also the
+zone of times given without an offset. A date with no time is an all-day
+event ending at the next midnight. Listings are mostly upcoming, so a date
+with no year is placed in the first year that puts it no more than
+``PAST_WINDOW`` before it was scraped.
+"""
+
+import logging
+import re
+from collections import Counter
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from scraper import config
+
+logger = logging.getLogger(__name__)
+
+Span = Tuple[datetime, Optional[datetime]]
+
+# How far before the scrape a year-less date may fall before it is read as next year's
+PAST_WINDOW = timedelta(days=90)
+
+_TIME = r"\d{1,2}(?::\d{2})?\s*[AaPp]\.?[Mm]\.?"
+_TIME_RANGE = rf"(?:\s*(?:·|@|,|at|-)?\s*(?P<start>{_TIME})(?:\s*(?:-|–|to)\s*(?P<end>{_TIME}))?)?"
+_WEEKDAY = r"(?:[A-Za-z]+,?\s+)?"
+_CLOCK = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AaPp])")
+_MONTH = re.compile(r"^([A-Za-z]+)\.?")
+
+
+@lru_cache(maxsize=4096)
+def _strptime(value: str, pattern: str) -> datetime:
+    """``datetime.strptime``, memoized: a batch repeats the same few hundred days."""
+    return datetime.strptime(value, pattern)
+
+
+def _month_name(match: re.Match) -> str:
+    # strptime's %b only knows three-letter abbreviations
+    return "Sep" if match.group(1).lower() == "sept" else match.group(1)
+
+
+@lru_cache(maxsize=4096)
+def _clean(value: str) -> str:
+    """Ready a date for ``strptime``: drop commas and a period after the month; ``Sept`` becomes ``Sep``."""
+    return _MONTH.sub(_month_name, value.replace(",", ""))
+
+
+@lru_cache(maxsize=1024)
+def _clock(value: str) -> Tuple[int, int]:
+    """Parse ``11:00AM``, ``6pm`` or ``10:30 a.m.`` into (hour, minute)."""
+    hour, minute, meridiem = _CLOCK.match(value).groups()
+    hour = int(hour) % 12 + (12 if meridiem in "Pp" else 0)
+    return hour, int(minute or 0)
+
+
+class DateFormat:
+    """One way a source writes dates."""
+
+    def __init__(self, name: str, pattern: str, strptime: Optional[str] = None, has_year: bool = True):
+        self.name = name
+        self.regex = re.compile(pattern)
+        # Format of the ``date`` group; None means ISO 8601
+        self.strptime = strptime
+        self.has_year = has_year
+
+    def parse(self, value: str, tz: tzinfo, reference: datetime) -> Optional[Span]:
+        """Return (start, end) for ``value``, or None if it is not in this format."""
+        match = self.regex.fullmatch(value)
+        if match is None:
+            return None
+        try:
+            if self.strptime is None:
+                return self._parse_iso(match.group("date"), tz)
+            day = _strptime(_clean(match.group("date")), self.strptime)
+        except ValueError:
+            return None
+        if not self.has_year:
+            day = _upcoming_year(day, reference)
+
+        start_time = match.group("start")
+        if not start_time:
+            start = day.replace(tzinfo=tz)
+            return start, start + timedelta(days=1)
+        hour, minute = _clock(start_time)
+        start = day.replace(hour=hour, minute=minute, tzinfo=tz)
+        end = None
+        if match.group("end"):
+            hour, minute = _clock(match.group("end"))
+            end = start.replace(hour=hour, minute=minute)
+            if end <= start:
+                end += timedelta(days=1)
+        return start, end
+
+    @staticmethod
+    def _parse_iso(value: str, tz: tzinfo) -> Span:
+        if value.endswith(("Z", "z")):
+            value = value[:-1] + "+00:00"
+        start = datetime.fromisoformat(value)
+        all_day = len(value) == 10
+        start = start.replace(tzinfo=tz) if start.tzinfo is None else start.astimezone(tz)
+        return start, (start + timedelta(days=1) if all_day else None)
+
+
+def _upcoming_year(day: datetime, reference: datetime) -> datetime:
+    """Give a year-less date the first year that is not more than PAST_WINDOW before ``reference``."""
+    for year in range(reference.year - 1, reference.year + 5):
+        try:
+            candidate = day.replace(year=year)
+        except ValueError:  # February 29
+            continue
+        if candidate >= reference - PAST_WINDOW:
+            return candidate
+    raise ValueError(f"No year found for {day:%m-%d}")
+
+
+def _formats() -> List[DateFormat]:
+    formats = [
+        DateFormat("iso", r"(?P<date>\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:[Zz]|[+-]\d{2}:?\d{2})?)?)"),
+        DateFormat("us-numeric", rf"{_WEEKDAY}(?P<date>\d{{1,2}}/\d{{1,2}}/\d{{4}}){_TIME_RANGE}", "%m/%d/%Y"),
+    ]
+    for month, label in (("%B", "long"), ("%b", "short")):
+        formats.append(
+            DateFormat(
+                f"{label}-month",
+                rf"{_WEEKDAY}(?P<date>[A-Za-z]+\.? \d{{1,2}},? \d{{4}}){_TIME_RANGE}",
+                f"{month} %d %Y",
+            )
+        )
+        formats.append(
+            DateFormat(
+                f"{label}-month-no-year",
+                rf"{_WEEKDAY}(?P<date>[A-Za-z]+\.? \d{{1,2}}){_TIME_RANGE}",
+                f"{month} %d",
+                has_year=False,
+            )
+        )
+    return formats
+
+
+FORMATS = _formats()
+
+
+class DateNormalizer:
+    """Parses scraped dates, remembering which format each source uses.
+
+    ``stats`` counts outcomes per source: ``parsed``, ``missing`` (empty
+    date) and ``unparseable``.
+    """
+
+    def __init__(self, timezone: str = None, formats: List[DateFormat] = None):
+        self.tz = ZoneInfo(timezone or config.LOCAL_TIMEZONE)
+        self.formats = formats or FORMATS
+        self._by_source: Dict[Optional[str], DateFormat] = {}
+        self.stats: Dict[Optional[str], Counter] = {}
+
+    def parse(self, value: Optional[str], source: str = None, reference: datetime = None) -> Optional[Span]:
+        """Return (start, end) for a scraped date, or None if it is empty or unparseable.
+
+        ``end`` is None when the listing gives only a start time.
+        ``reference`` (default: now) is when the date was scraped, used to
+        pick the year of dates written without one.
+        """
+        stats = self.stats.get(source)
+        if stats is None:
+            stats = self.stats[source] = Counter()
+        value = " ".join(value.split()) if isinstance(value, str) else ""
+        if not value:
+            stats["missing"] += 1
+            return None
+
+        reference = reference or datetime.now()
+        known = self._by_source.get(source)
+        if known is not None:
+            span = known.parse(value, self.tz, reference)
+            if span is not None:
+                stats["parsed"] += 1
+                return span
+
+        for date_format in self.formats:
+            if date_format is known:
+                continue
+            span = date_format.parse(value, self.tz, reference)
+            if span is not None:
+                self._by_source[source] = date_format
+                stats["parsed"] += 1
+                return span
+
+        stats["unparseable"] += 1
+        logger.debug(f"Unparseable date from {source}: {value!r}")
+        return None
+
+    def normalize(self, record: Dict) -> Dict:
+        """Set a record's ``start`` and ``end`` ISO timestamps from its ``date``."""
+        [start], [end] = self.normalize_values([record.get("date")], [record.get("source")], [record.get("scraped_at")])
+        record["start"] = start
+        record["end"] = end
+        return record
+
+    def normalize_values(
+        self, dates: Iterable, sources: Iterable, scraped_at: Iterable
+    ) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+        """Return ISO ``start`` and ``end`` lists for parallel date, source and scrape-time columns."""
+        references: Dict[str, datetime] = {}  # A batch shares a handful of scrape times
+        starts, ends = [], []
+        for value, source, scraped in zip(dates, sources, scraped_at):
+            reference = None
+            if isinstance(scraped, str) and scraped:
+                reference = references.get(scraped)
+                if reference is None:
+                    reference = references[scraped] = datetime.fromisoformat(scraped[:19])
+            span = self.parse(value, source, reference)
+            if span is None:
+                starts.append(None)
+                ends.append(None)
+            else:
+                starts.append(span[0].isoformat())
+                ends.append(span[1].isoformat() if span[1] else None)
+        return starts, ends
+
+    def format_for(self, source: str) -> Optional[str]:
+        """Return the name of the format remembered for a source."""
+        date_format = self._by_source.get(source)
+        return date_format.name if date_format else None
+
+    def totals(self) -> Counter:
+        """Return the outcome counts summed over every source."""
+        return sum(self.stats.values(), Counter())
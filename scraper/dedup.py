@@ -0,0 +1,177 @@
+"""Cross-source deduplication of scraped concerts.
+
+The same concert is often listed by several sources with slightly different
+titles and venue strings. Records are grouped into blocks by (day, town) and
+fuzzy-matched only against other records in the same block, so the cost
+grows with the number of records rather than the number of pairs. Each group
+of duplicates is merged into one record that takes the best field from each
+listing and lists every contributing listing, with its event ID, in
+``sources``. A listing
+without a day only merges with listings of the same URL.
+"""
+
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from scraper import config
+from scraper.dataset import event_id
+
+logger = logging.getLogger(__name__)
+
+_TITLE_STOPWORDS = {"a", "an", "and", "at", "feat", "featuring", "for", "in", "of", "on", "presents", "the", "with"}
+_VENUE_STOPWORDS = {"the", "at", "of"} | {town.lower() for town in config.BOSTON_METRO_TOWNS}
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_ISO_DAY = re.compile(r"\d{4}-\d{2}-\d{2}")
+_ISO_TIME = re.compile(r"T(\d{2}:\d{2})")
+
+
+def _tokens(text: Optional[str], stopwords: Set[str]) -> List[str]:
+    text = (text or "").lower().replace("&", " and ")
+    return [t for t in _NON_WORD.split(text) if t and t not in stopwords]
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lowercase a title and drop punctuation and filler words."""
+    return " ".join(_tokens(title, _TITLE_STOPWORDS))
+
+
+def normalize_venue(venue: Optional[str]) -> str:
+    """Lowercase a venue and drop punctuation, filler words and town names."""
+    return " ".join(_tokens(venue, _VENUE_STOPWORDS))
+
+
+class _Listing:
+    """A record with the normalized keys used for matching."""
+
+    __slots__ = ("record", "title", "title_tokens", "venue_tokens", "time")
+
+    def __init__(self, record: Dict):
+        self.record = record
+        self.title = normalize_title(record.get("title"))
+        self.title_tokens = set(self.title.split())
+        self.venue_tokens = set(normalize_venue(record.get("venue")).split())
+        start, end = record.get("start"), record.get("end")
+        if start and not (start[11:19] == "00:00:00" and end and end[11:19] == "00:00:00"):
+            self.time = start[11:16]
+        else:
+            # All-day or unnormalized: only an ISO date says when it starts
+            match = _ISO_TIME.search(record.get("date") or "")
+            self.time = match.group(1) if match else None
+
+
+class Deduplicator:
+    """Finds and merges listings of the same concert from different sources."""
+
+    def __init__(self, title_similarity: float = None, source_priority: List[str] = None):
+        self.title_similarity = config.DEDUP_TITLE_SIMILARITY if title_similarity is None else title_similarity
+        priority = config.SOURCE_PRIORITY if source_priority is None else source_priority
+        self._rank = {source: rank for rank, source in enumerate(priority)}
+
+    @staticmethod
+    def block_key(record: Dict) -> Optional[Tuple[str, str]]:
+        """Return the (day, town) block a record is compared within.
+
+        The day comes from the normalized ``start`` when there is one, so
+        free-text and ISO dates of the same day share a block. A record
+        without a day is only compared with records of the same URL, and
+        with none if it has no URL either.
+        """
+        start = record.get("start")
+        date = (record.get("date") or "").strip()
+        match = _ISO_DAY.match(date)
+        day = start[:10] if start else match.group(0) if match else date.lower()
+        if not day:
+            url = (record.get("url") or "").strip().rstrip("/").lower()
+            return ("", url) if url else None
+        return day, (record.get("town") or "").lower()
+
+    def is_duplicate(self, a: _Listing, b: _Listing) -> bool:
+        """Whether two listings in the same block describe the same concert."""
+        # Two showings on the same day are different events
+        if a.time and b.time and a.time != b.time:
+            return False
+
+        if a.venue_tokens and b.venue_tokens:
+            shared = len(a.venue_tokens & b.venue_tokens)
+            if shared < min(len(a.venue_tokens), len(b.venue_tokens)) and shared * 2 < len(
+                a.venue_tokens | b.venue_tokens
+            ):
+                return False
+
+        if a.title == b.title:
+            return True
+        shorter, longer = sorted((a.title_tokens, b.title_tokens), key=len)
+        if len(shorter) >= 2 and shorter <= longer:
+            return True
+        matcher = SequenceMatcher(None, a.title, b.title)
+        threshold = self.title_similarity
+        return matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+    def deduplicate(self, records: Iterable[Dict]) -> List[Dict]:
+        """Return the records with each group of duplicates merged into one.
+
+        Records keep their original order; a merged record takes the place of
+        its first listing.
+        """
+        blocks: Dict[Tuple[str, str], List[List[_Listing]]] = {}
+        groups: List[List[_Listing]] = []
+        count = 0
+        for record in records:
+            count += 1
+            listing = _Listing(record)
+            key = self.block_key(record)
+            clusters = [] if key is None else blocks.setdefault(key, [])
+            for cluster in clusters:
+                if self.is_duplicate(cluster[0], listing):
+                    cluster.append(listing)
+                    break
+            else:
+                cluster = [listing]
+                clusters.append(cluster)
+                groups.append(cluster)
+
+        merged = [self.merge([listing.record for listing in group]) for group in groups]
+        logger.info(f"Deduplicated {count} listings into {len(merged)} concerts across {len(blocks)} blocks")
+        return merged
+
+    def merge(self, records: List[Dict]) -> Dict:
+        """Merge listings of one concert, preferring fields from higher-priority sources.
+
+        The fields the event ID is made of (see ``scraper.dataset.ID_FIELDS``)
+        come from the top-priority listing alone, as do its start, end and
+        coordinates, so the merged record keeps that listing's ID whichever
+        other sources were in the run. Only town, address and description are
+        filled in from the other listings.
+        """
+        if len(records) == 1:
+            return records[0]
+
+        ranked = sorted(records, key=lambda r: self._rank.get(r.get("source"), len(self._rank)))
+        merged = dict(ranked[0])
+        for field in ("town", "address"):
+            merged[field] = next((r[field] for r in ranked if r.get(field)), merged.get(field))
+        # The longest description carries the most information
+        merged["description"] = max((r.get("description") or "" for r in ranked), key=len) or merged.get("description")
+
+        sources = []
+        for record in ranked:
+            sources.extend(
+                record.get("sources")
+                or [
+                    {
+                        "source": record.get("source"),
+                        "url": record.get("url"),
+                        "title": record.get("title"),
+                        "event_id": event_id(record),
+                    }
+                ]
+            )
+        merged["sources"] = sources
+        return merged
+
+
+def deduplicate(records: Iterable[Dict]) -> List[Dict]:
+    """Merge duplicate listings with the default settings."""
+    return Deduplicator().deduplicate(records)
@@ -5,16 +5,28 @@ shows how to use the API. You'll need to:
 1. Create an Eventbrite account
 2. Get an API key from https://www.eventbrite.com/platform/api
 3. Set the EVENTBRITE_API_KEY environment variable
+
+In incremental mode each search term only asks for events modified since
+its last complete sync, as recorded in ``config.EVENTBRITE_CURSOR_PATH``.
+The first incremental run, and any run with ``full_sync``, backfills the
+whole window.
 """
 
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
+from scraper import config
 from scraper.base_scraper import BaseScraper, Concert
+from scraper.gazetteer import resolve_town
+from scraper.ratelimit import TokenBucket, get_bucket
+from scraper.sync_cursor import SyncCursor
+from scraper.table import ConcertTable
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +34,41 @@ logger = logging.getLogger(__name__)
 class EventbriteScraper(BaseScraper):
     """Scraper for Eventbrite events."""
 
-    def __init__(self, location: str = "Boston, MA", search_terms: List[str] = None):
+    def __init__(
+        self,
+        location: str = "Boston, MA",
+        search_terms: List[str] = None,
+        search_workers: int = None,
+        max_pages: int = None,
+        rate_limiter: TokenBucket = None,
+        incremental: bool = None,
+        full_sync: bool = None,
+        cursor: SyncCursor = None,
+    ):
         super().__init__()
         self.api_key = os.getenv("EVENTBRITE_API_KEY")
         self.location = location
         self.search_terms = search_terms or ["kids concert", "children's music", "family concert"]
         self.base_url = "https://www.eventbriteapi.com/v3"
-
-    def scrape(self) -> List[Concert]:
-        """Scrape events from Eventbrite API."""
+        self.search_workers = search_workers or config.EVENTBRITE_SEARCH_WORKERS
+        self.max_pages = max_pages or config.EVENTBRITE_MAX_PAGES
+        # The quota is per API key, so every Eventbrite scraper shares one bucket
+        self.rate_limiter = rate_limiter or get_bucket(
+            "eventbrite", config.EVENTBRITE_RATE_LIMIT, config.EVENTBRITE_BURST
+        )
+        self.incremental = config.EVENTBRITE_INCREMENTAL if incremental is None else incremental
+        self.full_sync = config.EVENTBRITE_FULL_SYNC if full_sync is None else full_sync
+        self.cursor = cursor or SyncCursor(config.EVENTBRITE_CURSOR_PATH)
+
+    def scrape(self) -> ConcertTable:
+        """Scrape events from Eventbrite API.
+
+        Search terms run concurrently and each follows every result page.
+        Terms overlap, so an event found by several of them is kept once. In
+        incremental mode, events already seen and not changed since the last
+        sync are skipped, and each term's cursor moves forward once all its
+        pages were fetched.
+        """
         if not self.api_key:
             logger.warning(
                 "EVENTBRITE_API_KEY not set. Skipping Eventbrite scraper. "
@@ -38,50 +76,130 @@ class EventbriteScraper(BaseScraper):
             )
             return self.concerts
 
-        headers = {"Authorization": f"Bearer {self.api_key}"}
+        workers = max(1, min(self.search_workers, len(self.search_terms)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eventbrite") as executor:
+            results = list(executor.map(self._search, self.search_terms))
+
+        seen = set()
+        for search_term, (events, synced_at) in zip(self.search_terms, results):
+            previous = self._previous_sync(search_term)
+            new_events = 0
+            for event in events:
+                key = event.get("id") or event.get("url")
+                if key in seen or self._unchanged_since(event, previous):
+                    continue
+                seen.add(key)
+                self.concerts.append(self._concert(event))
+                new_events += 1
+            logger.info(f"Found {len(events)} events for '{search_term}', {new_events} new")
+
+            if self.incremental and synced_at:
+                ids = [event["id"] for event in events if event.get("id")]
+                self.cursor.update(self._cursor_key(search_term), synced_at, ids, full=previous is None)
+        if self.incremental:
+            self.cursor.save()
+
+        logger.info(f"Total Eventbrite concerts scraped: {len(self.concerts)}")
+        return self.concerts
 
+    def _cursor_key(self, search_term: str) -> str:
+        return f"{self.location}|{search_term}"
+
+    def _previous_sync(self, search_term: str) -> Optional[Dict]:
+        """Return the cursor to resume ``search_term`` from, or None for a full sync."""
+        if not self.incremental or self.full_sync:
+            return None
+        return self.cursor.get(self._cursor_key(search_term))
+
+    @staticmethod
+    def _unchanged_since(event: Dict, previous: Optional[Dict]) -> bool:
+        """Whether an event was already seen and not modified since the previous sync.
+
+        The overlap window returns a few such events again.
+        """
+        if previous is None or event.get("id") not in previous["seen_ids"]:
+            return False
+        changed = event.get("changed")
+        return bool(changed) and changed <= previous["synced_at"]
+
+    def _search(self, search_term: str) -> Tuple[List[Dict], Optional[str]]:
+        """Fetch every result page for one search term.
+
+        Returns the events and the time the search started, or None instead
+        of the time if it did not complete. On an error, the events from the
+        pages already fetched are kept.
+        """
+        synced_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         # Search for events in the last year
         start_date = (datetime.now() - timedelta(days=365)).isoformat() + "Z"
         end_date = datetime.now().isoformat() + "Z"
+        params = {
+            "location.address": self.location,
+            "location.within": "25mi",  # 25 mile radius
+            "start_date.range_start": start_date,
+            "start_date.range_end": end_date,
+            "q": search_term,
+            "expand": "venue",
+        }
+        previous = self._previous_sync(search_term)
+        if previous is not None:
+            since = datetime.strptime(previous["synced_at"], "%Y-%m-%dT%H:%M:%SZ") - timedelta(
+                seconds=config.EVENTBRITE_SYNC_OVERLAP
+            )
+            params["date_modified.range_start"] = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+        headers = {"Authorization": f"Bearer {self.api_key}"}
 
-        for search_term in self.search_terms:
-            try:
-                params = {
-                    "location.address": self.location,
-                    "location.within": "25mi",  # 25 mile radius
-                    "start_date.range_start": start_date,
-                    "start_date.range_end": end_date,
-                    "q": search_term,
-                    "expand": "venue",
-                }
-
-                response = requests.get(
-                    f"{self.base_url}/events/search/",
-                    headers=headers,
-                    params=params,
-                    timeout=30,
-                )
+        events: List[Dict] = []
+        try:
+            for page in range(1, self.max_pages + 1):
+                self._wait_for_quota()
+                response = self.fetch(f"{self.base_url}/events/search/", headers=headers, params=params)
                 response.raise_for_status()
                 data = response.json()
-
-                for event in data.get("events", []):
-                    venue_info = event.get("venue", {})
-                    concert = Concert(
-                        title=event.get("name", {}).get("text", ""),
-                        venue=venue_info.get("name", "Unknown Venue"),
-                        town=venue_info.get("address", {}).get("city", "Unknown"),
-                        date=event.get("start", {}).get("local", ""),
-                        url=event.get("url", ""),
-                        description=event.get("description", {}).get("text", ""),
-                        address=venue_info.get("address", {}).get("localized_address_display", ""),
-                        source="Eventbrite",
-                    )
-                    self.concerts.append(concert)
-
-                logger.info(f"Found {len(data.get('events', []))} events for '{search_term}'")
-
-            except requests.RequestException as e:
-                logger.error(f"Error scraping Eventbrite for '{search_term}': {e}")
-
-        logger.info(f"Total Eventbrite concerts scraped: {len(self.concerts)}")
-        return self.concerts
+                events.extend(data.get("events", []))
+
+                pagination = data.get("pagination") or {}
+                if not pagination.get("has_more_items"):
+                    break
+                # Newer responses page by continuation token, older ones by page number
+                if pagination.get("continuation"):
+                    params = {**params, "continuation": pagination["continuation"]}
+                else:
+                    params = {**params, "page": pagination.get("page_number", page) + 1}
+            else:
+                logger.warning(f"Stopped after {self.max_pages} Eventbrite pages for '{search_term}'")
+                return events, None
+        except requests.RequestException as e:
+            logger.error(f"Error scraping Eventbrite for '{search_term}': {e}")
+            return events, None
+        return events, synced_at
+
+    def _wait_for_quota(self):
+        """Take a request token, waiting no longer than the scraper's deadline allows."""
+        timeout = None if self.deadline is None else max(self.deadline - time.monotonic(), 0)
+        if not self.rate_limiter.acquire(timeout=timeout):
+            raise requests.Timeout("Deadline exceeded waiting for Eventbrite API quota")
+
+    @staticmethod
+    def _concert(event: Dict) -> Concert:
+        """Build a Concert from an Eventbrite event with its venue expanded."""
+        venue_info = event.get("venue") or {}
+        venue_name = venue_info.get("name", "Unknown Venue")
+        address = venue_info.get("address") or {}
+        city = address.get("city", "Unknown")
+        address_display = address.get("localized_address_display", "")
+        latitude, longitude = venue_info.get("latitude"), venue_info.get("longitude")
+        return Concert(
+            title=event.get("name", {}).get("text", ""),
+            venue=venue_name,
+            # Eventbrite often reports a neighborhood ("Jamaica Plain") as the city
+            town=resolve_town(city, address_display, venue_name, default=city),
+            date=event.get("start", {}).get("local", ""),
+            url=event.get("url", ""),
+            description=(event.get("description") or {}).get("text", ""),
+            address=address_display,
+            # The API gives venue coordinates as strings
+            latitude=float(latitude) if latitude else None,
+            longitude=float(longitude) if longitude else None,
+            source="Eventbrite",
+        )
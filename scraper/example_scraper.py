@@ -45,7 +45,7 @@ class ExampleScraper(BaseScraper):
 
         try:
             # Example: Make request
-            # response = requests.get(f"{self.base_url}/events/{self.town}")
+            # response = self.fetch(f"{self.base_url}/events/{self.town}")
             # response.raise_for_status()
 
             # Example: Parse HTML
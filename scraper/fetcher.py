@@ -0,0 +1,283 @@
+"""Pooled, keep-alive HTTP session layer shared by all scrapers.
+
+Every request also goes through a per-host politeness scheduler that caps
+requests in flight, spaces request starts, and backs off (honouring
+``Retry-After``) when a host answers 429 or 503.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper import config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str], now: datetime = None) -> Optional[float]:
+    """Return the seconds a ``Retry-After`` header asks to wait, or None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+class _HostState:
+    """Scheduling state of one host."""
+
+    __slots__ = ("in_flight", "lock", "next_start", "interval")
+
+    def __init__(self, max_in_flight: int, interval: float):
+        self.in_flight = threading.BoundedSemaphore(max(max_in_flight, 1))
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.interval = interval
+
+
+class HostScheduler:
+    """Per-host politeness shared by every scraper in the process.
+
+    At most ``max_in_flight`` requests run against a host at once and their
+    starts are at least the host's current interval apart. The interval
+    starts at ``min_interval``, doubles (from at least ``backoff_base``)
+    each time the host throttles us, and eases back by 10% per successful
+    request, so each site settles near the fastest rate it accepts.
+    """
+
+    # Interval multiplier applied after each successful request
+    RECOVERY = 0.9
+
+    def __init__(
+        self,
+        settings_for: Callable[[str], Dict],
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.settings_for = settings_for
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                settings = self.settings_for(host)
+                state = self._hosts[host] = _HostState(settings["max_in_flight"], settings["min_interval"])
+            return state
+
+    def now(self) -> float:
+        """Return the scheduler's clock, against which deadlines are measured."""
+        return self._clock()
+
+    def interval(self, host: str) -> float:
+        """Return the current spacing between request starts for ``host``."""
+        return self._state(host).interval
+
+    @contextmanager
+    def slot(self, host: str, deadline: Optional[float] = None) -> Iterator[None]:
+        """Hold one of the host's in-flight slots, starting no sooner than its schedule allows.
+
+        Raises ``requests.Timeout`` if the request could not start before
+        ``deadline`` (a ``time.monotonic`` value).
+        """
+        state = self._state(host)
+        timeout = None if deadline is None else max(deadline - self._clock(), 0)
+        if not state.in_flight.acquire(timeout=timeout):
+            raise requests.Timeout(f"Deadline exceeded waiting for a connection slot to {host}")
+        try:
+            with state.lock:
+                now = self._clock()
+                start = max(now, state.next_start)
+                if deadline is not None and start > deadline:
+                    raise requests.Timeout(f"Deadline exceeded waiting for {host} to accept requests")
+                state.next_start = start + state.interval
+            if start > now:
+                self._sleep(start - now)
+            yield
+        finally:
+            state.in_flight.release()
+
+    def succeeded(self, host: str):
+        """Ease a host's interval back toward its configured minimum."""
+        state = self._state(host)
+        min_interval = self.settings_for(host)["min_interval"]
+        with state.lock:
+            state.interval = max(min_interval, state.interval * self.RECOVERY)
+
+    def throttled(self, host: str, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Slow a host down after a throttled or failed request.
+
+        Every request to the host waits out the returned delay: ``Retry-After``
+        when the server sent one, else exponential backoff with jitter. Both
+        are capped at ``backoff_max``.
+        """
+        settings = self.settings_for(host)
+        if retry_after is None:
+            delay = min(settings["backoff_max"], settings["backoff_base"] * 2**attempt)
+            # Equal jitter: clients throttled together do not retry together
+            delay = delay / 2 + self._jitter() * delay / 2
+        else:
+            delay = min(retry_after, settings["backoff_max"])
+
+        state = self._state(host)
+        with state.lock:
+            state.next_start = max(state.next_start, self._clock() + delay)
+            state.interval = min(settings["backoff_max"], max(state.interval * 2, settings["backoff_base"]))
+        return delay
+
+
+class SessionPool:
+    """Hands out one pooled, keep-alive ``requests.Session`` per host.
+
+    Sessions keep connections open between requests, so repeated fetches
+    from the same site reuse the TCP/TLS connection instead of opening a
+    new one. Pool sizes and timeouts come from ``config.HTTP_HOST_SETTINGS``
+    with ``config.HTTP_DEFAULT_SETTINGS`` as the fallback. Requests are
+    paced and retried by ``scheduler``.
+    """
+
+    def __init__(
+        self,
+        host_settings: Dict[str, Dict] = None,
+        default_settings: Dict = None,
+        scheduler: HostScheduler = None,
+    ):
+        self.host_settings = config.HTTP_HOST_SETTINGS if host_settings is None else host_settings
+        self.default_settings = default_settings or config.HTTP_DEFAULT_SETTINGS
+        self.scheduler = scheduler or HostScheduler(self.settings_for)
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def settings_for(self, host: str) -> Dict:
+        """Return the effective settings for a host."""
+        settings = dict(config.HTTP_DEFAULT_SETTINGS)
+        settings.update(self.default_settings)
+        settings.update(self.host_settings.get(host, {}))
+        return settings
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the shared session for the host of ``url``, creating it on first use."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session(host)
+                self._sessions[host] = session
+            return session
+
+    def _create_session(self, host: str) -> requests.Session:
+        """Create a session with a connection pool sized for ``host``."""
+        settings = self.settings_for(host)
+        session = requests.Session()
+        session.headers.update(
+            {
+                "User-Agent": config.HTTP_USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings["pool_maxsize"],
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        logger.debug(f"Opened pooled session for {host} (pool size {settings['pool_maxsize']})")
+        return session
+
+    def get(self, url: str, max_timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """GET ``url`` through the pooled session for its host.
+
+        ``max_timeout`` caps the time spent on the whole call, waiting for
+        the scheduler and retries included, e.g. to respect a scraper's
+        remaining deadline: each attempt's timeouts are capped by the time
+        left when it starts. Throttled responses (``config.HTTP_RETRY_STATUSES``)
+        and connection errors are retried up to the host's ``max_retries``,
+        or until no time is left; the last response is returned, or the last
+        error raised, once retries run out.
+        """
+        host = urlsplit(url).netloc.lower()
+        settings = self.settings_for(host)
+        read_timeout = settings["read_timeout"]
+        timeout = kwargs.pop("timeout", None) or (min(settings["connect_timeout"], read_timeout), read_timeout)
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        deadline = None if max_timeout is None else self.scheduler.now() + max_timeout
+
+        attempt = 0
+        while True:
+            response, error = None, None
+            with self.scheduler.slot(host, deadline):
+                attempt_timeout = timeout
+                if deadline is not None:
+                    remaining = deadline - self.scheduler.now()
+                    if remaining <= 0:
+                        raise requests.Timeout(f"Deadline exceeded before requesting {url}")
+                    attempt_timeout = tuple(min(t, remaining) for t in timeout)
+                try:
+                    response = self.session_for(url).get(url, timeout=attempt_timeout, **kwargs)
+                except requests.ConnectionError as e:
+                    error = e
+            if response is not None and response.status_code not in config.HTTP_RETRY_STATUSES:
+                self.scheduler.succeeded(host)
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+            delay = self.scheduler.throttled(host, attempt, retry_after)
+            if (
+                attempt >= settings["max_retries"]
+                or (retry_after or 0) > settings["backoff_max"]
+                or (deadline is not None and self.scheduler.now() + delay >= deadline)
+            ):
+                break
+            reason = f"HTTP {response.status_code}" if response is not None else error
+            logger.info(f"{host} answered {reason}; retrying {url} in {delay:.1f}s")
+            if response is not None:
+                response.close()
+            attempt += 1
+
+        if response is None:
+            raise error
+        return response
+
+    def close(self):
+        """Close every session and its pooled connections."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Return the process-wide session pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SessionPool()
+        return _pool
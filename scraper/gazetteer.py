@@ -0,0 +1,238 @@
+"""Gazetteer mapping towns, neighborhoods, ZIP codes and venues to metro towns.
+
+All place names are compiled into one word-bounded regex at import time, so
+resolving the town for a piece of text is a single pass over the text no
+matter how many places are known.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from scraper.config import BOSTON_METRO_TOWNS
+from scraper.keywords import KeywordMatcher
+
+NEIGHBORHOODS: Dict[str, List[str]] = {
+    "Boston": [
+        "Allston",
+        "Back Bay",
+        "Bay Village",
+        "Beacon Hill",
+        "Brighton",
+        "Charlestown",
+        "Chinatown",
+        "Copley Square",
+        "Dorchester",
+        "East Boston",
+        "Fenway",
+        "Financial District",
+        "Government Center",
+        "Hyde Park",
+        "Jamaica Plain",
+        "Kenmore Square",
+        "Leather District",
+        "Mattapan",
+        "Mission Hill",
+        "North End",
+        "Roslindale",
+        "Roxbury",
+        "Seaport",
+        "South Boston",
+        "South End",
+        "West End",
+        "West Roxbury",
+    ],
+    "Cambridge": [
+        "Cambridgeport",
+        "Central Square",
+        "East Cambridge",
+        "Harvard Square",
+        "Inman Square",
+        "Kendall Square",
+        "Mid-Cambridge",
+        "North Cambridge",
+        "Porter Square",
+    ],
+    "Somerville": [
+        "Assembly Row",
+        "Ball Square",
+        "Davis Square",
+        "East Somerville",
+        "Magoun Square",
+        "Spring Hill",
+        "Teele Square",
+        "Union Square",
+        "West Somerville",
+        "Winter Hill",
+    ],
+    "Newton": [
+        "Auburndale",
+        "Newton Centre",
+        "Newton Center",
+        "Newton Corner",
+        "Newton Highlands",
+        "Newton Lower Falls",
+        "Newton Upper Falls",
+        "Newtonville",
+        "Nonantum",
+        "Oak Hill",
+        "Waban",
+        "West Newton",
+    ],
+    "Waltham": [
+        "Moody St",
+        "Moody Street",
+        "Piety Corner",
+        "Warrendale",
+    ],
+    "Arlington": [
+        "Arlington Center",
+        "Arlington Heights",
+        "East Arlington",
+    ],
+    "Lexington": [
+        "Battle Green",
+        "East Lexington",
+        "Lexington Center",
+    ],
+}
+
+ZIP_CODES: Dict[str, List[str]] = {
+    "Boston": [
+        "02108", "02109", "02110", "02111", "02113", "02114", "02115", "02116",
+        "02118", "02119", "02120", "02121", "02122", "02124", "02125", "02126",
+        "02127", "02128", "02129", "02130", "02131", "02132", "02134", "02135",
+        "02136", "02163", "02199", "02203", "02210", "02215",
+    ],
+    "Cambridge": ["02138", "02139", "02140", "02141", "02142"],
+    "Somerville": ["02143", "02144", "02145"],
+    "Newton": ["02458", "02459", "02460", "02461", "02462", "02464", "02465", "02466", "02468"],
+    "Waltham": ["02451", "02452", "02453", "02454"],
+    "Arlington": ["02474", "02476"],
+    "Lexington": ["02420", "02421"],
+}
+
+VENUES: Dict[str, List[str]] = {
+    "Boston": [
+        "Agganis Arena",
+        "Berklee Performance Center",
+        "Boston Children's Museum",
+        "Boston Convention Center",
+        "Boston Public Library - Central",
+        "Boston Symphony Hall",
+        "Central Library in Copley Square",
+        "Hatch Shell",
+        "House of Blues Boston",
+        "Jordan Hall",
+        "Paradise Rock Club",
+        "Symphony Hall",
+        "TD Garden",
+    ],
+    "Cambridge": [
+        "Cambridge Public Library",
+        "Club Passim",
+        "First Church Cambridge",
+        "Kresge Auditorium",
+        "MIT Kresge Auditorium",
+        "Sanders Theatre",
+        "The Sinclair",
+    ],
+    "Somerville": [
+        "Arts at the Armory",
+        "ONCE Ballroom",
+        "Somerville Arts Center",
+        "Somerville Theatre",
+    ],
+    "Newton": [
+        "Burr Performing Arts Center",
+        "Newton Community Music School",
+        "Newton Free Library",
+    ],
+    "Waltham": [
+        "Charles River Museum",
+        "Waltham High School Auditorium",
+        "Waltham Public Library",
+    ],
+    "Arlington": [
+        "Arlington Town Hall",
+        "Regent Theatre",
+        "Robbins Library",
+    ],
+    "Lexington": [
+        "Cary Memorial Hall",
+        "Lexington High School",
+        "Lexington Public Library",
+    ],
+}
+
+# Kinds of place, most specific first; a more specific match wins within a text
+PLACE_KINDS = ["venue", "zip", "neighborhood", "town"]
+
+# A town name followed by one of these is a street ("617 Lexington St, Waltham")
+_STREET_SUFFIX = re.compile(r"\s+(?:st|street|ave|avenue|rd|road|blvd|pl|place|way|dr|drive|ln|lane|pkwy|parkway)\b")
+
+
+class Place:
+    """A gazetteer entry matched in text."""
+
+    def __init__(self, name: str, kind: str, town: str):
+        self.name = name
+        self.kind = kind
+        self.town = town
+
+    def __repr__(self) -> str:
+        return f"Place({self.name!r}, {self.kind!r}, {self.town!r})"
+
+
+class Gazetteer:
+    """Resolves free text to a canonical metro town in one regex pass."""
+
+    def __init__(
+        self,
+        towns: Iterable[str],
+        neighborhoods: Dict[str, List[str]] = None,
+        zip_codes: Dict[str, List[str]] = None,
+        venues: Dict[str, List[str]] = None,
+    ):
+        self._places: Dict[str, Place] = {}
+        self._rank = {kind: rank for rank, kind in enumerate(PLACE_KINDS)}
+        # Register least specific first so a more specific entry wins a name clash
+        for town in towns:
+            self._add(town, "town", town)
+        for kind, table in [("neighborhood", neighborhoods), ("zip", zip_codes), ("venue", venues)]:
+            for town, names in (table or {}).items():
+                for name in names:
+                    self._add(name, kind, town)
+        self._matcher = KeywordMatcher([p.name for p in self._places.values()], whole_words=True)
+
+    def _add(self, name: str, kind: str, town: str):
+        self._places[name.lower()] = Place(name, kind, town)
+
+    def locate(self, *texts: Optional[str]) -> Optional[Place]:
+        """Return the most specific place in the first text that mentions one."""
+        for text in texts:
+            if not text:
+                continue
+            lowered = text.lower()
+            best = None
+            for m in self._matcher.pattern.finditer(lowered):
+                place = self._places[m.group(0)]
+                if place.kind == "town" and _STREET_SUFFIX.match(lowered, m.end()):
+                    continue
+                if best is None or self._rank[place.kind] < self._rank[best.kind]:
+                    best = place
+            if best is not None:
+                return best
+        return None
+
+    def resolve(self, *texts: Optional[str], default: Optional[str] = None) -> Optional[str]:
+        """Return the canonical town for the first text that mentions a known place."""
+        place = self.locate(*texts)
+        return place.town if place else default
+
+
+GAZETTEER = Gazetteer(BOSTON_METRO_TOWNS, NEIGHBORHOODS, ZIP_CODES, VENUES)
+
+
+def resolve_town(*texts: Optional[str], default: Optional[str] = "Boston") -> Optional[str]:
+    """Resolve texts to a metro town with the shared gazetteer."""
+    return GAZETTEER.resolve(*texts, default=default)
@@ -0,0 +1,386 @@
+"""Offline geocoding of concert venues and addresses.
+
+Coordinates come from a bundled table covering every place the gazetteer
+knows: venues, neighborhoods, ZIP code centroids and metro towns. A concert
+is placed at the most specific place mentioned in its venue, address or
+town, and the result records that precision.
+
+Most events repeat a small set of venues, so each address is resolved once.
+Venue, address and town are normalized into a key (case, punctuation,
+``Street``/``St`` and the like), and resolved keys are kept in a JSON cache
+on disk, least recently used first. Within a run, a raw (venue, address,
+town) triple seen before costs one dictionary lookup. The cache is
+discarded when the coordinate table changes.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scraper import config
+from scraper.gazetteer import GAZETTEER, PLACE_KINDS, Gazetteer
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+# (latitude, longitude, precision), where precision is the kind of place matched
+Location = Tuple[float, float, str]
+
+TOWN_COORDINATES: Dict[str, Tuple[float, float]] = {
+    "Arlington": (42.4154, -71.1565),
+    "Boston": (42.3601, -71.0589),
+    "Cambridge": (42.3736, -71.1097),
+    "Lexington": (42.4473, -71.2245),
+    "Newton": (42.3370, -71.2092),
+    "Somerville": (42.3876, -71.0995),
+    "Waltham": (42.3765, -71.2356),
+}
+
+NEIGHBORHOOD_COORDINATES: Dict[str, Tuple[float, float]] = {
+    # Boston
+    "Allston": (42.3539, -71.1337),
+    "Back Bay": (42.3503, -71.0810),
+    "Bay Village": (42.3485, -71.0687),
+    "Beacon Hill": (42.3588, -71.0707),
+    "Brighton": (42.3464, -71.1627),
+    "Charlestown": (42.3782, -71.0602),
+    "Chinatown": (42.3501, -71.0624),
+    "Copley Square": (42.3500, -71.0770),
+    "Dorchester": (42.3016, -71.0676),
+    "East Boston": (42.3702, -71.0389),
+    "Fenway": (42.3429, -71.1003),
+    "Financial District": (42.3559, -71.0550),
+    "Government Center": (42.3597, -71.0593),
+    "Hyde Park": (42.2565, -71.1241),
+    "Jamaica Plain": (42.3097, -71.1151),
+    "Kenmore Square": (42.3489, -71.0954),
+    "Leather District": (42.3509, -71.0576),
+    "Mattapan": (42.2771, -71.0914),
+    "Mission Hill": (42.3326, -71.1034),
+    "North End": (42.3647, -71.0542),
+    "Roslindale": (42.2832, -71.1270),
+    "Roxbury": (42.3152, -71.0914),
+    "Seaport": (42.3488, -71.0420),
+    "South Boston": (42.3381, -71.0476),
+    "South End": (42.3388, -71.0765),
+    "West End": (42.3644, -71.0661),
+    "West Roxbury": (42.2798, -71.1627),
+    # Cambridge
+    "Cambridgeport": (42.3600, -71.1080),
+    "Central Square": (42.3654, -71.1037),
+    "East Cambridge": (42.3691, -71.0797),
+    "Harvard Square": (42.3732, -71.1189),
+    "Inman Square": (42.3741, -71.1009),
+    "Kendall Square": (42.3629, -71.0862),
+    "Mid-Cambridge": (42.3720, -71.1080),
+    "North Cambridge": (42.3953, -71.1340),
+    "Porter Square": (42.3884, -71.1191),
+    # Somerville
+    "Assembly Row": (42.3925, -71.0776),
+    "Ball Square": (42.3994, -71.1112),
+    "Davis Square": (42.3967, -71.1223),
+    "East Somerville": (42.3874, -71.0822),
+    "Magoun Square": (42.4006, -71.1042),
+    "Spring Hill": (42.3858, -71.1108),
+    "Teele Square": (42.4023, -71.1273),
+    "Union Square": (42.3794, -71.0937),
+    "West Somerville": (42.4000, -71.1250),
+    "Winter Hill": (42.3918, -71.0966),
+    # Newton
+    "Auburndale": (42.3453, -71.2490),
+    "Newton Centre": (42.3294, -71.1926),
+    "Newton Center": (42.3294, -71.1926),
+    "Newton Corner": (42.3540, -71.1840),
+    "Newton Highlands": (42.3216, -71.2060),
+    "Newton Lower Falls": (42.3316, -71.2558),
+    "Newton Upper Falls": (42.3127, -71.2208),
+    "Newtonville": (42.3513, -71.2065),
+    "Nonantum": (42.3587, -71.2011),
+    "Oak Hill": (42.3070, -71.1830),
+    "Waban": (42.3261, -71.2298),
+    "West Newton": (42.3487, -71.2268),
+    # Waltham
+    "Moody St": (42.3716, -71.2367),
+    "Moody Street": (42.3716, -71.2367),
+    "Piety Corner": (42.3980, -71.2500),
+    "Warrendale": (42.3830, -71.2200),
+    # Arlington
+    "Arlington Center": (42.4154, -71.1565),
+    "Arlington Heights": (42.4236, -71.1823),
+    "East Arlington": (42.4080, -71.1420),
+    # Lexington
+    "Battle Green": (42.4494, -71.2305),
+    "East Lexington": (42.4335, -71.2010),
+    "Lexington Center": (42.4473, -71.2290),
+}
+
+ZIP_CENTROIDS: Dict[str, Tuple[float, float]] = {
+    # Boston
+    "02108": (42.3576, -71.0646),
+    "02109": (42.3601, -71.0540),
+    "02110": (42.3573, -71.0516),
+    "02111": (42.3505, -71.0604),
+    "02113": (42.3651, -71.0552),
+    "02114": (42.3613, -71.0684),
+    "02115": (42.3429, -71.0925),
+    "02116": (42.3495, -71.0766),
+    "02118": (42.3385, -71.0729),
+    "02119": (42.3243, -71.0847),
+    "02120": (42.3322, -71.0970),
+    "02121": (42.3071, -71.0821),
+    "02122": (42.2914, -71.0469),
+    "02124": (42.2864, -71.0712),
+    "02125": (42.3158, -71.0573),
+    "02126": (42.2738, -71.0937),
+    "02127": (42.3341, -71.0397),
+    "02128": (42.3730, -71.0266),
+    "02129": (42.3798, -71.0621),
+    "02130": (42.3097, -71.1143),
+    "02131": (42.2840, -71.1288),
+    "02132": (42.2809, -71.1618),
+    "02134": (42.3570, -71.1298),
+    "02135": (42.3480, -71.1564),
+    "02136": (42.2548, -71.1263),
+    "02163": (42.3658, -71.1237),
+    "02199": (42.3472, -71.0821),
+    "02203": (42.3611, -71.0592),
+    "02210": (42.3483, -71.0426),
+    "02215": (42.3477, -71.1028),
+    # Cambridge
+    "02138": (42.3792, -71.1266),
+    "02139": (42.3641, -71.1029),
+    "02140": (42.3918, -71.1290),
+    "02141": (42.3695, -71.0828),
+    "02142": (42.3622, -71.0838),
+    # Somerville
+    "02143": (42.3812, -71.1012),
+    "02144": (42.3996, -71.1224),
+    "02145": (42.3919, -71.0906),
+    # Newton
+    "02458": (42.3537, -71.1889),
+    "02459": (42.3286, -71.1927),
+    "02460": (42.3522, -71.2087),
+    "02461": (42.3168, -71.2073),
+    "02462": (42.3295, -71.2553),
+    "02464": (42.3133, -71.2198),
+    "02465": (42.3491, -71.2268),
+    "02466": (42.3453, -71.2490),
+    "02468": (42.3266, -71.2310),
+    # Waltham
+    "02451": (42.3982, -71.2572),
+    "02452": (42.3945, -71.2187),
+    "02453": (42.3653, -71.2316),
+    "02454": (42.3765, -71.2356),
+    # Arlington
+    "02474": (42.4154, -71.1507),
+    "02476": (42.4165, -71.1741),
+    # Lexington
+    "02420": (42.4565, -71.2169),
+    "02421": (42.4406, -71.2390),
+}
+
+VENUE_COORDINATES: Dict[str, Tuple[float, float]] = {
+    # Boston
+    "Agganis Arena": (42.3517, -71.1161),
+    "Berklee Performance Center": (42.3478, -71.0868),
+    "Boston Children's Museum": (42.3519, -71.0498),
+    "Boston Convention Center": (42.3455, -71.0441),
+    "Boston Public Library - Central": (42.3493, -71.0782),
+    "Boston Symphony Hall": (42.3428, -71.0857),
+    "Central Library in Copley Square": (42.3493, -71.0782),
+    "Hatch Shell": (42.3576, -71.0739),
+    "House of Blues Boston": (42.3472, -71.0955),
+    "Jordan Hall": (42.3404, -71.0868),
+    "Paradise Rock Club": (42.3516, -71.1186),
+    "Symphony Hall": (42.3428, -71.0857),
+    "TD Garden": (42.3662, -71.0621),
+    # Cambridge
+    "Cambridge Public Library": (42.3734, -71.1113),
+    "Club Passim": (42.3732, -71.1198),
+    "First Church Cambridge": (42.3760, -71.1201),
+    "Kresge Auditorium": (42.3581, -71.0948),
+    "MIT Kresge Auditorium": (42.3581, -71.0948),
+    "Sanders Theatre": (42.3763, -71.1148),
+    "The Sinclair": (42.3739, -71.1204),
+    # Somerville
+    "Arts at the Armory": (42.3833, -71.1030),
+    "ONCE Ballroom": (42.3838, -71.1009),
+    "Somerville Arts Center": (42.3855, -71.1000),
+    "Somerville Theatre": (42.3967, -71.1224),
+    # Newton
+    "Burr Performing Arts Center": (42.3495, -71.2140),
+    "Newton Community Music School": (42.3467, -71.2351),
+    "Newton Free Library": (42.3363, -71.2099),
+    # Waltham
+    "Charles River Museum": (42.3716, -71.2361),
+    "Waltham High School Auditorium": (42.3937, -71.2407),
+    "Waltham Public Library": (42.3767, -71.2393),
+    # Arlington
+    "Arlington Town Hall": (42.4150, -71.1541),
+    "Regent Theatre": (42.4154, -71.1566),
+    "Robbins Library": (42.4158, -71.1543),
+    # Lexington
+    "Cary Memorial Hall": (42.4475, -71.2290),
+    "Lexington High School": (42.4436, -71.2302),
+    "Lexington Public Library": (42.4493, -71.2311),
+}
+
+COORDINATES: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "venue": VENUE_COORDINATES,
+    "zip": ZIP_CENTROIDS,
+    "neighborhood": NEIGHBORHOOD_COORDINATES,
+    "town": TOWN_COORDINATES,
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_ABBREVIATIONS = {
+    "avenue": "ave",
+    "boulevard": "blvd",
+    "center": "ctr",
+    "centre": "ctr",
+    "drive": "dr",
+    "lane": "ln",
+    "massachusetts": "mass",
+    "parkway": "pkwy",
+    "place": "pl",
+    "road": "rd",
+    "square": "sq",
+    "street": "st",
+}
+_DROPPED = {"the", "ma", "usa"}
+
+
+def _normalize(text: Optional[str]) -> str:
+    if not isinstance(text, str):
+        return ""
+    words = _WORD.findall(text.lower().replace("'", ""))
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in words if word not in _DROPPED)
+
+
+def address_key(venue: Optional[str], address: Optional[str], town: Optional[str]) -> str:
+    """Return the cache key of a venue, address and town.
+
+    Spellings of one place that differ only in case, punctuation, a leading
+    "The", the state or common abbreviations share a key.
+    """
+    return "|".join(_normalize(part) for part in (venue, address, town))
+
+
+def _fingerprint() -> str:
+    """Digest of the coordinate table, stored with the cache to detect stale entries."""
+    data = json.dumps(COORDINATES, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+class Geocoder:
+    """Resolves venues and addresses to coordinates, with an LRU cache on disk.
+
+    ``stats`` counts geocoded rows by precision (``venue``, ``zip``,
+    ``neighborhood`` or ``town``) and ``unresolved``; ``resolved`` counts
+    addresses looked up in the gazetteer because no cache had them.
+    """
+
+    def __init__(
+        self,
+        cache_path: str = None,
+        max_entries: int = None,
+        gazetteer: Gazetteer = None,
+        coordinates: Dict[str, Dict[str, Tuple[float, float]]] = None,
+    ):
+        self.cache_path = Path(cache_path or config.GEOCODE_CACHE_PATH)
+        self.max_entries = max_entries or config.GEOCODE_CACHE_MAX_ENTRIES
+        self.gazetteer = gazetteer or GAZETTEER
+        self.coordinates = coordinates or COORDINATES
+        self._entries: Optional[OrderedDict] = None
+        # Raw (venue, address, town) triples already geocoded in this run
+        self._seen: Dict[Tuple, Optional[Location]] = {}
+        self._dirty = False
+        self.stats: Counter = Counter()
+        self.resolved = 0
+
+    @property
+    def entries(self) -> OrderedDict:
+        """Cached locations (or None if unresolvable) by address key, least recently used first."""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.cache_path.exists():
+                try:
+                    with open(self.cache_path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("fingerprint") == _fingerprint():
+                        self._entries.update(
+                            (key, tuple(value) if value else None) for key, value in data["entries"].items()
+                        )
+                    else:
+                        logger.info(f"Coordinate table changed; discarding geocode cache {self.cache_path}")
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    logger.warning(f"Ignoring unreadable geocode cache {self.cache_path}")
+        return self._entries
+
+    def geocode(self, venue: Optional[str], address: Optional[str], town: Optional[str]) -> Optional[Location]:
+        """Return (latitude, longitude, precision) for a concert's venue, address and town."""
+        raw = (venue, address, town)
+        try:
+            location = self._seen[raw]
+        except KeyError:
+            location = self._seen[raw] = self._lookup(address_key(venue, address, town), raw)
+        self.stats[location[2] if location else "unresolved"] += 1
+        return location
+
+    def _lookup(self, key: str, texts: Tuple) -> Optional[Location]:
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+
+        location = self.locate(*texts)
+        self.resolved += 1
+        entries[key] = location
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._dirty = True
+        return location
+
+    def locate(self, *texts: Optional[str]) -> Optional[Location]:
+        """Return the location of the most specific known place in any of the texts.
+
+        Earlier texts win ties, so a venue name outranks a town in the address.
+        """
+        best = None
+        for text in texts:
+            place = self.gazetteer.locate(text if isinstance(text, str) else None)
+            if place is None or place.name not in self.coordinates.get(place.kind, {}):
+                continue
+            if best is None or PLACE_KINDS.index(place.kind) < PLACE_KINDS.index(best.kind):
+                best = place
+        if best is None:
+            return None
+        latitude, longitude = self.coordinates[best.kind][best.name]
+        return latitude, longitude, best.kind
+
+    def geocode_values(
+        self, venues: Iterable, addresses: Iterable, towns: Iterable
+    ) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+        """Return latitude and longitude lists for parallel venue, address and town columns."""
+        latitudes, longitudes = [], []
+        for venue, address, town in zip(venues, addresses, towns):
+            location = self.geocode(venue, address, town)
+            latitudes.append(location[0] if location else None)
+            longitudes.append(location[1] if location else None)
+        return latitudes, longitudes
+
+    def save(self):
+        """Write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+        data = {
+            "fingerprint": _fingerprint(),
+            "entries": {key: list(value) if value else None for key, value in self.entries.items()},
+        }
+        with atomic_open(self.cache_path, encoding="utf-8") as f:
+            json.dump(data, f)
+        self._dirty = False
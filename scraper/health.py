@@ -0,0 +1,160 @@
+"""Per-source health history and circuit breaker.
+
+Every run records, per source, whether it succeeded, how long it took and
+how many events it yielded. A run that fails, times out or yields nothing
+counts as a failure, except that an incremental source finding nothing new
+is normal. After ``HEALTH_FAILURE_THRESHOLD`` failures in a row the
+source's breaker opens and the source is skipped until its cooldown ends.
+It then runs once as a probe: success closes the breaker, failure reopens it
+with twice the cooldown (up to ``HEALTH_MAX_COOLDOWN``). So a source that has
+been broken for days costs one probe now and then instead of a timeout
+every run.
+"""
+
+import json
+import logging
+import statistics
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from scraper import config
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"  # Runs every time
+OPEN = "open"  # Skipped until the cooldown ends
+HALF_OPEN = "half-open"  # Cooldown over; the next run is a probe
+
+
+class HealthStore:
+    """Health history and breaker state per source, kept in a JSON file."""
+
+    def __init__(
+        self,
+        path: str = None,
+        failure_threshold: int = None,
+        cooldown: float = None,
+        max_cooldown: float = None,
+        history: int = None,
+    ):
+        self.path = Path(path or config.HEALTH_PATH)
+        self.failure_threshold = failure_threshold or config.HEALTH_FAILURE_THRESHOLD
+        self.cooldown = cooldown or config.HEALTH_COOLDOWN
+        self.max_cooldown = max_cooldown or config.HEALTH_MAX_COOLDOWN
+        self.history = history or config.HEALTH_HISTORY
+        self._sources: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def sources(self) -> Dict[str, Dict]:
+        """Run history and breaker fields per source name."""
+        if self._sources is None:
+            self._sources = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._sources = json.load(f)
+                except ValueError:
+                    logger.warning(f"Ignoring unreadable health file {self.path}")
+        return self._sources
+
+    def _source(self, name: str) -> Dict:
+        return self.sources.setdefault(
+            name, {"runs": [], "failures": 0, "cooldown": None, "retry_at": None}
+        )
+
+    def state(self, name: str, now: datetime = None) -> str:
+        """Return the breaker state of a source."""
+        with self._lock:
+            source = self.sources.get(name)
+            if source is None or source["retry_at"] is None:
+                return CLOSED
+            return HALF_OPEN if (now or datetime.now()).isoformat() >= source["retry_at"] else OPEN
+
+    def should_run(self, name: str, now: datetime = None) -> bool:
+        """Whether a source should run now: its breaker is closed, or its cooldown is over."""
+        return self.state(name, now) != OPEN
+
+    def record(
+        self,
+        name: str,
+        ok: bool,
+        elapsed: float,
+        events: int,
+        error: str = None,
+        now: datetime = None,
+        incremental: bool = False,
+    ):
+        """Record one run of a source and update its breaker.
+
+        A run that is ``ok`` but yields no events counts as a failure, unless
+        the source is ``incremental`` and only scrapes events changed since
+        its last run.
+        """
+        now = now or datetime.now()
+        success = ok and (events > 0 or incremental)
+        with self._lock:
+            source = self._source(name)
+            source["runs"].append(
+                {
+                    "at": now.isoformat(),
+                    "ok": ok,
+                    "elapsed": round(elapsed, 3),
+                    "events": events,
+                    "error": error,
+                }
+            )
+            del source["runs"][: -self.history]
+
+            if success:
+                if source["retry_at"] is not None:
+                    logger.info(f"Circuit for {name} closed: probe succeeded")
+                source.update(failures=0, cooldown=None, retry_at=None)
+                return
+
+            source["failures"] += 1
+            probe = source["retry_at"] is not None
+            if probe or source["failures"] >= self.failure_threshold:
+                # A failed probe doubles the cooldown
+                cooldown = min(source["cooldown"] * 2, self.max_cooldown) if probe else self.cooldown
+                source["cooldown"] = cooldown
+                source["retry_at"] = (now + timedelta(seconds=cooldown)).isoformat()
+                logger.warning(
+                    f"Circuit for {name} open after {source['failures']} failed runs; "
+                    f"next probe after {source['retry_at']}"
+                )
+
+    def reset(self, name: str = None):
+        """Close the breaker of one source, or of every source."""
+        with self._lock:
+            for source_name, source in self.sources.items():
+                if name is None or source_name == name:
+                    source.update(failures=0, cooldown=None, retry_at=None)
+
+    def summary(self, now: datetime = None) -> List[Dict]:
+        """Return one row per source: breaker state, success rate, median latency and mean yield."""
+        rows = []
+        for name in sorted(self.sources):
+            source = self.sources[name]
+            runs = source["runs"]
+            rows.append(
+                {
+                    "source": name,
+                    "state": self.state(name, now),
+                    "failures": source["failures"],
+                    "success_rate": sum(r["ok"] for r in runs) / len(runs) if runs else None,
+                    "median_elapsed": statistics.median(r["elapsed"] for r in runs) if runs else None,
+                    "mean_events": statistics.fmean(r["events"] for r in runs) if runs else None,
+                    "retry_at": source["retry_at"],
+                }
+            )
+        return rows
+
+    def save(self):
+        """Write the health history to disk."""
+        with self._lock:
+            with atomic_open(self.path, encoding="utf-8") as f:
+                json.dump(self.sources, f, indent=2)
@@ -0,0 +1,205 @@
+"""Precomputed heat-map grids of where concerts happen.
+
+Geocoded concerts are binned into square density grids over
+``config.HEATMAP_BOUNDS`` at several zoom levels (cells per side, each
+level twice the one before) and several time windows: all concerts, each
+year and each month. Events are binned once, at the finest level, with a
+single ``bincount`` over (window, cell); coarser levels sum 2x2 blocks of
+the finer one, and year windows sum their months. Grids can then be blurred
+with a Gaussian, and are saved together in one ``.npz`` file, so the
+visualization serves slices of precomputed grids instead of rebinning raw
+events per request.
+
+Row 0 of a grid is its northern edge and column 0 its western edge.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from scraper import config
+from scraper.table import ConcertTable
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+# (south, west, north, east)
+Bounds = Tuple[float, float, float, float]
+
+ALL = "all"
+
+
+def cell_index(latitudes: np.ndarray, longitudes: np.ndarray, bounds: Bounds, cells: int) -> np.ndarray:
+    """Return each point's flat cell index in a ``cells`` x ``cells`` grid, or -1 outside ``bounds``."""
+    south, west, north, east = bounds
+    with np.errstate(invalid="ignore"):
+        inside = (latitudes > south) & (latitudes <= north) & (longitudes >= west) & (longitudes < east)
+    rows = np.clip(((north - latitudes[inside]) / (north - south) * cells).astype(np.int64), 0, cells - 1)
+    cols = np.clip(((longitudes[inside] - west) / (east - west) * cells).astype(np.int64), 0, cells - 1)
+    index = np.full(len(latitudes), -1, dtype=np.int64)
+    index[inside] = rows * cells + cols
+    return index
+
+
+def downsample(grids: np.ndarray) -> np.ndarray:
+    """Halve the resolution of a stack of grids by summing 2x2 blocks."""
+    windows, cells, _ = grids.shape
+    half = cells // 2
+    return grids.reshape(windows, half, 2, half, 2).sum(axis=(2, 4))
+
+
+def gaussian_smooth(grids: np.ndarray, sigma: float) -> np.ndarray:
+    """Blur the last two axes of ``grids`` with a Gaussian of ``sigma`` cells.
+
+    The kernel is separable, so each axis is blurred in turn as a weighted
+    sum of shifted copies. Mass blurred past the edge of the grid is lost.
+    """
+    if sigma <= 0:
+        return grids.astype(np.float32)
+    radius = max(1, int(round(3 * sigma)))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+
+    result = grids.astype(np.float32)
+    for axis in (-2, -1):
+        size = result.shape[axis]
+        pad = [(0, 0)] * result.ndim
+        pad[axis] = (radius, radius)
+        padded = np.pad(result, pad)
+        blurred = np.zeros_like(result)
+        for offset, weight in enumerate(kernel):
+            blurred += weight * np.take(padded, np.arange(offset, offset + size), axis=axis)
+        result = blurred
+    return result
+
+
+def _month_label(month: int) -> str:
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class HeatmapGrids:
+    """Density grids per zoom level and time window.
+
+    ``grids`` maps cells per side to a float32 array of shape
+    (windows, cells, cells); ``totals`` counts the concerts binned into each
+    window.
+    """
+
+    def __init__(
+        self,
+        grids: Dict[int, np.ndarray],
+        windows: Sequence[str],
+        totals: Sequence[int],
+        bounds: Bounds,
+        smoothing: float = 0.0,
+    ):
+        self.grids = grids
+        self.windows = list(windows)
+        self.totals = dict(zip(self.windows, (int(t) for t in totals)))
+        self.bounds = tuple(float(b) for b in bounds)
+        self.smoothing = float(smoothing)
+        self._window_index = {window: i for i, window in enumerate(self.windows)}
+
+    @property
+    def levels(self) -> List[int]:
+        """Cells per side of each zoom level, coarsest first."""
+        return sorted(self.grids)
+
+    @classmethod
+    def build(
+        cls,
+        concerts: Union[ConcertTable, Iterable],
+        bounds: Bounds = None,
+        levels: Sequence[int] = None,
+        smoothing: float = None,
+    ) -> "HeatmapGrids":
+        """Bin geocoded concerts into grids at every level and window.
+
+        Concerts without coordinates, or outside ``bounds``, are left out.
+        Undated concerts only count towards the ``all`` window.
+        """
+        table = ConcertTable.from_concerts(concerts)
+        bounds = tuple(bounds or config.HEATMAP_BOUNDS)
+        levels = sorted(levels or config.HEATMAP_LEVELS)
+        smoothing = config.HEATMAP_SMOOTHING if smoothing is None else smoothing
+        finest = levels[-1]
+        if any(finest % level or (finest // level) & (finest // level - 1) for level in levels):
+            raise ValueError(f"Heat-map levels must be the finest level {finest} divided by powers of two: {levels}")
+
+        frame = table.frame
+        latitudes = pd.to_numeric(frame["latitude"], errors="coerce").to_numpy(dtype=np.float64)
+        longitudes = pd.to_numeric(frame["longitude"], errors="coerce").to_numpy(dtype=np.float64)
+        dates = table.dates()
+        months = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=np.float64)
+
+        cells = cell_index(latitudes, longitudes, bounds, finest)
+        inside = cells >= 0
+        area = finest * finest
+        dated = inside & ~np.isnan(months)
+        month_values, month_windows = np.unique(months[dated].astype(np.int64), return_inverse=True)
+        years = np.unique(month_values // 12)
+
+        counts = np.empty((1 + len(years) + len(month_values), finest, finest), dtype=np.int64)
+        counts[0] = np.bincount(cells[inside], minlength=area).reshape(finest, finest)
+        by_month = np.bincount(month_windows * area + cells[dated], minlength=len(month_values) * area)
+        counts[1 + len(years) :] = by_month.reshape(len(month_values), finest, finest)
+        for i, year in enumerate(years):
+            counts[1 + i] = counts[1 + len(years) :][month_values // 12 == year].sum(axis=0)
+
+        windows = [ALL] + [f"{year:04d}" for year in years] + [_month_label(m) for m in month_values]
+        totals = counts.sum(axis=(1, 2))
+
+        grids = {}
+        level_counts = counts
+        for level in reversed(levels):
+            while level_counts.shape[1] > level:
+                level_counts = downsample(level_counts)
+            grids[level] = gaussian_smooth(level_counts, smoothing)
+
+        logger.info(
+            f"Binned {int(inside.sum())} of {len(table)} concerts into {len(windows)} windows "
+            f"at {', '.join(str(level) for level in levels)} cells per side"
+        )
+        return cls(grids, windows, totals, bounds, smoothing)
+
+    def grid(self, cells: int, window: str = ALL) -> np.ndarray:
+        """Return the grid of one level and window."""
+        if cells not in self.grids:
+            raise KeyError(f"No heat-map level with {cells} cells per side; levels are {self.levels}")
+        if window not in self._window_index:
+            raise KeyError(f"No heat-map window {window!r}")
+        return self.grids[cells][self._window_index[window]]
+
+    def tile(self, cells: int, window: str, row: int, col: int, size: int = None) -> np.ndarray:
+        """Return one ``size`` x ``size`` tile of a grid; tiles are numbered from the north-west corner."""
+        grid = self.grid(cells, window)
+        size = min(size or config.HEATMAP_TILE_SIZE, cells)
+        per_side = cells // size
+        if not (0 <= row < per_side and 0 <= col < per_side):
+            raise IndexError(f"Tile ({row}, {col}) outside the {per_side}x{per_side} tiles of level {cells}")
+        return grid[row * size : (row + 1) * size, col * size : (col + 1) * size]
+
+    def save(self, path: str = None) -> Path:
+        """Write every grid to one compressed ``.npz`` file, replacing it atomically."""
+        path = Path(path or config.HEATMAP_PATH)
+        with atomic_open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                windows=np.array(self.windows),
+                totals=np.array([self.totals[window] for window in self.windows], dtype=np.int64),
+                bounds=np.array(self.bounds),
+                smoothing=np.array(self.smoothing),
+                **{f"level_{cells}": grids for cells, grids in self.grids.items()},
+            )
+        logger.info(f"Saved heat map of {self.totals.get(ALL, 0)} concerts to {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str = None) -> "HeatmapGrids":
+        """Read grids written by ``save``."""
+        with np.load(path or config.HEATMAP_PATH, allow_pickle=False) as data:
+            grids = {int(name[len("level_") :]): data[name] for name in data.files if name.startswith("level_")}
+            return cls(grids, data["windows"].tolist(), data["totals"], data["bounds"], data["smoothing"])
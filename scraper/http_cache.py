@@ -0,0 +1,174 @@
+"""Persistent conditional-GET cache for listing pages.
+
+Each cached URL keeps its ETag/Last-Modified validators, the response body,
+a SHA-256 of the body and the event records extracted from it. Scrapers
+send the validators on the next request; when the server answers 304, or
+returns a body identical to last time, the stored records are reused and the
+page is not parsed again.
+
+Records are stored with the key of the extractor settings that produced
+them (``scraper.parsers.extractor_key``). Asking with a different key is a
+miss, so records from an older extractor, gazetteer or parser option are
+never reused.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from scraper import config
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """On-disk HTTP cache with a total size cap and LRU eviction."""
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = Path(directory or config.HTTP_CACHE_DIR)
+        self.max_bytes = config.HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.index_path = self.directory / "index.json"
+        self._entries: Optional[OrderedDict] = None
+        self._lock = threading.RLock()
+
+    @property
+    def entries(self) -> OrderedDict:
+        """Cache entries keyed by URL, least recently used first."""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path) as f:
+                        self._entries.update(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable HTTP cache index {self.index_path}: {e}")
+        return self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes used by cached bodies and records."""
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def _has_records(self, entry: Optional[Dict], key: Optional[str]) -> bool:
+        return bool(entry) and entry.get("record_count") is not None and entry.get("records_key") == key
+
+    def conditional_headers(self, url: str, key: str = None) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for a URL with records cached under ``key``."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not self._has_records(entry, key):
+                return {}
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def get_records(self, url: str, key: str = None) -> Optional[List[Dict]]:
+        """Return the records extracted from a URL's cached body under ``key``, and mark it recently used.
+
+        The new recency is saved with the next change to the index rather
+        than on every hit.
+        """
+        with self._lock:
+            entry = self.entries.get(url)
+            if not self._has_records(entry, key):
+                return None
+            self.entries.move_to_end(url)
+            return self._read_records(url)
+
+    def store(self, url: str, response: requests.Response, key: str = None) -> bool:
+        """Cache a 200 response and return True if its body is unchanged and has records under ``key``."""
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            previous = self.entries.get(url)
+            if previous and previous["sha256"] == digest and self._has_records(previous, key):
+                previous["etag"] = response.headers.get("ETag")
+                previous["last_modified"] = response.headers.get("Last-Modified")
+                self.entries.move_to_end(url)
+                self._save_index()
+                return True
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with atomic_open(self._body_path(url), "wb") as f:
+                f.write(content)
+            self.entries[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": digest,
+                "body_size": len(content),
+                "size": len(content),
+                "record_count": None,
+                "records_key": None,
+            }
+            self.entries.move_to_end(url)
+            self._evict()
+            self._save_index()
+            return False
+
+    def store_records(self, url: str, records: List[Dict], key: str = None):
+        """Store the records extracted from a URL's cached body with the extractor settings ``key``."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            data = json.dumps(records).encode()
+            with atomic_open(self._records_path(url), "wb") as f:
+                f.write(data)
+            entry["record_count"] = len(records)
+            entry["records_key"] = key
+            entry["size"] = entry["body_size"] + len(data)
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self.entries and self.total_bytes > self.max_bytes:
+            url, _ = self.entries.popitem(last=False)
+            for path in (self._body_path(url), self._records_path(url)):
+                path.unlink(missing_ok=True)
+            logger.debug(f"Evicted {url} from HTTP cache")
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _body_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.body"
+
+    def _records_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.records.json"
+
+    def _read_records(self, url: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._records_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with atomic_open(self.index_path, encoding="utf-8") as f:
+            json.dump(self.entries, f)
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide HTTP cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
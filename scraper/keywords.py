@@ -0,0 +1,83 @@
+"""Compiled keyword matching for child-friendly and music filters."""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Set
+
+from scraper import config
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation factored by common prefixes.
+
+    "young" and "youth" become ``you(?:ng|th)``, so the regex engine tests
+    each shared prefix once instead of once per keyword. Where one keyword
+    is a prefix of another, the longer one is preferred.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{group})?" if "" in node else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Matches a keyword set against text with one precompiled regex.
+
+    Matching is case-insensitive: the text is lowercased once and scanned
+    with a prefix-factored alternation of the lowercased keywords. By
+    default a keyword matches anywhere in the text, like ``keyword in
+    text.lower()``; with ``whole_words=True`` it must start and end on a
+    word boundary, so "sing" no longer matches "singer".
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False):
+        self.keywords = [k for k in dict.fromkeys(keywords) if k]
+        self.whole_words = whole_words
+        self._canonical = {k.lower(): k for k in self.keywords}
+        pattern = _trie_pattern(self._canonical) if self._canonical else r"(?!)"
+        if whole_words:
+            pattern = rf"\b(?:{pattern})\b"
+        self.pattern = re.compile(pattern)
+        self._search = self.pattern.search
+
+    def search(self, text: str) -> bool:
+        """Return True if any keyword occurs in the text."""
+        return bool(text) and self._search(text.lower()) is not None
+
+    def matches(self, text: str) -> Set[str]:
+        """Return the keywords that occur in the text."""
+        if not text:
+            return set()
+        return {self._canonical[m.group(0)] for m in self.pattern.finditer(text.lower())}
+
+    def search_many(self, texts: Sequence[str]) -> List[bool]:
+        """Return, for each text, whether any keyword occurs in it."""
+        search = self._search
+        return [bool(text) and search(text.lower()) is not None for text in texts]
+
+    def filter(self, concerts: Sequence, fields: Sequence[str] = ("title", "description")) -> List:
+        """Return the concerts whose given fields mention any keyword."""
+        texts = [" ".join(getattr(c, field) or "" for field in fields) for c in concerts]
+        return [c for c, hit in zip(concerts, self.search_many(texts)) if hit]
+
+
+@lru_cache(maxsize=None)
+def get_matcher(keywords: tuple, whole_words: bool = False) -> KeywordMatcher:
+    """Return a shared matcher for a keyword tuple, compiling it on first use."""
+    return KeywordMatcher(keywords, whole_words=whole_words)
+
+
+CHILD_FRIENDLY = get_matcher(tuple(config.CHILD_FRIENDLY_KEYWORDS))
+LIBRARY_MUSIC = get_matcher(tuple(config.LIBRARY_MUSIC_KEYWORDS))
+BOSTON_COM_MUSIC = get_matcher(tuple(config.BOSTON_COM_MUSIC_KEYWORDS))
@@ -0,0 +1,220 @@
+"""Parquet export partitioned by town and event month.
+
+Concerts are written as a Hive-partitioned dataset
+(``town=Cambridge/month=2025-06/part-0.parquet``), so analysis can read only
+the towns, months and columns it needs. Venue and source are
+dictionary-encoded, and the event start, end and ``scraped_at`` are stored
+as local wall-clock timestamps. Concerts whose date cannot be parsed go to
+the null month partition.
+
+Each row carries its ``event_id``, and an event has one row in the whole
+dataset: a run drops the earlier rows of its events from every partition,
+so an event whose date or town changed moves instead of being duplicated.
+A partition a run touches is rewritten with the run's concerts plus the
+rows already in it for other events, so a run of one source does not drop
+what other sources wrote there.
+
+Requires the optional ``pyarrow`` dependency
+(``pip install 'local-children-concerts[parquet]'``).
+"""
+
+import json
+import logging
+import os
+from typing import Iterable, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from scraper import config
+from scraper.dataset import ID_FIELDS, event_id
+from scraper.table import ConcertTable
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # Optional dependency
+    pa = ds = None
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ["town", "month"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet export needs pyarrow: pip install 'local-children-concerts[parquet]'")
+
+
+def _schema():
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("event_id", pa.string()),
+            ("title", pa.string()),
+            ("venue", dictionary),
+            ("town", pa.string()),
+            ("date", pa.string()),
+            ("start", pa.timestamp("ms")),
+            ("end", pa.timestamp("ms")),
+            ("url", pa.string()),
+            ("description", pa.string()),
+            ("address", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("source", dictionary),
+            ("scraped_at", pa.timestamp("us")),
+            ("sources", pa.string()),
+            ("month", pa.string()),
+        ]
+    )
+
+
+def _wall_clock(values: pd.Series) -> pd.Series:
+    """Parse ISO timestamps as local wall-clock time, dropping any offset."""
+    text = values.astype(object).fillna("").astype(str).str.slice(0, 26)
+    return pd.to_datetime(text.str.replace(r"[+-]\d{2}:\d{2}$|Z$", "", regex=True), errors="coerce", format="ISO8601")
+
+
+def _event_ids(frame: pd.DataFrame) -> List[str]:
+    """Compute each row's event ID from its ID fields."""
+    columns = [frame[field].astype(object).where(frame[field].notna(), None) for field in ID_FIELDS]
+    return [event_id(dict(zip(ID_FIELDS, values))) for values in zip(*columns)]
+
+
+def _to_frame(table: ConcertTable) -> pd.DataFrame:
+    frame = table.frame
+    start = table.dates()
+    columns = {
+        "event_id": _event_ids(frame),
+        "title": frame["title"],
+        "venue": frame["venue"].astype(object),
+        "town": frame["town"].astype(object),
+        "date": frame["date"],
+        "start": start,
+        "end": _wall_clock(frame["end"]),
+        "url": frame["url"],
+        "description": frame["description"],
+        "address": frame["address"],
+        "latitude": pd.to_numeric(frame["latitude"], errors="coerce"),
+        "longitude": pd.to_numeric(frame["longitude"], errors="coerce"),
+        "source": frame["source"].astype(object),
+        "scraped_at": _wall_clock(frame["scraped_at"]),
+        "sources": frame["sources"].map(lambda s: json.dumps(s) if s else None),
+        "month": start.dt.strftime("%Y-%m"),
+    }
+    return pd.DataFrame(columns, index=frame.index).astype(
+        {"start": "datetime64[ms]", "end": "datetime64[ms]", "scraped_at": "datetime64[us]"}
+    )
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLUMNS]), flavor="hive")
+
+
+def _partition_keys(frame: pd.DataFrame) -> List[Tuple[str, str]]:
+    return list(zip(frame["town"].fillna(""), frame["month"].fillna("")))
+
+
+def _kept_rows(data: pd.DataFrame, directory: str) -> Tuple[Optional[pd.DataFrame], Set[Tuple[str, str]]]:
+    """Return the rows to keep from the partitions ``data`` rewrites, and the partitions left empty.
+
+    A partition is rewritten if ``data`` has rows for it or it holds an
+    earlier row of one of ``data``'s events. Rows of ``data``'s events are
+    dropped from every partition; other rows in rewritten partitions are kept.
+    """
+    if not os.path.isdir(directory):
+        return None, set()
+    dataset = ds.dataset(directory, format="parquet", partitioning=_partitioning(), schema=_schema())
+    # Find where this run's events were written before, reading only the ID columns
+    ids = dataset.to_table(columns=["event_id", *ID_FIELDS, *PARTITION_COLUMNS]).to_pandas()
+    if ids.empty:
+        return None, set()
+    # Files written before event IDs were stored have none
+    missing = ids["event_id"].isna()
+    if missing.any():
+        ids.loc[missing, "event_id"] = _event_ids(ids[missing])
+    written = set(_partition_keys(data))
+    stale = set(_partition_keys(ids[ids["event_id"].isin(data["event_id"])]))
+    rewritten = written | stale
+
+    towns = {town for town, _ in rewritten}
+    expression = ds.field("town").isin([town for town in towns if town])
+    if "" in towns:
+        expression = expression | ds.field("town").is_null()
+    existing = dataset.to_table(filter=expression).to_pandas()
+    missing = existing["event_id"].isna()
+    if missing.any():
+        existing.loc[missing, "event_id"] = _event_ids(existing[missing])
+    in_partition = pd.Series([key in rewritten for key in _partition_keys(existing)], index=existing.index, dtype=bool)
+    kept = existing[in_partition & ~existing["event_id"].isin(data["event_id"])]
+    emptied = stale - written - set(_partition_keys(kept))
+    return kept.astype({"venue": object, "source": object, "town": object, "month": object}), emptied
+
+
+def _delete_partitions(directory: str, partitions: Set[Tuple[str, str]]):
+    """Delete the files of partitions whose every row moved elsewhere."""
+    dataset = ds.dataset(directory, format="parquet", partitioning=_partitioning())
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        if (keys.get("town") or "", keys.get("month") or "") in partitions:
+            os.remove(fragment.path)
+            try:
+                os.removedirs(os.path.dirname(fragment.path))
+            except OSError:  # Not empty, or the dataset root
+                pass
+
+
+def write_parquet(concerts: Union[ConcertTable, Iterable], directory: str = None) -> int:
+    """Write concerts to a town/month-partitioned Parquet dataset.
+
+    Concerts replace the rows of the same event ID, in whichever partition
+    they were. Other rows in the partitions ``concerts`` touch are kept, as
+    are other partitions, so history accumulates across runs and a run of
+    some sources keeps what the others wrote. Returns the number of concerts
+    written.
+    """
+    _require_pyarrow()
+    directory = directory or config.PARQUET_DIR
+    table = ConcertTable.from_concerts(concerts)
+    if not len(table):
+        return 0
+
+    data = _to_frame(table)
+    kept, emptied = _kept_rows(data, directory)
+    if kept is not None and len(kept):
+        data = pd.concat([kept[data.columns], data], ignore_index=True)
+    ds.write_dataset(
+        pa.Table.from_pandas(data, schema=_schema(), preserve_index=False),
+        directory,
+        format="parquet",
+        partitioning=_partitioning(),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+    if emptied:
+        _delete_partitions(directory, emptied)
+    logger.info(
+        f"Saved {len(table)} concerts to {directory} ({0 if kept is None else len(kept)} kept from earlier runs, "
+        f"{len(emptied)} emptied partition(s) removed)"
+    )
+    return len(table)
+
+
+def read_parquet(
+    directory: str = None,
+    columns: Optional[List[str]] = None,
+    towns: Optional[List[str]] = None,
+    months: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Read concerts back, scanning only the requested partitions and columns.
+
+    ``months`` are ``YYYY-MM`` strings.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(directory or config.PARQUET_DIR, format="parquet", partitioning="hive")
+    expression = None
+    for column, values in (("town", towns), ("month", months)):
+        if values:
+            condition = ds.field(column).isin(values)
+            expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
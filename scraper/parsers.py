@@ -0,0 +1,573 @@
+"""Event extraction for the HTML scrapers.
+
+Every site has two extractors that return the same records (``Concert``
+keyword dicts):
+
+- The fast path parses the page with lxml directly, using the encoding
+  declared in the response headers, and evaluates XPath expressions that
+  are compiled once at import time.
+- The BeautifulSoup path is the original implementation. It is kept as a
+  fallback (``config.FAST_PARSE = False``) and as the baseline for
+  ``benchmarks/bench_parsing.py``. bs4 is imported only when it is used.
+
+Extractors are module-level functions of ``(content, encoding, base_url,
+**options)`` so they can be handed to worker processes. Records cached from
+a page are keyed by ``extractor_key``, so changing an extractor (bump
+``EXTRACTOR_VERSION``), the gazetteer or the parser options makes pages be
+parsed again.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+from lxml import etree, html
+
+from scraper import config
+from scraper.gazetteer import NEIGHBORHOODS, VENUES, ZIP_CODES, resolve_town
+from scraper.keywords import BOSTON_COM_MUSIC, LIBRARY_MUSIC
+
+logger = logging.getLogger(__name__)
+
+Extractor = Callable[..., List[Dict]]
+
+# Bump whenever an extractor changes what it returns
+EXTRACTOR_VERSION = 2
+
+_data_fingerprint: Optional[str] = None
+
+
+def declared_encoding(response) -> Optional[str]:
+    """Return the charset declared in a response's Content-Type header, if any."""
+    content_type = response.headers.get("Content-Type", "")
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip("\"'")
+    return None
+
+
+def _absolute(url: str, base_url: str) -> str:
+    if url and not url.startswith("http"):
+        return f"{base_url}{url}"
+    return url
+
+
+# -- Fast path: lxml with precompiled XPath ---------------------------------
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_TEXT_NODES = etree.XPath(".//text()[not(parent::script or parent::style)]")
+_HREF = etree.XPath("string((.//a)[1]/@href)")
+
+_BOSTON_GOV_EVENTS = etree.XPath(f"//div[{_has_class('event-details')}]")
+_BOSTON_GOV_TITLE = etree.XPath("(.//a)[1]")
+_BOSTON_GOV_TIME = etree.XPath("(.//p[@class='cd m-t100'])[1]")
+_BOSTON_GOV_LOCATION = etree.XPath(
+    "(.//text()[contains(., 'Virtual') or contains(., 'Boston') or contains(., ',')])[1]"
+)
+_PARAGRAPHS = etree.XPath(".//p")
+_FIRST_PARAGRAPH = etree.XPath("(.//p)[1]")
+
+_EVENT_DIVS = etree.XPath(f"//div[{_has_class('event')}]")
+_ARTICLES = etree.XPath("//article")
+_CARD_DIVS = etree.XPath(f"//div[{_has_class('card')}]")
+_POST_DIVS = etree.XPath(f"//div[{_has_class('post')}]")
+
+_H2 = etree.XPath("(.//h2)[1]")
+_H3 = etree.XPath("(.//h3)[1]")
+_A = etree.XPath("(.//a)[1]")
+_TIME = etree.XPath("(.//time)[1]")
+_SPAN_DATE = etree.XPath(f"(.//span[{_has_class('date')}])[1]")
+_DIV_DESCRIPTION = etree.XPath(f"(.//div[{_has_class('description')}])[1]")
+_DIV_LOCATION = etree.XPath(f"(.//div[{_has_class('location')}])[1]")
+_SPAN_BRANCH = etree.XPath(f"(.//span[{_has_class('branch')}])[1]")
+_DIV_VENUE = etree.XPath(f"(.//div[{_has_class('venue')}])[1]")
+_SPAN_LOCATION = etree.XPath(f"(.//span[{_has_class('location')}])[1]")
+_SPAN_VENUE = etree.XPath(f"(.//span[{_has_class('venue')}])[1]")
+
+
+def _parse(content: bytes, encoding: Optional[str]):
+    """Parse a page with lxml, trusting the declared encoding when there is one."""
+    try:
+        parser = html.HTMLParser(encoding=encoding) if encoding else None
+    except LookupError:
+        parser = None
+    try:
+        return html.fromstring(content, parser=parser)
+    except etree.ParserError:
+        # Empty or whitespace-only body
+        return html.fromstring("<html></html>")
+
+
+def _first(element, *queries):
+    """Return the first match of the first query that matches anything."""
+    for query in queries:
+        found = query(element)
+        if found:
+            return found[0]
+    return None
+
+
+def _text(element) -> str:
+    """Concatenate the stripped text of an element, like get_text(strip=True)."""
+    if element is None:
+        return ""
+    return "".join(s.strip() for s in _TEXT_NODES(element))
+
+
+def extract_boston_gov(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from a Boston.gov events page."""
+    records = []
+    for event in _BOSTON_GOV_EVENTS(_parse(content, encoding)):
+        try:
+            title_link = _first(event, _BOSTON_GOV_TITLE)
+            if title_link is None:
+                continue
+
+            location = _BOSTON_GOV_LOCATION(event)
+            venue = location[0].strip() if location else "Boston"
+            records.append(
+                {
+                    "title": _text(title_link),
+                    "venue": venue,
+                    "town": resolve_town(venue),
+                    "date": _text(_first(event, _BOSTON_GOV_TIME)),
+                    "url": _absolute(title_link.get("href", ""), base_url),
+                    "description": " ".join(t for t in map(_text, _PARAGRAPHS(event)) if t),
+                    "source": "Boston.gov",
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Error parsing event: {e}")
+    return records
+
+
+def extract_library(
+    content: bytes, encoding: Optional[str], base_url: str, town: str, source: str, default_venue: str
+) -> List[Dict]:
+    """Extract music event records from a public library calendar page."""
+    root = _parse(content, encoding)
+    records = []
+    for event in _EVENT_DIVS(root) or _ARTICLES(root):
+        try:
+            title_elem = _first(event, _H2, _H3, _A)
+            if title_elem is None:
+                continue
+            title = _text(title_elem)
+
+            if not LIBRARY_MUSIC.search(title):
+                continue
+
+            date_elem = _first(event, _TIME, _SPAN_DATE)
+            date = date_elem.get("datetime", "") if date_elem is not None else ""
+            if not date and date_elem is not None:
+                date = _text(date_elem)
+
+            loc_elem = _first(event, _DIV_LOCATION, _SPAN_BRANCH)
+            venue = _text(loc_elem) if loc_elem is not None else default_venue
+            records.append(
+                {
+                    "title": title,
+                    "venue": venue,
+                    "town": resolve_town(venue, default=town),
+                    "date": date,
+                    "url": _absolute(_HREF(event), base_url),
+                    "description": _text(_first(event, _FIRST_PARAGRAPH, _DIV_DESCRIPTION)),
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Error parsing library event: {e}")
+    return records
+
+
+def extract_timeout(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from a Time Out Boston listing page."""
+    root = _parse(content, encoding)
+    records = []
+    for event in (_ARTICLES(root) or _CARD_DIVS(root))[:20]:
+        try:
+            title_elem = _first(event, _H3, _H2)
+            if title_elem is None:
+                continue
+
+            description = _text(_first(event, _FIRST_PARAGRAPH))
+            venue_elem = _first(event, _DIV_VENUE, _SPAN_LOCATION)
+            venue = _text(venue_elem) if venue_elem is not None else "Boston Venue"
+            records.append(
+                {
+                    "title": _text(title_elem),
+                    "venue": venue,
+                    "town": resolve_town(venue, description),
+                    "date": "",  # Time Out doesn't always have structured dates
+                    "url": _absolute(_HREF(event), base_url),
+                    "description": description,
+                    "source": "Time Out Boston",
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Error parsing Time Out event: {e}")
+    return records
+
+
+def extract_boston_com(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract music event records from a Boston.com listing page."""
+    root = _parse(content, encoding)
+    records = []
+    for event in (_ARTICLES(root) or _POST_DIVS(root))[:15]:
+        try:
+            title_elem = _first(event, _H2, _H3)
+            if title_elem is None:
+                continue
+            title = _text(title_elem)
+
+            if not BOSTON_COM_MUSIC.search(title):
+                continue
+
+            description = _text(_first(event, _FIRST_PARAGRAPH))
+            records.append(
+                {
+                    "title": title,
+                    "venue": "Boston Area Venue",
+                    "town": resolve_town(f"{title} {description}"),
+                    "date": "",
+                    "url": _absolute(_HREF(event), base_url),
+                    "description": description,
+                    "source": "Boston.com",
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Error parsing Boston.com event: {e}")
+    return records
+
+
+def extract_boston_central(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from the BostonCentral events page."""
+    root = _parse(content, encoding)
+    records = []
+    for event in (_EVENT_DIVS(root) or _ARTICLES(root))[:20]:
+        try:
+            title_elem = _first(event, _H2, _H3, _A)
+            if title_elem is None:
+                continue
+
+            date_elem = _first(event, _TIME, _SPAN_DATE)
+            venue_elem = _first(event, _SPAN_VENUE, _DIV_LOCATION)
+            venue = _text(venue_elem) if venue_elem is not None else "Boston Venue"
+            description = _text(_first(event, _FIRST_PARAGRAPH))
+            records.append(
+                {
+                    "title": _text(title_elem),
+                    "venue": venue,
+                    "town": resolve_town(venue, description),
+                    "date": date_elem.get("datetime", "") if date_elem is not None else "",
+                    "url": _absolute(_HREF(event), base_url),
+                    "description": description,
+                    "source": "BostonCentral",
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Error parsing BostonCentral event: {e}")
+    return records
+
+
+# -- BeautifulSoup path ------------------------------------------------------
+
+
+def _soup(content: bytes):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, "lxml")
+
+
+def extract_boston_gov_soup(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from a Boston.gov events page with BeautifulSoup."""
+    soup = _soup(content)
+    records = []
+
+    # Look for event detail drawers
+    events = soup.find_all("div", class_="event-details")
+
+    for event in events:
+        try:
+            # Extract title from link
+            title_link = event.find("a")
+            if not title_link:
+                continue
+            title = title_link.get_text(strip=True)
+            url = _absolute(title_link.get("href", ""), base_url)
+
+            # Extract time/date info
+            time_elem = event.find("p", class_="cd m-t100")
+            date = time_elem.get_text(strip=True) if time_elem else ""
+
+            # Extract location
+            location_elem = event.find(string=lambda t: t and ("Virtual" in t or "Boston" in t or "," in t))
+            venue = location_elem.strip() if location_elem else "Boston"
+
+            # Extract description from following paragraphs
+            desc_elems = event.find_all("p")
+            description = " ".join([p.get_text(strip=True) for p in desc_elems if p.get_text(strip=True)])
+
+            record = {
+                "title": title,
+                "venue": venue,
+                "town": resolve_town(venue),
+                "date": date,
+                "url": url,
+                "description": description,
+                "source": "Boston.gov",
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.debug(f"Error parsing event: {e}")
+            continue
+
+    return records
+
+
+def extract_library_soup(
+    content: bytes, encoding: Optional[str], base_url: str, town: str, source: str, default_venue: str
+) -> List[Dict]:
+    """Extract music event records from a public library calendar page with BeautifulSoup."""
+    soup = _soup(content)
+    records = []
+
+    # Look for event listings
+    events = soup.find_all("div", class_="event") or soup.find_all("article")
+
+    for event in events:
+        try:
+            # Extract title
+            title_elem = event.find("h2") or event.find("h3") or event.find("a")
+            if not title_elem:
+                continue
+            title = title_elem.get_text(strip=True)
+
+            # Skip if not music/concert related
+            if not LIBRARY_MUSIC.search(title):
+                continue
+
+            # Extract link
+            link_elem = event.find("a")
+            url = _absolute(link_elem.get("href", "") if link_elem else "", base_url)
+
+            # Extract date
+            date_elem = event.find("time") or event.find("span", class_="date")
+            date = date_elem.get("datetime", "") if date_elem else ""
+            if not date and date_elem:
+                date = date_elem.get_text(strip=True)
+
+            # Extract description
+            desc_elem = event.find("p") or event.find("div", class_="description")
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+            # Extract location/branch
+            loc_elem = event.find("div", class_="location") or event.find("span", class_="branch")
+            venue = loc_elem.get_text(strip=True) if loc_elem else default_venue
+
+            record = {
+                "title": title,
+                "venue": venue,
+                "town": resolve_town(venue, default=town),
+                "date": date,
+                "url": url,
+                "description": description,
+                "source": source,
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.debug(f"Error parsing library event: {e}")
+            continue
+
+    return records
+
+
+def extract_timeout_soup(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from a Time Out Boston listing page with BeautifulSoup."""
+    soup = _soup(content)
+    records = []
+
+    # Look for event cards/articles
+    events = soup.find_all("article") or soup.find_all("div", class_="card")
+
+    for event in events[:20]:  # Limit to first 20 per page
+        try:
+            # Extract title
+            title_elem = event.find("h3") or event.find("h2")
+            if not title_elem:
+                continue
+            title = title_elem.get_text(strip=True)
+
+            # Extract link
+            link_elem = event.find("a")
+            event_url = _absolute(link_elem.get("href", "") if link_elem else "", base_url)
+
+            # Extract description
+            desc_elem = event.find("p")
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+            # Extract venue/location
+            venue_elem = event.find("div", class_="venue") or event.find("span", class_="location")
+            venue = venue_elem.get_text(strip=True) if venue_elem else "Boston Venue"
+
+            record = {
+                "title": title,
+                "venue": venue,
+                "town": resolve_town(venue, description),
+                "date": "",  # Time Out doesn't always have structured dates
+                "url": event_url,
+                "description": description,
+                "source": "Time Out Boston",
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.debug(f"Error parsing Time Out event: {e}")
+            continue
+
+    return records
+
+
+def extract_boston_com_soup(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract music event records from a Boston.com listing page with BeautifulSoup."""
+    soup = _soup(content)
+    records = []
+
+    # Look for event/article listings
+    events = soup.find_all("article") or soup.find_all("div", class_="post")
+
+    for event in events[:15]:  # Limit to first 15 per page
+        try:
+            # Extract title
+            title_elem = event.find("h2") or event.find("h3")
+            if not title_elem:
+                continue
+            title = title_elem.get_text(strip=True)
+
+            # Filter for music/concert content
+            if not BOSTON_COM_MUSIC.search(title):
+                continue
+
+            # Extract link
+            link_elem = event.find("a")
+            event_url = _absolute(link_elem.get("href", "") if link_elem else "", base_url)
+
+            # Extract description
+            desc_elem = event.find("p")
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+            record = {
+                "title": title,
+                "venue": "Boston Area Venue",
+                "town": resolve_town(f"{title} {description}"),
+                "date": "",
+                "url": event_url,
+                "description": description,
+                "source": "Boston.com",
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.debug(f"Error parsing Boston.com event: {e}")
+            continue
+
+    return records
+
+
+def extract_boston_central_soup(content: bytes, encoding: Optional[str], base_url: str) -> List[Dict]:
+    """Extract event records from the BostonCentral events page with BeautifulSoup."""
+    soup = _soup(content)
+    records = []
+
+    # Look for event listings
+    events = soup.find_all("div", class_="event") or soup.find_all("article")
+
+    for event in events[:20]:
+        try:
+            # Extract title
+            title_elem = event.find("h2") or event.find("h3") or event.find("a")
+            if not title_elem:
+                continue
+            title = title_elem.get_text(strip=True)
+
+            # Extract link
+            link_elem = event.find("a")
+            event_url = _absolute(link_elem.get("href", "") if link_elem else "", base_url)
+
+            # Extract date
+            date_elem = event.find("time") or event.find("span", class_="date")
+            date = date_elem.get("datetime", "") if date_elem else ""
+
+            # Extract description
+            desc_elem = event.find("p")
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+            # Extract venue
+            venue_elem = event.find("span", class_="venue") or event.find("div", class_="location")
+            venue = venue_elem.get_text(strip=True) if venue_elem else "Boston Venue"
+
+            record = {
+                "title": title,
+                "venue": venue,
+                "town": resolve_town(venue, description),
+                "date": date,
+                "url": event_url,
+                "description": description,
+                "source": "BostonCentral",
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.debug(f"Error parsing BostonCentral event: {e}")
+            continue
+
+    return records
+
+
+# Site name -> (fast extractor, BeautifulSoup extractor)
+EXTRACTORS: Dict[str, tuple] = {
+    "boston_gov": (extract_boston_gov, extract_boston_gov_soup),
+    "library": (extract_library, extract_library_soup),
+    "timeout": (extract_timeout, extract_timeout_soup),
+    "boston_com": (extract_boston_com, extract_boston_com_soup),
+    "boston_central": (extract_boston_central, extract_boston_central_soup),
+}
+
+
+def get_extractor(site: str, fast: bool = None) -> Extractor:
+    """Return the extractor for a site, honouring config.FAST_PARSE by default."""
+    fast_extractor, soup_extractor = EXTRACTORS[site]
+    if fast is None:
+        fast = config.FAST_PARSE
+    return fast_extractor if fast else soup_extractor
+
+
+def extractor_key(site: str, base_url: str, options: Dict, fast: bool = None) -> str:
+    """Identify the records extracting a page would give with these settings.
+
+    The key covers the extractor version, site, parser (fast or
+    BeautifulSoup), base URL and options, and the gazetteer and keyword lists
+    that decide each record's town and which events are kept.
+    """
+    global _data_fingerprint
+    if _data_fingerprint is None:
+        keywords = [LIBRARY_MUSIC.pattern.pattern, BOSTON_COM_MUSIC.pattern.pattern]
+        data = [config.BOSTON_METRO_TOWNS, NEIGHBORHOODS, ZIP_CODES, VENUES, keywords]
+        _data_fingerprint = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    settings = {
+        "version": EXTRACTOR_VERSION,
+        "site": site,
+        "fast": config.FAST_PARSE if fast is None else fast,
+        "base_url": base_url,
+        "options": options,
+        "data": _data_fingerprint,
+    }
+    return hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()[:16]
@@ -0,0 +1,93 @@
+"""Fetch and parse stages of the scraping pipeline.
+
+The fetch stage runs on the scrapers' threads and only does network I/O.
+Raw page bytes are then handed to the parse stage, which runs the
+extractors from ``scraper.parsers`` on a pool of worker processes and
+returns plain record dicts to the parent. Parsing many pages therefore uses
+every core while the network threads keep downloading.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from scraper import config
+from scraper.parsers import get_extractor
+
+logger = logging.getLogger(__name__)
+
+
+class FetchedPage:
+    """Output of the fetch stage for one listing page."""
+
+    def __init__(self, url: str, content: bytes = None, encoding: str = None, records: List[Dict] = None):
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        # Records reused from the HTTP cache; when set, the page needs no parsing
+        self.records = records
+
+
+def _run_extractor(site: str, fast: bool, content: bytes, encoding: Optional[str], base_url: str, options: Dict):
+    """Run an extractor; executed inside a parser worker process."""
+    return get_extractor(site, fast)(content, encoding, base_url, **options)
+
+
+class ParsePool:
+    """Runs extractors on worker processes, or inline when ``workers`` is 0."""
+
+    def __init__(self, workers: int = None):
+        self.workers = config.PARSE_WORKERS if workers is None else workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, site: str, content: bytes, encoding: Optional[str], base_url: str, **options) -> Future:
+        """Queue a page for extraction and return a future of its records."""
+        fast = config.FAST_PARSE
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(_run_extractor(site, fast, content, encoding, base_url, options))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the parent is multithreaded by now
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Started {self.workers} parser processes")
+        return self._executor.submit(_run_extractor, site, fast, content, encoding, base_url, options)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """Return the process-wide parse pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+
+def shutdown_parse_pool():
+    """Stop the process-wide parse pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,84 @@
+"""Registry of the scrapers selectable from the command line.
+
+Each entry names its scraper class as ``"module:Class"`` and the module is
+only imported when the scraper is selected, so ``main.py --help`` and
+single-source runs do not load every scraper and its dependencies.
+"""
+
+import importlib
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperSpec:
+    """A scraper class to load lazily, with the arguments to build it."""
+
+    def __init__(self, label: str, target: str, kwargs: Dict = None, requires_env: Optional[str] = None):
+        self.label = label
+        self.target = target
+        self.kwargs = kwargs or {}
+        # Environment variable (e.g. an API key) the scraper cannot run without
+        self.requires_env = requires_env
+
+    def load(self) -> type:
+        """Import and return the scraper class."""
+        return load(self.target)
+
+    def factory(self) -> Callable:
+        """Return a zero-argument callable that builds the scraper."""
+        cls = self.load()
+        kwargs = self.kwargs
+        return (lambda: cls(**kwargs)) if kwargs else cls
+
+
+# Option name -> the scrapers it runs, in run order
+SCRAPERS: Dict[str, List[ScraperSpec]] = {
+    "boston": [ScraperSpec("Boston.gov", "scraper.boston_events_scraper:BostonEventsScaper")],
+    "libraries": [
+        ScraperSpec("Boston Public Library", "scraper.library_events_scraper:BostonPublicLibraryScaper"),
+        ScraperSpec("Cambridge Public Library", "scraper.library_events_scraper:CambridgePublicLibraryScaper"),
+    ],
+    "timeout": [ScraperSpec("Time Out Boston", "scraper.web_search_scraper:TimeOutBostonScraper")],
+    "bostoncom": [ScraperSpec("Boston.com", "scraper.web_search_scraper:BostonComScraper")],
+    "bostoncentral": [ScraperSpec("BostonCentral", "scraper.web_search_scraper:BostonCentralScraper")],
+    "eventbrite": [
+        ScraperSpec(
+            "Eventbrite",
+            "scraper.eventbrite_scraper:EventbriteScraper",
+            kwargs={"location": "Boston, MA"},
+            requires_env="EVENTBRITE_API_KEY",
+        )
+    ],
+}
+
+
+def register(name: str, *specs: ScraperSpec):
+    """Add or replace a command-line scraper option."""
+    SCRAPERS[name] = list(specs)
+
+
+def scraper_names() -> List[str]:
+    """Return the registered scraper option names."""
+    return list(SCRAPERS)
+
+
+def load(target: str) -> type:
+    """Import ``"module:Class"`` and return the class."""
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def build_jobs(names: List[str]) -> List[Tuple[str, Callable]]:
+    """Build (label, factory) pairs for the selected scrapers, importing only those."""
+    jobs = []
+    for name in names:
+        for spec in SCRAPERS[name]:
+            if spec.requires_env and not os.getenv(spec.requires_env):
+                logger.info(f"Skipping {spec.label} scraper (no API key set)")
+                logger.info(f"To use {spec.label}, set {spec.requires_env} environment variable")
+                continue
+            jobs.append((spec.label, spec.factory()))
+    return jobs
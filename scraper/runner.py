@@ -0,0 +1,164 @@
+"""Concurrent orchestration of scrapers with per-source deadlines and circuit breakers."""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from scraper import config
+from scraper.base_scraper import BaseScraper, Concert
+from scraper.health import HealthStore
+
+logger = logging.getLogger(__name__)
+
+ScraperFactory = Callable[[], BaseScraper]
+
+
+class SourceResult:
+    """Outcome of running a single scraper."""
+
+    def __init__(
+        self,
+        name: str,
+        concerts: List[Concert] = None,
+        elapsed: float = 0.0,
+        error: str = None,
+        timed_out: bool = False,
+        skipped: bool = False,
+        incremental: bool = False,
+    ):
+        self.name = name
+        self.concerts = concerts or []
+        self.elapsed = elapsed
+        self.error = error
+        self.timed_out = timed_out
+        # Not run because the source's circuit breaker is open
+        self.skipped = skipped
+        # The scraper only scrapes events changed since its last run
+        self.incremental = incremental
+
+    @property
+    def ok(self) -> bool:
+        """Whether the scraper ran and finished without error or timeout."""
+        return self.error is None and not self.timed_out and not self.skipped
+
+
+def run_scrapers(
+    jobs: List[Tuple[str, ScraperFactory]],
+    workers: int = config.SCRAPER_WORKERS,
+    deadline: Optional[float] = config.SOURCE_DEADLINE,
+    health: Optional[HealthStore] = None,
+    skip_open: bool = True,
+) -> Iterator[SourceResult]:
+    """Run scrapers, at most ``workers`` at a time, yielding results as they finish.
+
+    Each source gets ``deadline`` seconds from the moment it starts running.
+    A source that misses its deadline is reported as timed out and its
+    results are discarded; a source that raises is reported with its error.
+    Neither affects the other sources.
+
+    Every source runs on its own daemon thread. Python cannot stop a thread,
+    so an abandoned source keeps running in the background, but it gives up
+    its slot to the next queued source and does not keep the process alive
+    at exit.
+
+    With ``health``, every outcome is recorded in the store, and unless
+    ``skip_open`` is False, sources whose circuit breaker is open are not
+    run but reported as skipped.
+    """
+    started: Dict[str, float] = {}
+    scrapers: Dict[str, BaseScraper] = {}
+
+    if health is not None and skip_open:
+        runnable = []
+        for name, factory in jobs:
+            if health.should_run(name):
+                runnable.append((name, factory))
+            else:
+                logger.warning(f"Skipping {name}: circuit open after repeated failures")
+                yield SourceResult(name, skipped=True)
+        jobs = runnable
+
+    def report(result: SourceResult) -> SourceResult:
+        if health is not None:
+            error = f"missed its {deadline:.0f}s deadline" if result.timed_out else result.error
+            health.record(
+                result.name, result.ok, result.elapsed, len(result.concerts), error, incremental=result.incremental
+            )
+        return result
+
+    def run(name: str, factory: ScraperFactory) -> List[Concert]:
+        started[name] = time.monotonic()
+        scraper = scrapers[name] = factory()
+        if deadline is not None:
+            scraper.deadline = started[name] + deadline
+        return scraper.scrape()
+
+    def start(name: str, factory: ScraperFactory) -> Future:
+        future = Future()
+
+        def target():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(run(name, factory))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name=f"scraper-{name}", daemon=True).start()
+        return future
+
+    queued = deque(jobs)
+    futures: Dict[Future, str] = {}
+    pending = set()
+
+    def fill():
+        while queued and len(pending) < max(1, workers):
+            name, factory = queued.popleft()
+            future = start(name, factory)
+            futures[future] = name
+            pending.add(future)
+
+    try:
+        while queued or pending:
+            # Finished and abandoned sources free their slots for queued ones
+            fill()
+            timeout = None
+            if deadline is not None:
+                running = [started[futures[f]] for f in pending if futures[f] in started]
+                if running:
+                    timeout = max(0.0, min(running) + deadline - time.monotonic())
+                else:
+                    timeout = deadline
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                elapsed = time.monotonic() - started.get(name, time.monotonic())
+                incremental = name in scrapers and scrapers[name].incremental
+                try:
+                    concerts = future.result()
+                except Exception as e:
+                    logger.error(f"Scraper {name} failed after {elapsed:.1f}s: {e}")
+                    yield report(SourceResult(name, elapsed=elapsed, error=str(e), incremental=incremental))
+                else:
+                    logger.info(f"Scraper {name} finished in {elapsed:.1f}s with {len(concerts)} events")
+                    yield report(SourceResult(name, concerts=concerts, elapsed=elapsed, incremental=incremental))
+
+            if deadline is None:
+                continue
+
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started and now - started[name] >= deadline:
+                    pending.discard(future)
+                    future.cancel()
+                    logger.error(f"Scraper {name} missed its {deadline:.0f}s deadline")
+                    yield report(SourceResult(name, elapsed=now - started[name], timed_out=True))
+    finally:
+        # Sources still queued when the caller stops iterating are never started
+        queued.clear()
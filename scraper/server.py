@@ -0,0 +1,342 @@
+"""Read-only HTTP server for concert listings, answered from in-memory indexes.
+
+``ConcertIndex`` loads the saved concerts (``data/concerts.json``, which is
+the whole dataset with ``main.py --upsert``) once and sorts them by local
+start time. Each town and source keeps the positions of its concerts in
+that order next to their sorted start times, so a town and date range is
+two bisections and a slice. Every concert is encoded to JSON when the index
+is built, and a page of results joins the encoded concerts.
+
+``ConcertServer`` serves an index from ``http.server``'s thread-per-request
+server. Responses carry an ETag made of the dataset's content hash and the
+query, so a client revalidating a page gets a 304 without the query
+running, and are gzipped for clients that accept it. A watcher thread polls
+the dataset file; when a new one is written (atomically, see
+``scraper.writers.atomic_open``) it builds a new index and swaps it in with
+one assignment. Requests in flight finish on the index they started with.
+
+Endpoints:
+
+- ``GET /concerts?town=&source=&since=&until=&offset=&limit=``: concerts by
+  start time, with ``total`` and the ``next`` offset (null on the last page)
+- ``GET /concerts/<event_id>``: one concert
+- ``GET /towns`` and ``GET /sources``: concert counts per value
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from scraper import config
+from scraper.dataset import event_id
+from scraper.sqlite_store import normalize_date
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every ISO date, so concerts without a start come last
+_UNDATED = "~"
+
+
+def _start_key(record: Dict) -> str:
+    """Return the local start time a concert sorts by, like ``ConcertStore``'s ``date_norm``."""
+    start = record.get("start")
+    return (start[:19] if start else normalize_date(record.get("date"))) or _UNDATED
+
+
+def _read_records(path: Path) -> Tuple[List[Dict], str]:
+    """Return the concerts saved at ``path`` (JSON or JSON Lines) and a hash of the file."""
+    data = path.read_bytes()
+    if path.suffix == ".jsonl":
+        records = [json.loads(line) for line in data.splitlines() if line.strip()]
+    else:
+        records = json.loads(data)
+    return records, hashlib.sha1(data).hexdigest()[:16]
+
+
+class _Postings:
+    """Positions of some concerts in start order, with their start times for bisecting."""
+
+    __slots__ = ("positions", "starts", "members")
+
+    def __init__(self):
+        self.positions: List[int] = []
+        self.starts: List[str] = []
+        self.members: Optional[frozenset] = None
+
+    def add(self, position: int, start: str):
+        self.positions.append(position)
+        self.starts.append(start)
+
+    def between(self, since: Optional[str], until: Optional[str], inclusive: bool) -> List[int]:
+        """Return the positions starting within ``[since, until]`` (``until`` excluded unless ``inclusive``)."""
+        if since is None and until is None:
+            return self.positions
+        lo = bisect_left(self.starts, since) if since else 0
+        if until is None:
+            hi = bisect_left(self.starts, _UNDATED)
+        else:
+            hi = (bisect_right if inclusive else bisect_left)(self.starts, until)
+        return self.positions[lo:hi]
+
+    def __contains__(self, position: int) -> bool:
+        if self.members is None:
+            self.members = frozenset(self.positions)
+        return position in self.members
+
+
+class ConcertIndex:
+    """Saved concerts indexed by start time, town and source.
+
+    Towns and sources match case-insensitively, as in ``ConcertStore``.
+    ``version`` identifies the dataset the index was built from and is
+    part of every ETag, so a new dataset invalidates cached responses.
+    """
+
+    def __init__(self, records: List[Dict], version: str = "empty"):
+        self.version = version
+        keyed = sorted(((_start_key(record), i) for i, record in enumerate(records)))
+        self.records = [records[i] for _, i in keyed]
+        self.encoded = [json.dumps(record).encode() for record in self.records]
+        self.all = _Postings()
+        self.towns: Dict[str, _Postings] = {}
+        self.sources: Dict[str, _Postings] = {}
+        self.ids: Dict[str, int] = {}
+        for position, (start, _) in enumerate(keyed):
+            record = self.records[position]
+            self.all.add(position, start)
+            for postings, value in ((self.towns, record.get("town")), (self.sources, record.get("source"))):
+                if value:
+                    postings.setdefault(value.lower(), _Postings()).add(position, start)
+            self.ids[record.get("event_id") or event_id(record)] = position
+        self.town_names = self._names("town")
+        self.source_names = self._names("source")
+        self._responses: "OrderedDict[Tuple, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = None) -> "ConcertIndex":
+        """Build an index from saved concerts; an index of nothing if there are none yet."""
+        path = Path(path or config.CONCERTS_JSON)
+        if not path.exists():
+            logger.warning(f"No concerts saved at {path} yet; serving none until they are")
+            return cls([])
+        records, version = _read_records(path)
+        index = cls(records, version)
+        logger.info(f"Indexed {len(index)} concerts from {path} ({len(index.towns)} towns)")
+        return index
+
+    def _names(self, field: str) -> Dict[str, str]:
+        """Map each lowercased value of ``field`` to its first spelling in the data."""
+        names: Dict[str, str] = {}
+        for record in self.records:
+            value = record.get(field)
+            if value:
+                names.setdefault(value.lower(), value)
+        return names
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def query(
+        self,
+        town: str = None,
+        source: str = None,
+        since: str = None,
+        until: str = None,
+    ) -> List[int]:
+        """Return the positions of concerts matching every given filter, by start time.
+
+        ``since`` and ``until`` are ISO dates or datetimes; both bounds are
+        inclusive, and a bare ``until`` day includes every concert on it.
+        """
+        since = normalize_date(since) if since else None
+        inclusive = True
+        if until:
+            until = normalize_date(until)
+            if until is not None and len(until) == 10:
+                until = (date.fromisoformat(until) + timedelta(days=1)).isoformat()
+                inclusive = False
+        filters = []
+        for value, postings in ((town, self.towns), (source, self.sources)):
+            if value:
+                if value.lower() not in postings:
+                    return []
+                filters.append(postings[value.lower()])
+        # Bisect the narrowest index and check membership in the others
+        first, *rest = sorted(filters, key=lambda postings: len(postings.positions)) or [self.all]
+        positions = first.between(since, until, inclusive)
+        for postings in rest:
+            positions = [position for position in positions if position in postings]
+        return positions
+
+    def page(self, positions: List[int], offset: int, limit: int) -> bytes:
+        """Encode one page of the concerts at ``positions`` as a JSON response body."""
+        end = offset + limit
+        concerts = b",".join(self.encoded[position] for position in positions[offset:end])
+        head = json.dumps(
+            {"total": len(positions), "offset": offset, "limit": limit, "next": end if end < len(positions) else None}
+        ).encode()
+        return head[:-1] + b', "concerts": [' + concerts + b"]}"
+
+    def cached(self, key: Tuple, build) -> Tuple[str, bytes]:
+        """Return the ETag and body for ``key``, building and keeping them on a miss."""
+        with self._lock:
+            hit = self._responses.get(key)
+            if hit is not None:
+                self._responses.move_to_end(key)
+                return hit
+        # Built outside the lock; two threads may both build a cold key, which is harmless
+        response = build()
+        with self._lock:
+            self._responses[key] = response
+            while len(self._responses) > config.SERVER_RESPONSE_CACHE_ENTRIES:
+                self._responses.popitem(last=False)
+        return response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ConcertServer"
+    protocol_version = "HTTP/1.1"
+    server_version = "local-children-concerts"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _respond(self, send_body: bool):
+        index = self.server.index  # Read once: a swap mid-request must not mix datasets
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if url.path.startswith("/concerts/"):
+            if url.path[len("/concerts/") :] not in index.ids:
+                self.send_error(HTTPStatus.NOT_FOUND, "No concert with that event ID")
+                return
+        elif url.path not in ("/concerts", "/towns", "/sources"):
+            self.send_error(HTTPStatus.NOT_FOUND, f"No endpoint {url.path}; use /concerts, /towns or /sources")
+            return
+        try:
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", config.SERVER_PAGE_SIZE))
+        except ValueError:
+            self.send_error(HTTPStatus.BAD_REQUEST, "offset and limit must be integers")
+            return
+        if offset < 0 or not 0 < limit <= config.SERVER_MAX_PAGE_SIZE:
+            self.send_error(HTTPStatus.BAD_REQUEST, f"offset must be >= 0 and limit 1 to {config.SERVER_MAX_PAGE_SIZE}")
+            return
+        for bound in ("since", "until"):
+            if params.get(bound) and normalize_date(params[bound]) is None:
+                self.send_error(HTTPStatus.BAD_REQUEST, f"{bound} must be an ISO date or datetime")
+                return
+
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        query = urlencode(sorted(params.items()))
+        key = (url.path, query, accepts_gzip)
+        etag, body = index.cached(key, lambda: self._build(index, url.path, params, offset, limit, query, accepts_gzip))
+
+        matches = [tag.strip().removeprefix("W/") for tag in self.headers.get("If-None-Match", "").split(",")]
+        if etag in matches or "*" in matches:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag.endswith('-gzip"'):
+            self.send_header("Content-Encoding", "gzip")
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag: str):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  # Cache, but revalidate: the dataset can change
+        self.send_header("Vary", "Accept-Encoding")
+
+    @staticmethod
+    def _build(
+        index: ConcertIndex, path: str, params: Dict, offset: int, limit: int, query: str, accepts_gzip: bool
+    ) -> Tuple[str, bytes]:
+        if path.startswith("/concerts/"):
+            body = index.encoded[index.ids[path[len("/concerts/") :]]]
+        elif path == "/concerts":
+            filters = {name: params.get(name) for name in ("town", "source", "since", "until")}
+            body = index.page(index.query(**filters), offset, limit)
+        else:
+            if path == "/towns":
+                postings, names = index.towns, index.town_names
+            else:
+                postings, names = index.sources, index.source_names
+            counts = {names[value]: len(postings[value].positions) for value in sorted(postings)}
+            body = json.dumps(counts).encode()
+        tag = hashlib.sha1(f"{path}?{query}".encode()).hexdigest()[:12]
+        if accepts_gzip and len(body) >= config.SERVER_GZIP_MIN_BYTES:
+            return f'"{index.version}-{tag}-gzip"', gzip.compress(body, compresslevel=6, mtime=0)
+        return f'"{index.version}-{tag}"', body
+
+
+class ConcertServer(ThreadingHTTPServer):
+    """HTTP server over a ``ConcertIndex`` that swaps in a new index when the dataset changes."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = None, path: str = None, reload_interval: float = None):
+        self.dataset_path = Path(path or config.CONCERTS_JSON)
+        self.reload_interval = config.SERVER_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self._signature = self._stat()
+        self.index = ConcertIndex.load(self.dataset_path)
+        self._stopped = threading.Event()
+        super().__init__(address or (config.SERVER_HOST, config.SERVER_PORT), _Handler)
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.dataset_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> bool:
+        """Rebuild the index if the dataset file changed; returns whether a new index was swapped in."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature  # A file that fails to load is retried once it changes again
+        try:
+            index = ConcertIndex.load(self.dataset_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Keeping the current index; could not load {self.dataset_path}: {e}")
+            return False
+        if index.version == self.index.version:
+            return False
+        self.index = index
+        return True
+
+    def _watch(self):
+        while not self._stopped.wait(self.reload_interval):
+            self.reload()
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        watcher = threading.Thread(target=self._watch, name="dataset-watcher", daemon=True)
+        watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stopped.set()
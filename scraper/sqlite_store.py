@@ -0,0 +1,222 @@
+"""SQLite storage backend with indexed town, date, source and venue queries.
+
+Concerts are upserted by event ID into a single ``concerts`` table. Each
+row also stores its local start time as ``date_norm`` (from the normalized
+``start``, or an ISO ``date``) so date ranges can be answered from an index. The database runs in WAL mode, so queries can read
+while a scrape is writing.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scraper import config
+from scraper.dataset import event_id
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "event_id",
+    "title",
+    "venue",
+    "town",
+    "date",
+    "date_norm",
+    "start",
+    "end",
+    "url",
+    "description",
+    "address",
+    "latitude",
+    "longitude",
+    "source",
+    "scraped_at",
+    "sources",
+    "first_seen",
+    "last_seen",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS concerts (
+    event_id TEXT PRIMARY KEY,
+    title TEXT,
+    venue TEXT COLLATE NOCASE,
+    town TEXT COLLATE NOCASE,
+    date TEXT,
+    date_norm TEXT,
+    start TEXT,
+    "end" TEXT,
+    url TEXT,
+    description TEXT,
+    address TEXT,
+    latitude REAL,
+    longitude REAL,
+    source TEXT COLLATE NOCASE,
+    scraped_at TEXT,
+    sources TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+"""
+
+# Created after _add_missing_columns, since an older table may lack indexed columns
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_concerts_date ON concerts (date_norm);
+CREATE INDEX IF NOT EXISTS idx_concerts_town_date ON concerts (town, date_norm);
+CREATE INDEX IF NOT EXISTS idx_concerts_source_date ON concerts (source, date_norm);
+CREATE INDEX IF NOT EXISTS idx_concerts_venue_date ON concerts (venue, date_norm);
+"""
+
+# Column types other than TEXT, for columns added to an older table
+_COLUMN_TYPES = {"latitude": "REAL", "longitude": "REAL"}
+
+# "end" is an SQL keyword
+_QUOTED = [f'"{c}"' for c in COLUMNS]
+_UPSERT = (
+    f"INSERT INTO concerts ({', '.join(_QUOTED)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    "ON CONFLICT (event_id) DO UPDATE SET "
+    + ", ".join(f"{q} = excluded.{q}" for c, q in zip(COLUMNS, _QUOTED) if c not in ("event_id", "first_seen"))
+)
+
+_ISO_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}:\d{2}(?::\d{2})?))?")
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """Return ``YYYY-MM-DD`` or ``YYYY-MM-DDTHH:MM:SS`` for an ISO date, else None."""
+    match = _ISO_DATE.match((value or "").strip())
+    if not match:
+        return None
+    day, clock = match.groups()
+    if not clock:
+        return day
+    return f"{day}T{clock}:00" if len(clock) == 5 else f"{day}T{clock}"
+
+
+def _day_after(value: str) -> str:
+    return (date.fromisoformat(value) + timedelta(days=1)).isoformat()
+
+
+class ConcertStore:
+    """Concerts stored in an indexed SQLite database."""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.SQLITE_PATH
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._add_missing_columns()
+        self.conn.executescript(_INDEXES)
+
+    def _add_missing_columns(self):
+        """Upgrade a database created before columns were added to the schema."""
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(concerts)")}
+        for column in COLUMNS:
+            if column not in existing:
+                column_type = _COLUMN_TYPES.get(column, "TEXT")
+                self.conn.execute(f'ALTER TABLE concerts ADD COLUMN "{column}" {column_type}')
+
+    def __enter__(self) -> "ConcertStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def _rows(self, concerts: Iterable) -> Iterator[Tuple]:
+        for concert in concerts:
+            record = concert if isinstance(concert, dict) else concert.to_dict()
+            seen = record.get("scraped_at")
+            row = dict(record)
+            row["event_id"] = record.get("event_id") or event_id(record)
+            start = record.get("start")
+            row["date_norm"] = start[:19] if start else normalize_date(record.get("date"))
+            row["sources"] = json.dumps(record["sources"]) if record.get("sources") else None
+            row["first_seen"] = record.get("first_seen") or seen
+            row["last_seen"] = record.get("last_seen") or seen
+            yield tuple(row.get(column) for column in COLUMNS)
+
+    def save(self, concerts: Iterable, batch_size: int = 10_000) -> int:
+        """Upsert concerts by event ID, one transaction per batch. Returns the number saved."""
+        rows = self._rows(concerts)
+        count = 0
+        while True:
+            batch = [row for _, row in zip(range(batch_size), rows)]
+            if not batch:
+                break
+            with self.conn:
+                self.conn.executemany(_UPSERT, batch)
+            count += len(batch)
+        logger.info(f"Saved {count} concerts to {self.path}")
+        return count
+
+    def _where(
+        self,
+        town: str = None,
+        since: str = None,
+        until: str = None,
+        source: str = None,
+        venue: str = None,
+    ) -> Tuple[str, List]:
+        clauses, params = [], []
+        for column, value in (("town", town), ("source", source), ("venue", venue)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("date_norm >= ?")
+            params.append(normalize_date(since) or since)
+        if until:
+            # A bare day includes every event on that day
+            until = normalize_date(until) or until
+            if len(until) == 10:
+                clauses.append("date_norm < ?")
+                params.append(_day_after(until))
+            else:
+                clauses.append("date_norm <= ?")
+                params.append(until)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(
+        self,
+        town: str = None,
+        since: str = None,
+        until: str = None,
+        source: str = None,
+        venue: str = None,
+        limit: int = None,
+    ) -> List[Dict]:
+        """Return concerts matching every given filter, ordered by date.
+
+        ``since`` and ``until`` are ISO dates or datetimes; both bounds are
+        inclusive. Town, source and venue match case-insensitively.
+        """
+        where, params = self._where(town, since, until, source, venue)
+        sql = f"SELECT * FROM concerts{where} ORDER BY date_norm"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        records = []
+        for row in self.conn.execute(sql, params):
+            record = dict(row)
+            record["sources"] = json.loads(record["sources"]) if record["sources"] else None
+            records.append(record)
+        return records
+
+    def count(self, town: str = None, since: str = None, until: str = None, source: str = None, venue: str = None) -> int:
+        """Return the number of concerts matching every given filter."""
+        where, params = self._where(town, since, until, source, venue)
+        return self.conn.execute(f"SELECT COUNT(*) FROM concerts{where}", params).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
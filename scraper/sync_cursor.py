@@ -0,0 +1,70 @@
+"""Persisted cursors for incremental API syncs.
+
+A cursor records, per key (e.g. search term and location), when the last
+complete sync started and the IDs it has seen, so the next run can ask only
+for what changed since then. Cursors are kept in one small JSON file that is
+replaced atomically.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from scraper.writers import atomic_open
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCursor:
+    """Last sync time and seen IDs per key, stored in a JSON file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        """``{"synced_at": ..., "seen_ids": {...}}`` per key."""
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    self._entries = {
+                        key: {"synced_at": entry["synced_at"], "seen_ids": set(entry["seen_ids"])}
+                        for key, entry in data.items()
+                    }
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Ignoring unreadable sync cursor {self.path}; the next sync is a full one")
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cursor for ``key``, or None if it was never synced."""
+        with self._lock:
+            return self.entries.get(key)
+
+    def update(self, key: str, synced_at: str, ids: Iterable[str], full: bool = False):
+        """Record a complete sync of ``key`` that started at ``synced_at``.
+
+        ``ids`` are added to those already seen, unless this was a ``full``
+        sync, which replaces them.
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            seen = set() if full or entry is None else entry["seen_ids"]
+            seen.update(ids)
+            self.entries[key] = {"synced_at": synced_at, "seen_ids": seen}
+
+    def save(self):
+        """Write the cursors to disk."""
+        with self._lock:
+            data = {
+                key: {"synced_at": entry["synced_at"], "seen_ids": sorted(entry["seen_ids"])}
+                for key, entry in self.entries.items()
+            }
+            with atomic_open(self.path, encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
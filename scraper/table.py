@@ -0,0 +1,279 @@
+"""Columnar storage for scraped concerts.
+
+``ConcertTable`` keeps concerts as pandas columns instead of a list of
+``Concert`` objects, with venue, town and source stored as categoricals.
+Rows can be appended one at a time (as ``Concert`` objects or record dicts)
+and are buffered in per-column lists until a vectorized operation needs the
+frame, and pandas itself is only imported at that point, so scrapers can
+emit into a table without paying for it. The table also iterates as
+``Concert`` objects, so code written against ``List[Concert]`` keeps
+working.
+"""
+
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from scraper.keywords import KeywordMatcher, get_matcher
+from scraper.writers import FIELDS, atomic_open, format_sources
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = FIELDS
+CATEGORICAL_COLUMNS = {"venue", "town", "source"}
+
+
+def _frame_from_columns(columns: Dict[str, list]) -> "pd.DataFrame":
+    import pandas as pd
+
+    data = {}
+    for column in COLUMNS:
+        values = columns[column]
+        if column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Categorical(values)
+        else:
+            # A Series, not np.array: list values (sources) must stay one object per row
+            data[column] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data)
+
+
+def _concat(frames: List["pd.DataFrame"]) -> "pd.DataFrame":
+    """Concatenate frames, merging categories instead of falling back to object."""
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return _frame_from_columns({column: [] for column in COLUMNS})
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    data = {}
+    for column in COLUMNS:
+        if column in CATEGORICAL_COLUMNS:
+            data[column] = union_categoricals([f[column] for f in frames], ignore_order=True)
+        else:
+            data[column] = np.concatenate([f[column].to_numpy(dtype=object) for f in frames])
+    return pd.DataFrame(data)
+
+
+class ConcertTable:
+    """Concerts stored column-wise, with vectorized filters and counts."""
+
+    def __init__(self, frame: "pd.DataFrame" = None):
+        self._frame = frame
+        self._pending: Dict[str, list] = {column: [] for column in COLUMNS}
+        self._pending_rows = 0
+
+    @classmethod
+    def from_concerts(cls, concerts: Iterable) -> "ConcertTable":
+        """Build a table from ``Concert`` objects or record dicts."""
+        if isinstance(concerts, ConcertTable):
+            return concerts
+        table = cls()
+        table.extend(concerts)
+        return table
+
+    # -- Appending ----------------------------------------------------------
+
+    def append(self, row: Union[Dict, object]):
+        """Append one concert, given as a ``Concert`` or a record dict."""
+        from scraper.base_scraper import batch_timestamp  # base_scraper imports this module
+
+        pending = self._pending
+        if isinstance(row, dict):
+            for column in COLUMNS:
+                pending[column].append(row.get(column))
+        else:
+            for column in COLUMNS:
+                pending[column].append(getattr(row, column))
+        if pending["scraped_at"][-1] is None:
+            pending["scraped_at"][-1] = batch_timestamp()
+        self._pending_rows += 1
+
+    def extend(self, rows: Union["ConcertTable", "pd.DataFrame", Iterable]):
+        """Append many concerts: another table, a frame, or an iterable of rows."""
+        # Only look for a DataFrame if pandas is loaded; otherwise rows cannot be one
+        pd = sys.modules.get("pandas")
+        if isinstance(rows, ConcertTable):
+            self._frame = _concat([self.frame, rows.frame])
+        elif pd is not None and isinstance(rows, pd.DataFrame):
+            self._frame = _concat([self.frame, ConcertTable(rows.reindex(columns=COLUMNS)).frame])
+        else:
+            for row in rows:
+                self.append(row)
+
+    @property
+    def frame(self) -> "pd.DataFrame":
+        """The concerts as a DataFrame, including rows appended since the last access."""
+        if self._frame is None or self._pending_rows:
+            pending = _frame_from_columns(self._pending)
+            self._frame = pending if self._frame is None else _concat([self._frame, pending])
+            self._pending = {column: [] for column in COLUMNS}
+            self._pending_rows = 0
+        return self._frame
+
+    # -- List-like access ---------------------------------------------------
+
+    def __len__(self) -> int:
+        return (0 if self._frame is None else len(self._frame)) + self._pending_rows
+
+    def __iter__(self) -> Iterator:
+        return iter(self.to_concerts())
+
+    def __getitem__(self, index: int):
+        return ConcertTable(self.frame.iloc[[index]]).to_concerts()[0]
+
+    def to_records(self) -> List[Dict]:
+        """Return the concerts as ``Concert.to_dict()``-style dicts."""
+        frame = self.frame.astype(object)
+        return frame.where(frame.notna(), None).to_dict("records")
+
+    def iter_records(self, chunk_size: int = 10_000) -> Iterator[Dict]:
+        """Yield the records a chunk at a time, without converting the whole table.
+
+        Rows still buffered since the last frame access are read straight from
+        the column lists, so a table that was only appended to is streamed
+        without building a DataFrame or importing pandas.
+        """
+        frame = self._frame
+        if frame is not None:
+            for start in range(0, len(frame), chunk_size):
+                yield from ConcertTable(frame.iloc[start : start + chunk_size]).to_records()
+        pending = self._pending
+        for row in range(self._pending_rows):
+            yield {column: pending[column][row] for column in COLUMNS}
+
+    def to_concerts(self) -> List:
+        """Return the concerts as ``Concert`` objects."""
+        from scraper.base_scraper import Concert  # base_scraper imports this module
+
+        return [Concert(**record) for record in self.to_records()]
+
+    # -- Vectorized operations ----------------------------------------------
+
+    def _take(self, mask) -> "ConcertTable":
+        return ConcertTable(self.frame[mask].reset_index(drop=True))
+
+    def filter_keywords(
+        self,
+        keywords: Union[KeywordMatcher, Sequence[str]],
+        fields: Sequence[str] = ("title", "description"),
+    ) -> "ConcertTable":
+        """Return the concerts whose given fields mention any keyword."""
+        matcher = keywords if isinstance(keywords, KeywordMatcher) else get_matcher(tuple(keywords))
+        frame = self.frame
+        text = frame[fields[0]].astype(object).fillna("").astype(str)
+        for field in fields[1:]:
+            text = text + " " + frame[field].astype(object).fillna("").astype(str)
+        return self._take(text.str.lower().str.contains(matcher.pattern, regex=True).to_numpy())
+
+    def normalize_dates(self, normalizer=None):
+        """Fill the ``start`` and ``end`` columns by parsing each concert's ``date``.
+
+        Returns the ``scraper.dates.DateNormalizer`` used, whose ``stats``
+        count parsed, missing and unparseable dates per source.
+        """
+        import pandas as pd
+
+        from scraper.dates import DateNormalizer
+
+        normalizer = normalizer or DateNormalizer()
+        frame = self.frame
+        starts, ends = normalizer.normalize_values(
+            frame["date"].to_numpy(dtype=object),
+            frame["source"].to_numpy(dtype=object),
+            frame["scraped_at"].to_numpy(dtype=object),
+        )
+        self._frame = frame.assign(
+            start=pd.Series(starts, index=frame.index, dtype=object),
+            end=pd.Series(ends, index=frame.index, dtype=object),
+        )
+        return normalizer
+
+    def geocode(self, geocoder=None):
+        """Fill missing ``latitude`` and ``longitude`` from each concert's venue, address and town.
+
+        Coordinates a source already gave are kept and counted as precision
+        ``source``. Returns the ``scraper.geocoder.Geocoder`` used, whose
+        ``stats`` count rows by precision; call its ``save()`` to persist its
+        cache.
+        """
+        import pandas as pd
+
+        from scraper.geocoder import Geocoder
+
+        geocoder = geocoder or Geocoder()
+        frame = self.frame
+        missing = (frame["latitude"].isna() | frame["longitude"].isna()).to_numpy()
+        if not missing.all():
+            geocoder.stats["source"] += int((~missing).sum())
+        if not missing.any():
+            return geocoder
+        rows = frame[missing]
+        latitudes, longitudes = geocoder.geocode_values(
+            rows["venue"].to_numpy(dtype=object),
+            rows["address"].to_numpy(dtype=object),
+            rows["town"].to_numpy(dtype=object),
+        )
+        latitude = frame["latitude"].astype(object).copy()
+        longitude = frame["longitude"].astype(object).copy()
+        latitude[missing] = pd.Series(latitudes, index=rows.index, dtype=object)
+        longitude[missing] = pd.Series(longitudes, index=rows.index, dtype=object)
+        self._frame = frame.assign(latitude=latitude, longitude=longitude)
+        return geocoder
+
+    def dates(self) -> "pd.Series":
+        """Return each concert's start as local wall-clock time, or NaT.
+
+        Uses the normalized ``start`` where there is one, else the ``date``
+        column if it is ISO 8601. Offsets are dropped. Concerts share a few
+        hundred distinct starts, so each distinct value is parsed once.
+        """
+        import numpy as np
+        import pandas as pd
+
+        frame = self.frame
+        text = frame["start"].astype(object).where(frame["start"].notna(), frame["date"].astype(object))
+        codes, uniques = pd.factorize(text.to_numpy(dtype=object))
+        parsed = pd.to_datetime(
+            pd.Series(uniques, dtype=object).astype(str).str.slice(0, 19), errors="coerce", format="ISO8601"
+        )
+        # Code -1 (missing) takes the NaT appended after the parsed values
+        values = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT"))[codes]
+        return pd.Series(values, index=frame.index)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "ConcertTable":
+        """Return the concerts dated within ``[start, end)``; either bound may be omitted."""
+        import pandas as pd
+
+        dates = self.dates()
+        mask = dates.notna()
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= dates < pd.Timestamp(end)
+        return self._take(mask.to_numpy())
+
+    def count_by(self, *columns: str) -> "pd.Series":
+        """Count concerts per value of one or more columns, largest first."""
+        counts = self.frame.groupby(list(columns), observed=True).size()
+        return counts.sort_values(ascending=False, kind="stable")
+
+    # -- Output -------------------------------------------------------------
+
+    def save(self, json_path: str, csv_path: str):
+        """Write the concerts to JSON and CSV, replacing each file atomically."""
+        with atomic_open(json_path) as f:
+            json.dump(self.to_records(), f, indent=2)
+        logger.info(f"Saved {len(self)} concerts to {json_path}")
+
+        frame = self.frame.assign(sources=self.frame["sources"].map(format_sources))
+        with atomic_open(csv_path, newline="") as f:
+            frame.to_csv(f, index=False)
+        logger.info(f"Saved {len(self)} concerts to {csv_path}")
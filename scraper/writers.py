@@ -0,0 +1,142 @@
+"""Streaming JSON Lines, JSON and CSV writers with atomic replace.
+
+Concerts are encoded one at a time, so memory use does not grow with the
+number of events, and only the standard library is needed. Each file is
+written to a temporary file in the same directory, fsynced and then renamed
+over the destination, so readers see either the previous complete file or
+the new one, never a partial write.
+"""
+
+import csv
+import json
+import logging
+import os
+import tempfile
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+FIELDS = [
+    "title",
+    "venue",
+    "town",
+    "date",
+    "start",
+    "end",
+    "url",
+    "description",
+    "address",
+    "latitude",
+    "longitude",
+    "source",
+    "scraped_at",
+    "sources",
+]
+
+
+@contextmanager
+def atomic_open(path: Union[str, Path], mode: str = "w", **kwargs) -> Iterator:
+    """Open a temporary file that replaces ``path`` when the block exits cleanly.
+
+    If the block raises, the temporary file is removed and ``path`` is left
+    untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename by syncing its directory, where the platform allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _as_record(concert) -> Dict:
+    return concert if isinstance(concert, dict) else concert.to_dict()
+
+
+def format_sources(sources: Optional[List[Dict]]) -> Optional[str]:
+    """Flatten a merged event's provenance into one CSV cell."""
+    if not sources:
+        return None
+    return "; ".join(f"{s.get('source')} <{s.get('url') or ''}>" for s in sources)
+
+
+def _write_json_item(f, record: Dict, first: bool):
+    """Write one element of a pretty-printed JSON array, as ``json.dump(..., indent=2)`` would."""
+    f.write("[\n  " if first else ",\n  ")
+    f.write(json.dumps(record, indent=2).replace("\n", "\n  "))
+
+
+def write_concerts(
+    concerts: Iterable,
+    jsonl_path: str = None,
+    csv_path: str = None,
+    json_path: str = None,
+    fields: List[str] = FIELDS,
+) -> int:
+    """Stream concerts to JSON Lines, CSV and/or a JSON array in a single pass.
+
+    ``concerts`` may be any iterable of ``Concert`` objects or record dicts,
+    including a generator. ``fields`` are the CSV columns. Returns the number
+    of concerts written.
+    """
+    count = 0
+    with ExitStack() as stack:
+        jsonl_file = stack.enter_context(atomic_open(jsonl_path, encoding="utf-8")) if jsonl_path else None
+        json_file = stack.enter_context(atomic_open(json_path, encoding="utf-8")) if json_path else None
+        csv_writer = None
+        if csv_path:
+            csv_file = stack.enter_context(atomic_open(csv_path, newline="", encoding="utf-8"))
+            csv_writer = csv.DictWriter(csv_file, fieldnames=fields, extrasaction="ignore")
+            csv_writer.writeheader()
+
+        for concert in concerts:
+            record = _as_record(concert)
+            if jsonl_file is not None:
+                jsonl_file.write(json.dumps(record))
+                jsonl_file.write("\n")
+            if json_file is not None:
+                _write_json_item(json_file, record, first=not count)
+            if csv_writer is not None:
+                if record.get("sources"):
+                    record = {**record, "sources": format_sources(record["sources"])}
+                csv_writer.writerow(record)
+            count += 1
+
+        if json_file is not None:
+            json_file.write("\n]" if count else "[]")
+
+    for path in (jsonl_path, json_path, csv_path):
+        if path:
+            logger.info(f"Saved {count} concerts to {path}")
+    return count
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """Yield the records of a JSON Lines file one at a time."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
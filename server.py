@@ -0,0 +1,44 @@
+"""Serve saved concerts over HTTP for the frontend, read-only.
+
+Examples:
+    python server.py
+    python server.py --port 8080 --dataset data/concerts.jsonl
+    curl 'http://127.0.0.1:8000/concerts?town=Cambridge&since=2025-06-01&until=2025-06-30&limit=20'
+"""
+
+import argparse
+import logging
+
+from scraper import config
+from scraper.server import ConcertServer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve concerts saved by main.py from in-memory indexes")
+    parser.add_argument("--host", default=config.SERVER_HOST, help=f"Address to bind (default: {config.SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT, help=f"Port (default: {config.SERVER_PORT})")
+    parser.add_argument(
+        "--dataset",
+        default=config.CONCERTS_JSON,
+        help=f"Saved concerts, JSON or JSON Lines; reloaded when rewritten (default: {config.CONCERTS_JSON})",
+    )
+    args = parser.parse_args()
+
+    server = ConcertServer((args.host, args.port), args.dataset)
+    logger.info(f"Serving {len(server.index)} concerts on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 """Tests for the base scraper functionality."""
 
 import json
+from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from scraper.base_scraper import BaseScraper, Concert
+from scraper.base_scraper import BaseScraper, Concert, batch_timestamp, start_batch
 from scraper.config import CHILD_FRIENDLY_KEYWORDS
 
 
@@ -92,6 +93,35 @@ def test_concert_to_dict():
     assert "scraped_at" in concert_dict
 
 
+@pytest.fixture
+def fresh_batch(monkeypatch):
+    """Start with no open batch, and restore whatever batch was open afterwards."""
+    monkeypatch.setattr("scraper.base_scraper._batch_timestamp", None)
+
+
+def test_concerts_share_batch_timestamp(fresh_batch):
+    """Test that scraped_at comes from the current batch, not a clock read per concert."""
+    start_batch(datetime(2025, 1, 2, 3, 4, 5))
+    first = Concert(title="A", venue="V", town="Boston", date="")
+    second = Concert(title="B", venue="V", town="Boston", date="")
+
+    assert first.scraped_at == second.scraped_at == "2025-01-02T03:04:05"
+    assert batch_timestamp() == "2025-01-02T03:04:05"
+
+    start_batch(datetime(2025, 2, 1))
+    assert Concert(title="C", venue="V", town="Boston", date="").scraped_at == "2025-02-01T00:00:00"
+    assert Concert(title="D", venue="V", town="Boston", date="", scraped_at="x").scraped_at == "x"
+
+
+def test_concert_is_slotted():
+    """Test that concerts carry no per-instance __dict__."""
+    concert = Concert(title="A", venue="V", town="Boston", date="")
+
+    assert not hasattr(concert, "__dict__")
+    with pytest.raises(AttributeError):
+        concert.unknown = 1
+
+
 def test_scraper_scrape():
     """Test scraper returns concerts."""
     scraper = MockScraper()
@@ -175,3 +205,19 @@ def test_empty_scraper_save(tmp_path, caplog):
 
     finally:
         config.CONCERTS_JSON = original_json
+
+
+def test_save_results_streaming(tmp_path, monkeypatch):
+    """Test that streaming mode writes JSON Lines and CSV."""
+    from scraper import config
+
+    monkeypatch.setattr(config, "CONCERTS_JSONL", str(tmp_path / "concerts.jsonl"))
+    monkeypatch.setattr(config, "CONCERTS_CSV", str(tmp_path / "concerts.csv"))
+
+    scraper = MockScraper()
+    scraper.scrape()
+    scraper.save_results(streaming=True)
+
+    lines = (tmp_path / "concerts.jsonl").read_text().splitlines()
+    assert [json.loads(line)["title"] for line in lines][0] == "Kids Rock Concert"
+    assert len(pd.read_csv(tmp_path / "concerts.csv")) == 3
@@ -0,0 +1,76 @@
+"""Tests for Boston.gov pagination."""
+
+import threading
+
+import requests
+
+from scraper.boston_events_scraper import BostonEventsScaper
+
+
+def make_records(page, count=2):
+    """Build event records unique to a page."""
+    return [
+        {
+            "title": f"Event {page}-{i}",
+            "venue": "City Hall Plaza",
+            "town": "Boston",
+            "date": "",
+            "url": f"https://www.boston.gov/event-{page}-{i}",
+            "description": "",
+            "source": "Boston.gov",
+        }
+        for i in range(count)
+    ]
+
+
+class FakePagesScraper(BostonEventsScaper):
+    """Boston.gov scraper serving canned pages instead of fetching."""
+
+    def __init__(self, pages, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = pages
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def _page_records(self, page):
+        with self.lock:
+            self.requested.append(page)
+        result = self.pages(page)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_follows_pages_until_empty():
+    """Test that pagination goes past page 3 and stops at the first empty page."""
+    scraper = FakePagesScraper(lambda page: make_records(page) if page < 7 else [], page_window=3)
+
+    concerts = scraper.scrape()
+
+    assert len(concerts) == 14
+    assert max(scraper.requested) < 7 + 3
+
+
+def test_stops_when_page_repeats_seen_events():
+    """Test that a page with only already-seen events ends pagination."""
+    scraper = FakePagesScraper(lambda page: make_records(min(page, 2)), page_window=2)
+
+    concerts = scraper.scrape()
+
+    assert len(concerts) == 6
+    assert max(scraper.requested) < 3 + 2
+
+
+def test_failed_page_does_not_lose_earlier_pages():
+    """Test that a request error ends pagination but keeps events found so far."""
+
+    def pages(page):
+        if page == 1:
+            return requests.ConnectionError("boom")
+        return make_records(page) if page < 4 else []
+
+    scraper = FakePagesScraper(pages, page_window=1)
+
+    concerts = scraper.scrape()
+
+    assert [c.title for c in concerts] == ["Event 0-0", "Event 0-1"]
@@ -0,0 +1,158 @@
+"""Tests for the aggregate cube."""
+
+import pytest
+
+from scraper.cube import AggregateCube
+
+
+def listing(eid, town="Somerville", start="2025-06-14T10:00:00-04:00", source="Boston.gov", title="Kids concert"):
+    return {"event_id": eid, "title": title, "venue": "Hall", "town": town, "start": start, "source": source}
+
+
+@pytest.fixture
+def cube(tmp_path):
+    cube = AggregateCube(str(tmp_path / "cube"))
+    cube.update(
+        [
+            listing("a"),
+            listing("b", start="2025-07-01T10:00:00-04:00"),
+            listing("c", title="Jazz night"),
+            listing("d", town="Cambridge", source="Eventbrite"),
+            listing("e", start=None),
+        ]
+    )
+    return cube
+
+
+def test_count_and_group(cube):
+    """Test counts with any combination of filters and grouping."""
+    assert cube.count() == 5
+    assert cube.count(town="Somerville") == 4
+    assert cube.count(town="Somerville", child_friendly=True, month="2025-06") == 1
+    assert cube.count(town="Boston") == 0
+    assert cube.group(["month"], town="Somerville", child_friendly=True) == {
+        (None,): 1,
+        ("2025-06",): 1,
+        ("2025-07",): 1,
+    }
+    assert cube.group(["source", "town"]) == {("Boston.gov", "Somerville"): 4, ("Eventbrite", "Cambridge"): 1}
+
+
+def test_update_moves_only_changed_events(cube):
+    """Test that a changed event moves cells and an unchanged one is left alone."""
+    result = cube.update([listing("a"), listing("b", town="Cambridge"), listing("f")])
+
+    assert (len(result.added), len(result.updated), result.unchanged) == (1, 1, 1)
+    assert cube.count() == 6
+    assert cube.count(town="Cambridge") == 2
+    assert cube.count(town="Somerville", month="2025-07") == 0
+
+
+def test_remove(cube):
+    """Test that removed events leave every rollup."""
+    assert cube.remove(["a", "d", "missing"]) == 2
+    assert cube.count() == 3
+    assert cube.group(["town"]) == {("Somerville",): 3}
+    assert cube.count(town="Somerville", month="2025-06", child_friendly=True) == 0
+
+
+def test_save_and_reload(cube, tmp_path):
+    """Test that a reloaded cube has the same counts and keeps updating incrementally."""
+    cube.save()
+    reloaded = AggregateCube(str(tmp_path / "cube"))
+
+    assert reloaded.group(["town", "child_friendly"]) == cube.group(["town", "child_friendly"])
+    result = reloaded.update([listing("a"), listing("c", title="Family jazz")])
+    assert (len(result.added), len(result.updated), result.unchanged) == (0, 1, 1)
+    assert reloaded.count(child_friendly=True) == 5
+
+
+def test_incremental_matches_rebuild(cube, tmp_path):
+    """Test that incremental updates give the same counts as recounting the final events."""
+    final = [listing("a", town="Boston"), listing("b"), listing("c"), listing("d", source="Eventbrite", town="Cambridge")]
+    cube.update(final)
+    cube.remove(["e"])
+
+    rebuilt = AggregateCube(str(tmp_path / "other"))
+    rebuilt.rebuild(final)
+    for by in (["town"], ["month", "source"], ["town", "month", "source", "venue", "child_friendly"]):
+        assert cube.group(by) == rebuilt.group(by)
+
+
+def test_unknown_dimension(cube):
+    """Test that an unknown dimension is rejected."""
+    with pytest.raises(ValueError):
+        cube.count(neighborhood="Davis Square")
+
+
+def test_membership_log(cube, tmp_path):
+    """Test that saves append only changes, a crashed run's tail is ignored, and the log compacts."""
+    cube.save()
+    log = tmp_path / "cube" / "members.jsonl"
+    assert len(log.read_text().splitlines()) == 5
+
+    cube.update([listing("a", town="Cambridge"), listing("c", title="Jazz night")])
+    cube.save()
+    assert len(log.read_text().splitlines()) == 6
+
+    with open(log, "a") as f:
+        f.write('["z", "Boston", null, null, null, false]\n')  # Counts never saved
+    reloaded = AggregateCube(str(tmp_path / "cube"))
+    assert "z" not in reloaded.members
+    assert reloaded.members["a"][0] == "Cambridge"
+
+    reloaded.remove(["a", "b", "c", "d"])
+    reloaded.save()
+    assert len(log.read_text().splitlines()) == 1
+    assert AggregateCube(str(tmp_path / "cube")).group(["town"]) == {("Somerville",): 1}
+
+
+def test_main_counts_every_listing(tmp_path, monkeypatch):
+    """Test that main.py --cube counts listings the child-friendly filter drops, and keeps them on rerun."""
+    import main
+    from scraper import config
+    from scraper.base_scraper import BaseScraper, Concert
+
+    class MockScraper(BaseScraper):
+        def scrape(self):
+            for title in ("Kids concert", "Jazz night"):
+                self.concerts.append(
+                    Concert(title=title, venue="Hall", town="Somerville", date="2025-06-14", source="Boston.gov")
+                )
+            return self.concerts
+
+    monkeypatch.setattr("scraper.expanded_mock_scraper.ExpandedMockScraper", MockScraper)
+    monkeypatch.setattr("scraper.base_scraper._batch_timestamp", None)
+    monkeypatch.setattr(config, "GEOCODE_ENABLED", False)
+    monkeypatch.setattr(config, "CUBE_DIR", str(tmp_path / "cube"))
+    monkeypatch.setattr(config, "CUBE_LISTINGS_DIR", str(tmp_path / "cube" / "listings"))
+    for name in ("CONCERTS_JSON", "CONCERTS_JSONL", "CONCERTS_CSV"):
+        monkeypatch.setattr(main, name, str(tmp_path / name.lower()))
+    monkeypatch.setattr("sys.argv", ["main.py", "--use-mock", "--cube"])
+
+    main.main()
+    main.main()
+
+    cube = AggregateCube(str(tmp_path / "cube"))
+    assert cube.group(["child_friendly"]) == {(False,): 1, (True,): 1}
+
+
+def test_sync_recounts_after_dataset_changed_without_it(tmp_path):
+    """Test that the cube recounts when the dataset moved on without it, even at the same size."""
+    from scraper.dataset import Dataset
+
+    dataset = Dataset(str(tmp_path / "listings"))
+    cube = AggregateCube(str(tmp_path / "cube"))
+    cube.sync(dataset, [listing("a", title="Kids concert"), listing("b", title="Family concert")])
+    cube.save()
+    version = dataset.version
+
+    # Upserted without the cube: b moves town, so the number of listings is unchanged
+    Dataset(str(tmp_path / "listings")).upsert([listing("b", title="Family concert", town="Cambridge")])
+
+    cube = AggregateCube(str(tmp_path / "cube"))
+    assert cube.dataset_version == version
+    cube.sync(Dataset(str(tmp_path / "listings")), [listing("a", title="Kids concert")])
+
+    assert cube.group(["town"]) == {("Cambridge",): 1, ("Somerville",): 1}
+    assert cube.dataset_version == Dataset(str(tmp_path / "listings")).version
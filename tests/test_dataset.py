@@ -0,0 +1,109 @@
+"""Tests for the incremental upsert dataset."""
+
+import json
+
+from scraper.dataset import Dataset, event_id
+
+
+def record(title, source="Boston.gov", **fields):
+    return {
+        "title": title,
+        "venue": "City Hall Plaza",
+        "town": "Boston",
+        "date": "2025-06-01T10:00:00",
+        "url": f"https://www.boston.gov/{title.lower().replace(' ', '-')}",
+        "description": "",
+        "address": None,
+        "source": source,
+        **fields,
+    }
+
+
+def test_event_id_is_stable_under_normalization():
+    """Test that case, whitespace, trailing slashes and scraped_at do not change the ID."""
+    a = record("Kids Concert", scraped_at="2025-01-01")
+    b = dict(a, title="  kids   CONCERT ", url=a["url"] + "/", scraped_at="2025-02-01")
+
+    assert event_id(a) == event_id(b)
+    assert event_id(a) != event_id(dict(a, date="2025-06-02T10:00:00"))
+
+
+def test_rerun_of_one_source_keeps_others(tmp_path):
+    """Test that a single-source rerun upserts without losing other sources."""
+    dataset = Dataset(str(tmp_path))
+    dataset.upsert([record("Kids Concert"), record("Story Songs", source="Boston Public Library")], seen_at="t1")
+
+    result = Dataset(str(tmp_path)).upsert([record("Kids Concert")], seen_at="t2")
+
+    assert (len(result.added), len(result.updated), result.unchanged) == (0, 0, 1)
+    records = {r["title"]: r for r in Dataset(str(tmp_path)).records()}
+    assert set(records) == {"Kids Concert", "Story Songs"}
+    assert records["Kids Concert"]["first_seen"] == "t1"
+    assert records["Kids Concert"]["last_seen"] == "t2"
+    assert records["Story Songs"]["last_seen"] == "t1"
+
+
+def test_unchanged_records_are_not_rewritten(tmp_path):
+    """Test that only new or changed events are appended to the log."""
+    dataset = Dataset(str(tmp_path))
+    dataset.upsert([record("A"), record("B")], seen_at="t1")
+    dataset.upsert([record("A"), record("B", description="Now with puppets")], seen_at="t2")
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+
+    assert [json.loads(line)["title"] for line in lines] == ["A", "B", "B"]
+    current = {r["title"]: r for r in dataset.records()}
+    assert current["B"]["description"] == "Now with puppets"
+
+
+def test_event_merged_into_another_is_removed(tmp_path):
+    """Test that a listing stored on its own is dropped once deduplication merges it into another event."""
+    dataset = Dataset(str(tmp_path))
+    alone = record("Kids Concert", source="Time Out Boston")
+    dataset.upsert([alone, record("B")], seen_at="t1")
+
+    sources = [{"source": "Boston.gov"}, {"source": "Time Out Boston", "event_id": event_id(alone)}]
+    result = dataset.upsert([record("Kids Concert", sources=sources)], seen_at="t2")
+
+    assert result.removed == [event_id(alone)]
+    assert [r["source"] for r in Dataset(str(tmp_path)).records() if r["title"] == "Kids Concert"] == ["Boston.gov"]
+    assert len(dataset) == 2
+
+
+def test_log_is_compacted(tmp_path):
+    """Test that superseded versions are dropped once they pile up."""
+    dataset = Dataset(str(tmp_path))
+    for i in range(5):
+        dataset.upsert([record("A", description=f"v{i}")], seen_at=f"t{i}")
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+
+    assert len(lines) <= 2
+    assert [r["description"] for r in dataset.records()] == ["v4"]
+
+
+def test_export(tmp_path):
+    """Test exporting the dataset with its bookkeeping fields."""
+    dataset = Dataset(str(tmp_path / "dataset"))
+    dataset.upsert([record("A")], seen_at="t1")
+
+    dataset.export(json_path=str(tmp_path / "concerts.json"), csv_path=str(tmp_path / "concerts.csv"))
+
+    exported = json.loads((tmp_path / "concerts.json").read_text())
+    assert exported[0]["event_id"] == event_id(record("A"))
+    assert exported[0]["last_seen"] == "t1"
+    assert (tmp_path / "concerts.csv").read_text().startswith("event_id,title,")
+
+
+def test_version_changes_only_with_content(tmp_path):
+    """Test that the version token survives a reload and changes only when an event does."""
+    dataset = Dataset(str(tmp_path))
+    assert dataset.version is None
+    dataset.upsert([record("A")], seen_at="t1")
+    version = Dataset(str(tmp_path)).version
+
+    Dataset(str(tmp_path)).upsert([record("A")], seen_at="t2")
+    assert Dataset(str(tmp_path)).version == version
+
+    Dataset(str(tmp_path)).upsert([record("A", description="Now with puppets")], seen_at="t3")
+    assert Dataset(str(tmp_path)).version not in (None, version)
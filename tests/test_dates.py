@@ -0,0 +1,86 @@
+"""Tests for date normalization."""
+
+from datetime import datetime
+
+import pytest
+
+from scraper.dates import DateNormalizer
+from scraper.table import ConcertTable
+
+SCRAPED = datetime(2025, 6, 1, 9, 0)
+
+
+@pytest.mark.parametrize(
+    "value, start, end",
+    [
+        (
+            "Saturday, June 14, 2025 · 11:00AM - 3:00PM",
+            "2025-06-14T11:00:00-04:00",
+            "2025-06-14T15:00:00-04:00",
+        ),
+        ("Tuesday, June 17, 2025 · 10:30AM", "2025-06-17T10:30:00-04:00", None),
+        ("2025-07-02T10:30:00-04:00", "2025-07-02T10:30:00-04:00", None),
+        ("2025-07-02T14:30:00Z", "2025-07-02T10:30:00-04:00", None),
+        ("2025-06-01T10:00:00", "2025-06-01T10:00:00-04:00", None),
+        ("2025-08-09", "2025-08-09T00:00:00-04:00", "2025-08-10T00:00:00-04:00"),
+        ("Saturday, July 5", "2025-07-05T00:00:00-04:00", "2025-07-06T00:00:00-04:00"),
+        ("Aug 10", "2025-08-10T00:00:00-04:00", "2025-08-11T00:00:00-04:00"),
+        ("Jan 4 10am", "2026-01-04T10:00:00-05:00", None),
+        ("6/14/2025 7pm", "2025-06-14T19:00:00-04:00", None),
+        ("Sept 5, 2025", "2025-09-05T00:00:00-04:00", "2025-09-06T00:00:00-04:00"),
+        ("Friday, Sept. 5 · 7pm", "2025-09-05T19:00:00-04:00", None),
+        ("Jun 14 2025", "2025-06-14T00:00:00-04:00", "2025-06-15T00:00:00-04:00"),
+        ("June 14 2025 10:30am - 12pm", "2025-06-14T10:30:00-04:00", "2025-06-14T12:00:00-04:00"),
+        ("Friday, June 20, 2025 · 10:00PM - 1:00AM", "2025-06-20T22:00:00-04:00", "2025-06-21T01:00:00-04:00"),
+    ],
+)
+def test_parse_formats(value, start, end):
+    parsed_start, parsed_end = DateNormalizer().parse(value, "source", SCRAPED)
+
+    assert parsed_start.isoformat() == start
+    assert (parsed_end.isoformat() if parsed_end else None) == end
+
+
+def test_year_less_date_shortly_past_keeps_this_year():
+    start, _ = DateNormalizer().parse("May 20", "source", SCRAPED)
+    assert start.year == 2025
+
+
+def test_format_is_remembered_per_source():
+    normalizer = DateNormalizer()
+    normalizer.parse("Tuesday, June 17, 2025 · 10:30AM", "Boston.gov", SCRAPED)
+    normalizer.parse("2025-07-02", "Eventbrite", SCRAPED)
+
+    assert normalizer.format_for("Boston.gov") == "long-month"
+    assert normalizer.format_for("Eventbrite") == "iso"
+
+    # A source that switches format is re-detected
+    normalizer.parse("2025-07-03", "Boston.gov", SCRAPED)
+    assert normalizer.format_for("Boston.gov") == "iso"
+
+
+def test_stats_count_missing_and_unparseable():
+    normalizer = DateNormalizer()
+    for value in ("2025-07-02", "", None, "Every other Sunday"):
+        normalizer.parse(value, "Time Out Boston", SCRAPED)
+
+    assert normalizer.stats["Time Out Boston"] == {"parsed": 1, "missing": 2, "unparseable": 1}
+    assert normalizer.totals()["unparseable"] == 1
+
+
+def test_table_normalize_dates():
+    table = ConcertTable.from_concerts(
+        [
+            {"title": "A", "date": "Saturday, July 5", "source": "BPL", "scraped_at": "2025-06-01T09:00:00"},
+            {"title": "B", "date": "", "source": "Time Out Boston", "scraped_at": "2025-06-01T09:00:00"},
+        ]
+    )
+
+    normalizer = table.normalize_dates()
+    records = table.to_records()
+
+    assert records[0]["start"] == "2025-07-05T00:00:00-04:00"
+    assert records[0]["end"] == "2025-07-06T00:00:00-04:00"
+    assert records[1]["start"] is None
+    assert normalizer.totals() == {"parsed": 1, "missing": 1}
+    assert str(table.dates()[0]) == "2025-07-05 00:00:00"
@@ -0,0 +1,138 @@
+"""Tests for cross-source deduplication."""
+
+from scraper.dataset import event_id
+from scraper.dedup import Deduplicator, deduplicate, normalize_title, normalize_venue
+
+
+def listing(title, venue, source, date="2025-06-14T10:00:00", town="Boston", **fields):
+    return {
+        "title": title,
+        "venue": venue,
+        "town": town,
+        "date": date,
+        "url": f"https://{source.lower().replace(' ', '')}.example/{len(title)}",
+        "description": "",
+        "address": None,
+        "source": source,
+        **fields,
+    }
+
+
+def test_normalization():
+    """Test that case, punctuation, filler words and town names are ignored."""
+    assert normalize_title("The Kids' Rock Concert @ the Hall!") == "kids rock concert hall"
+    assert normalize_title("Songs & Stories") == normalize_title("Songs and Stories")
+    assert normalize_venue("Boston Symphony Hall") == normalize_venue("Symphony Hall") == "symphony hall"
+
+
+def test_merges_same_concert_across_sources():
+    """Test that listings of one concert merge with the best fields and full provenance."""
+    records = [
+        listing("Family Concert: Peter and the Wolf", "Symphony Hall", "Time Out Boston", date="2025-06-14"),
+        listing(
+            "Family Concert - Peter & the Wolf",
+            "Boston Symphony Hall",
+            "Eventbrite",
+            address="301 Massachusetts Ave",
+            description="An orchestral story for young listeners, narrated live.",
+        ),
+        listing("Jazz for Toddlers", "Symphony Hall", "Eventbrite"),
+    ]
+
+    merged = deduplicate(records)
+
+    assert len(merged) == 2
+    concert = merged[0]
+    assert concert["source"] == "Eventbrite"
+    assert concert["venue"] == "Boston Symphony Hall"
+    assert concert["address"] == "301 Massachusetts Ave"
+    assert concert["date"] == "2025-06-14T10:00:00"
+    assert concert["description"].startswith("An orchestral story")
+    assert [s["source"] for s in concert["sources"]] == ["Eventbrite", "Time Out Boston"]
+    assert all(s["event_id"] for s in concert["sources"])
+    assert merged[1].get("sources") is None
+
+
+def test_title_contained_in_longer_title():
+    """Test that a title with extra words still matches."""
+    records = [
+        listing("Kids Rock Concert", "City Hall Plaza", "Boston.gov"),
+        listing("Kids Rock Concert at City Hall Plaza", "City Hall Plaza", "BostonCentral"),
+    ]
+
+    merged = deduplicate(records)
+
+    assert len(merged) == 1
+    assert merged[0]["title"] == "Kids Rock Concert"
+
+
+def test_different_blocks_and_showtimes_are_kept_apart():
+    """Test that other days, towns, showtimes and venues never merge."""
+    records = [
+        listing("Kids Rock Concert", "Hall", "Boston.gov"),
+        listing("Kids Rock Concert", "Hall", "Eventbrite", date="2025-06-15T10:00:00"),
+        listing("Kids Rock Concert", "Hall", "Eventbrite", town="Cambridge"),
+        listing("Kids Rock Concert", "Hall", "Eventbrite", date="2025-06-14T14:00:00"),
+        listing("Kids Rock Concert", "Robbins Library", "Eventbrite"),
+    ]
+
+    assert len(deduplicate(records)) == 5
+
+
+def test_source_priority_is_configurable():
+    """Test that the highest-priority source provides the merged fields."""
+    records = [
+        listing("Story Songs", "Library", "Boston.gov"),
+        listing("Story Songs!", "Central Library", "Boston Public Library"),
+    ]
+
+    merged = Deduplicator(source_priority=["Boston Public Library", "Boston.gov"]).deduplicate(records)
+
+    assert merged[0]["venue"] == "Central Library"
+
+
+def test_normalized_start_blocks_free_text_dates():
+    """Test that a free-text date and an ISO date of the same showing are merged."""
+    records = [
+        listing(
+            "Family Jazz Brunch",
+            "Regattabar",
+            "Boston.gov",
+            date="Saturday, June 14, 2025 · 10:00AM",
+            start="2025-06-14T10:00:00-04:00",
+        ),
+        listing("Family Jazz Brunch", "Regattabar", "Eventbrite", start="2025-06-14T10:00:00-04:00"),
+    ]
+
+    assert len(deduplicate(records)) == 1
+
+
+def test_merged_record_keeps_top_listing_event_id():
+    """Test that merging does not change the top-priority listing's event ID or start."""
+    boston = listing("Kids Rock Concert", "City Hall Plaza", "Boston.gov", start="2025-06-14T10:00:00-04:00")
+    other = listing(
+        "Kids Rock Concert at City Hall Plaza",
+        "City Hall Plaza, Boston",
+        "BostonCentral",
+        date="Saturday, June 14, 2025 10:00 AM to 11:30 AM",
+        start="2025-06-14T10:00:00-04:00",
+        end="2025-06-14T11:30:00-04:00",
+    )
+
+    merged = Deduplicator(source_priority=["Boston.gov", "BostonCentral"]).deduplicate([other, boston])
+
+    assert len(merged) == 1
+    assert event_id(merged[0]) == event_id(boston)
+    assert (merged[0]["date"], merged[0].get("end")) == (boston["date"], None)
+
+
+def test_undated_listings_merge_only_on_same_url():
+    """Test that listings without a day are not merged on title alone."""
+    records = [
+        listing("Kids Concert", "Hall", "Time Out Boston", date=""),
+        listing("Kids Concert", "Hall", "Boston.com", date=""),
+        listing("Kids Concert", "Hall", "Time Out Boston", date="", url="https://timeout.example/1/"),
+        listing("Kids Concert", "Hall", "Boston.com", date="", url="https://TimeOut.example/1"),
+    ]
+
+    assert len(deduplicate(records)) == 3
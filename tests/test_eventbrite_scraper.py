@@ -0,0 +1,150 @@
+"""Tests for Eventbrite pagination, concurrency and de-duplication."""
+
+import threading
+
+import pytest
+import requests
+
+from scraper.eventbrite_scraper import EventbriteScraper
+from scraper.ratelimit import TokenBucket
+from scraper.sync_cursor import SyncCursor
+
+
+def make_event(event_id, changed="2025-05-01T00:00:00Z"):
+    return {
+        "id": event_id,
+        "changed": changed,
+        "name": {"text": f"Kids Concert {event_id}"},
+        "start": {"local": "2025-06-01T10:00:00"},
+        "url": f"https://www.eventbrite.com/e/{event_id}",
+        "description": {"text": "Family fun"},
+        "venue": {"name": "Club Passim", "address": {"city": "Cambridge", "localized_address_display": "47 Palmer St"}},
+    }
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self.data
+
+
+class FakeApiScraper(EventbriteScraper):
+    """Eventbrite scraper answering searches from canned result pages."""
+
+    def __init__(self, results, **kwargs):
+        super().__init__(rate_limiter=TokenBucket(rate=1000, capacity=100), **kwargs)
+        self.api_key = "test"
+        self.results = results  # term -> list of pages (lists of event IDs), or an exception
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch(self, url, headers=None, params=None):
+        with self.lock:
+            self.calls.append(dict(params))
+        pages = self.results[params["q"]]
+        if isinstance(pages, Exception):
+            raise pages
+        index = int(params.get("continuation", 0))
+        more = index + 1 < len(pages)
+        pagination = {"has_more_items": more, "continuation": str(index + 1) if more else None}
+        events = [make_event(*i) if isinstance(i, tuple) else make_event(i) for i in pages[index]]
+        return FakeResponse({"events": events, "pagination": pagination})
+
+
+def test_follows_every_page():
+    scraper = FakeApiScraper({"kids concert": [["1", "2"], ["3"], ["4"]]}, search_terms=["kids concert"])
+
+    concerts = scraper.scrape()
+
+    assert [c.title for c in concerts] == ["Kids Concert 1", "Kids Concert 2", "Kids Concert 3", "Kids Concert 4"]
+    assert [call.get("continuation") for call in scraper.calls] == [None, "1", "2"]
+    assert concerts[0].town == "Cambridge"
+
+
+def test_events_repeated_across_terms_are_kept_once():
+    scraper = FakeApiScraper(
+        {"kids concert": [["1", "2"], ["3"]], "family concert": [["2", "5"], ["1"]]},
+        search_terms=["kids concert", "family concert"],
+    )
+
+    concerts = scraper.scrape()
+
+    assert sorted(c.url.rsplit("/", 1)[1] for c in concerts) == ["1", "2", "3", "5"]
+
+
+def test_failing_term_keeps_other_terms():
+    scraper = FakeApiScraper(
+        {"kids concert": [["1"]], "family concert": requests.ConnectionError("down")},
+        search_terms=["kids concert", "family concert"],
+    )
+
+    assert len(scraper.scrape()) == 1
+
+
+def test_page_cap():
+    scraper = FakeApiScraper({"kids concert": [[str(i)] for i in range(10)]}, search_terms=["kids concert"], max_pages=3)
+
+    assert len(scraper.scrape()) == 3
+
+
+def test_quota_wait_respects_deadline():
+    scraper = FakeApiScraper({"kids concert": [["1"]]}, search_terms=["kids concert"])
+    scraper.rate_limiter = TokenBucket(rate=0.001, capacity=1)
+    scraper.rate_limiter.acquire()
+    scraper.deadline = 0  # Already passed
+
+    with pytest.raises(requests.Timeout):
+        scraper._wait_for_quota()
+
+
+def test_incremental_sync_requests_only_changes(tmp_path):
+    cursor_path = tmp_path / "cursor.json"
+    first = FakeApiScraper(
+        {"kids concert": [["1", "2"]]}, search_terms=["kids concert"], incremental=True, cursor=SyncCursor(cursor_path)
+    )
+    assert len(first.scrape()) == 2
+    assert "date_modified.range_start" not in first.calls[0]
+
+    # The overlap returns event 1 unchanged; event 2 changed and event 3 is new
+    later = "2999-01-01T00:00:00Z"
+    second = FakeApiScraper(
+        {"kids concert": [["1", ("2", later), "3"]]},
+        search_terms=["kids concert"],
+        incremental=True,
+        cursor=SyncCursor(cursor_path),
+    )
+    concerts = second.scrape()
+
+    assert "date_modified.range_start" in second.calls[0]
+    assert sorted(c.url.rsplit("/", 1)[1] for c in concerts) == ["2", "3"]
+    assert SyncCursor(cursor_path).get("Boston, MA|kids concert")["seen_ids"] == {"1", "2", "3"}
+
+
+def test_full_sync_ignores_cursor(tmp_path):
+    cursor = SyncCursor(tmp_path / "cursor.json")
+    cursor.update("Boston, MA|kids concert", "2999-01-01T00:00:00Z", ["1", "9"])
+    scraper = FakeApiScraper(
+        {"kids concert": [["1", "2"]]}, search_terms=["kids concert"], incremental=True, full_sync=True, cursor=cursor
+    )
+
+    assert len(scraper.scrape()) == 2
+    assert "date_modified.range_start" not in scraper.calls[0]
+    assert cursor.get("Boston, MA|kids concert")["seen_ids"] == {"1", "2"}
+
+
+def test_failed_sync_keeps_cursor(tmp_path):
+    cursor = SyncCursor(tmp_path / "cursor.json")
+    scraper = FakeApiScraper(
+        {"kids concert": requests.ConnectionError("down")}, search_terms=["kids concert"], incremental=True, cursor=cursor
+    )
+
+    scraper.scrape()
+
+    assert SyncCursor(tmp_path / "cursor.json").get("Boston, MA|kids concert") is None
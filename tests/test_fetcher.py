@@ -0,0 +1,267 @@
+"""Tests for the pooled HTTP session layer."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from scraper.base_scraper import BaseScraper
+from scraper.fetcher import HostScheduler, SessionPool, parse_retry_after
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter that answers every request with an empty 200."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def send(self, request, **kwargs):
+        self.calls.append((request, kwargs))
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self):
+        pass
+
+
+def make_pool():
+    """Build a session pool whose sessions use a RecordingAdapter."""
+    pool = SessionPool(
+        host_settings={"slow.example.com": {"read_timeout": 60, "pool_maxsize": 8}},
+        default_settings={"pool_maxsize": 2, "connect_timeout": 5, "read_timeout": 30},
+    )
+    adapter = RecordingAdapter()
+    original = pool._create_session
+
+    def create_session(host):
+        session = original(host)
+        session.mount("https://", adapter)
+        return session
+
+    pool._create_session = create_session
+    return pool, adapter
+
+
+def test_one_session_per_host():
+    """Test that sessions are reused per host and separate across hosts."""
+    pool = SessionPool(host_settings={}, default_settings={"pool_maxsize": 2})
+
+    a = pool.session_for("https://www.boston.gov/events")
+    b = pool.session_for("https://www.boston.gov/events?page=1")
+    c = pool.session_for("https://www.bpl.org/calendar/")
+
+    assert a is b
+    assert a is not c
+
+
+def test_session_headers_and_pool_size():
+    """Test that sessions negotiate compression and size pools per host."""
+    pool = SessionPool(
+        host_settings={"www.boston.gov": {"pool_maxsize": 6}},
+        default_settings={"pool_maxsize": 2},
+    )
+
+    session = pool.session_for("https://www.boston.gov/events")
+
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+    assert session.headers["Connection"] == "keep-alive"
+    assert session.get_adapter("https://www.boston.gov/")._pool_maxsize == 6
+    assert pool.session_for("https://other.example.com/").get_adapter("https://other.example.com/")._pool_maxsize == 2
+
+
+def test_per_host_timeouts():
+    """Test that each host gets its configured timeouts, capped by max_timeout."""
+    pool, adapter = make_pool()
+
+    pool.get("https://fast.example.com/")
+    pool.get("https://slow.example.com/")
+    pool.get("https://slow.example.com/", max_timeout=3)
+
+    timeouts = [kwargs["timeout"] for _, kwargs in adapter.calls]
+    assert timeouts[:2] == [(5, 30), (5, 60)]
+    assert all(2.5 < t <= 3 for t in timeouts[2])
+
+
+def test_scraper_fetch_respects_deadline():
+    """Test that fetching after the scraper's deadline fails fast."""
+
+    class DummyScraper(BaseScraper):
+        def scrape(self):
+            return self.concerts
+
+    scraper = DummyScraper()
+    scraper.deadline = time.monotonic() - 1
+
+    with pytest.raises(requests.Timeout):
+        scraper.fetch("https://www.boston.gov/events")
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Transport adapter that replays statuses (or exceptions) in order."""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.count = 0
+        self.timeouts = []
+
+    def send(self, request, **kwargs):
+        self.count += 1
+        self.timeouts.append(kwargs.get("timeout"))
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeClock:
+    """Clock that only moves when the scheduler sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def make_scheduled_pool(script, **settings):
+    """Build a pool on a fake clock whose requests replay ``script``."""
+    clock = FakeClock()
+    defaults = {"min_interval": 0, "max_retries": 3, "backoff_base": 1.0, "backoff_max": 60, **settings}
+    pool = SessionPool(host_settings={}, default_settings=defaults)
+    pool.scheduler = HostScheduler(pool.settings_for, clock=clock, sleep=clock.sleep, jitter=lambda: 1.0)
+    adapter = ScriptedAdapter(script)
+    pool.session_for("https://api.example.com/").mount("https://", adapter)
+    return pool, adapter, clock
+
+
+def test_retry_after_is_honoured():
+    pool, adapter, clock = make_scheduled_pool([(429, {"Retry-After": "7"}), 200])
+
+    response = pool.get("https://api.example.com/events")
+
+    assert response.status_code == 200
+    assert adapter.count == 2
+    assert clock.sleeps == [7]
+
+
+def test_exponential_backoff_then_gives_up():
+    pool, adapter, clock = make_scheduled_pool([503, 503, 503], max_retries=2)
+
+    response = pool.get("https://api.example.com/events")
+
+    assert response.status_code == 503
+    assert adapter.count == 3
+    # Backoff doubles per attempt; later sleeps also absorb the widened spacing
+    assert clock.sleeps[0] == 1
+    assert clock.sleeps[1] >= 2
+
+
+def test_long_retry_after_is_not_waited_for():
+    pool, adapter, clock = make_scheduled_pool([(429, {"Retry-After": "3600"})], backoff_max=30)
+
+    assert pool.get("https://api.example.com/events").status_code == 429
+    assert adapter.count == 1
+
+
+def test_retries_share_max_timeout():
+    """Test that each attempt's timeout is what is left of max_timeout, and no retry starts once it is spent."""
+    pool, adapter, clock = make_scheduled_pool(
+        [(503, {"Retry-After": "4"}), (503, {"Retry-After": "6"})], connect_timeout=5, read_timeout=30
+    )
+
+    response = pool.get("https://api.example.com/events", max_timeout=10)
+
+    assert response.status_code == 503
+    assert adapter.count == 2
+    assert adapter.timeouts == [(5, 10), (5, 6)]
+    assert clock.now == 4
+
+
+def test_connection_errors_are_retried_then_raised():
+    pool, adapter, _ = make_scheduled_pool([requests.ConnectionError("reset")] * 2, max_retries=1)
+
+    with pytest.raises(requests.ConnectionError):
+        pool.get("https://api.example.com/events")
+    assert adapter.count == 2
+
+
+def test_interval_widens_when_throttled_and_recovers():
+    pool, _, _ = make_scheduled_pool([429, 200] + [200] * 30, min_interval=0.1)
+    scheduler = pool.scheduler
+
+    pool.get("https://api.example.com/events")
+    widened = scheduler.interval("api.example.com")
+    for _ in range(30):
+        pool.get("https://api.example.com/events")
+
+    # Doubled to backoff_base by the 429, then eased once by the successful retry
+    assert widened == pytest.approx(1.0 * HostScheduler.RECOVERY)
+    # Thirty successes bring it back down to min_interval, but not below
+    assert scheduler.interval("api.example.com") == pytest.approx(0.1)
+
+
+def test_requests_are_spaced():
+    pool, _, clock = make_scheduled_pool([200] * 3, min_interval=0.5)
+
+    for _ in range(3):
+        pool.get("https://api.example.com/events")
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_max_in_flight_per_host():
+    """Test that concurrent fetches to one host never exceed max_in_flight."""
+    active, peak, lock = [0], [0], threading.Lock()
+
+    class SlowAdapter(RecordingAdapter):
+        def send(self, request, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return super().send(request, **kwargs)
+
+    pool = SessionPool(host_settings={}, default_settings={"pool_maxsize": 8, "max_in_flight": 2, "min_interval": 0})
+    pool.session_for("https://busy.example.com/").mount("https://", SlowAdapter())
+    threads = [threading.Thread(target=pool.get, args=("https://busy.example.com/",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+
+
+def test_parse_retry_after():
+    now = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Sun, 01 Jun 2025 12:00:30 GMT", now=now) == 30
+    assert parse_retry_after("Sun, 01 Jun 2025 11:00:00 GMT", now=now) == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,61 @@
+"""Tests for gazetteer town resolution."""
+
+from pathlib import Path
+
+from scraper.gazetteer import GAZETTEER, Gazetteer, resolve_town
+from scraper.parsers import extract_boston_central, extract_timeout
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_neighborhoods_map_to_their_town():
+    """Test that neighborhoods resolve to the town that contains them."""
+    assert resolve_town("Open-air concert in Jamaica Plain") == "Boston"
+    assert resolve_town("Davis Square") == "Somerville"
+    assert resolve_town("Kendall Square rooftop") == "Cambridge"
+
+
+def test_town_name_inside_a_word_is_not_matched():
+    """Test that "Newtonville" resolves as a neighborhood, not by its "Newton" prefix."""
+    place = GAZETTEER.locate("Children's Chorus in Newtonville")
+
+    assert place.name == "Newtonville"
+    assert place.kind == "neighborhood"
+    assert resolve_town("Newtonvilleish", default=None) is None
+
+
+def test_most_specific_place_wins():
+    """Test that a venue outranks a town named earlier in the same text."""
+    assert resolve_town("Boston Symphony players at Sanders Theatre") == "Cambridge"
+    assert resolve_town("Somerville kids band, 02138") == "Cambridge"
+
+
+def test_street_names_are_not_towns():
+    """Test that a town used as a street name is skipped."""
+    assert resolve_town("617 Lexington St, Waltham, MA") == "Waltham"
+
+
+def test_first_text_with_a_place_wins():
+    """Test that later texts are only consulted when earlier ones have no place."""
+    assert resolve_town("Main Stage", "Family show in Arlington") == "Arlington"
+    assert resolve_town("Regent Theatre", "Bus from Boston") == "Arlington"
+    assert resolve_town("", None, default="Unknown") == "Unknown"
+
+
+def test_custom_gazetteer():
+    """Test building a gazetteer from custom tables."""
+    gazetteer = Gazetteer(["Medford"], neighborhoods={"Medford": ["West Medford"]})
+
+    assert gazetteer.resolve("West Medford") == "Medford"
+    assert gazetteer.resolve("Boston") is None
+
+
+def test_extractors_use_gazetteer():
+    """Test that extractors resolve neighborhoods and venue names in listings."""
+    timeout = extract_timeout((FIXTURES / "timeout_listing.html").read_bytes(), "utf-8", "https://www.timeout.com")
+    central = extract_boston_central(
+        (FIXTURES / "boston_central_events.html").read_bytes(), "utf-8", "https://www.bostoncentral.com"
+    )
+
+    assert timeout[0]["town"] == "Somerville"
+    assert [r["town"] for r in central] == ["Boston", "Arlington"]
@@ -0,0 +1,111 @@
+"""Tests for offline geocoding."""
+
+import json
+
+from scraper.config import BOSTON_METRO_TOWNS
+from scraper.gazetteer import NEIGHBORHOODS, VENUES, ZIP_CODES
+from scraper.geocoder import (
+    NEIGHBORHOOD_COORDINATES,
+    TOWN_COORDINATES,
+    VENUE_COORDINATES,
+    ZIP_CENTROIDS,
+    Geocoder,
+    address_key,
+)
+from scraper.table import ConcertTable
+
+
+def test_every_gazetteer_place_has_coordinates():
+    """Test that no place the gazetteer can match is missing from the coordinate table."""
+    assert set(BOSTON_METRO_TOWNS) <= set(TOWN_COORDINATES)
+    tables = [(NEIGHBORHOODS, NEIGHBORHOOD_COORDINATES), (ZIP_CODES, ZIP_CENTROIDS), (VENUES, VENUE_COORDINATES)]
+    for table, coordinates in tables:
+        for names in table.values():
+            assert set(names) <= set(coordinates)
+    for latitude, longitude in VENUE_COORDINATES.values():
+        assert 42.2 < latitude < 42.5 and -71.3 < longitude < -71.0
+
+
+def test_address_key_normalizes_spelling():
+    """Test that spellings differing in case, punctuation and abbreviations share a key."""
+    assert address_key("The Sinclair", "52 Church Street, Cambridge, MA", "Cambridge") == address_key(
+        "SINCLAIR", "52 Church St. Cambridge", "cambridge"
+    )
+    assert address_key("Symphony Hall", "301 Massachusetts Avenue", "Boston") == address_key(
+        "Symphony Hall", "301 Mass Ave", "Boston"
+    )
+    assert address_key("Symphony Hall", None, "Boston") != address_key("Symphony Hall", None, "Cambridge")
+
+
+def test_most_specific_place_wins(tmp_path):
+    """Test precision order across venue, address and town."""
+    geocoder = Geocoder(cache_path=str(tmp_path / "geocode.json"))
+
+    assert geocoder.geocode("Sanders Theatre", "45 Quincy St", "Cambridge") == (42.3763, -71.1148, "venue")
+    assert geocoder.geocode("Arlington Unitarian Church", "4 Pleasant St, MA 02476", "Arlington")[2] == "zip"
+    assert geocoder.geocode("Corner Cafe", "Davis Square", "Somerville")[2] == "neighborhood"
+    assert geocoder.geocode("Main Stage", "617 Lexington St", "Waltham") == (42.3765, -71.2356, "town")
+    assert geocoder.geocode("Main Stage", "", "Unknown") is None
+    assert geocoder.stats == {"venue": 1, "zip": 1, "neighborhood": 1, "town": 1, "unresolved": 1}
+
+
+def test_repeated_addresses_are_resolved_once(tmp_path):
+    """Test that an address is looked up once per run and then served from the disk cache."""
+    path = tmp_path / "geocode.json"
+    geocoder = Geocoder(cache_path=str(path))
+    for _ in range(3):
+        geocoder.geocode("Club Passim", "47 Palmer St", "Cambridge")
+    geocoder.geocode("Club Passim", "47 Palmer Street", "Cambridge")
+    geocoder.save()
+
+    assert geocoder.resolved == 1
+    assert geocoder.stats["venue"] == 4
+
+    reloaded = Geocoder(cache_path=str(path))
+    assert reloaded.geocode("club passim", "47 Palmer St.", "Cambridge")[2] == "venue"
+    assert reloaded.resolved == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache keeps the most recently used addresses."""
+    path = tmp_path / "geocode.json"
+    geocoder = Geocoder(cache_path=str(path), max_entries=2)
+    geocoder.geocode("Club Passim", None, "Cambridge")
+    geocoder.geocode("Regent Theatre", None, "Arlington")
+    geocoder.save()
+
+    geocoder = Geocoder(cache_path=str(path), max_entries=2)
+    geocoder.geocode("Club Passim", None, "Cambridge")  # Now the most recently used
+    geocoder.geocode("TD Garden", None, "Boston")
+    geocoder.save()
+
+    entries = json.loads(path.read_text())["entries"]
+    assert list(entries) == [address_key("Club Passim", None, "Cambridge"), address_key("TD Garden", None, "Boston")]
+
+
+def test_stale_cache_is_discarded(tmp_path):
+    """Test that a cache written for a different coordinate table is not used."""
+    path = tmp_path / "geocode.json"
+    key = address_key("TD Garden", None, "Boston")
+    path.write_text(json.dumps({"fingerprint": "old", "entries": {key: [0.0, 0.0, "venue"]}}))
+
+    assert Geocoder(cache_path=str(path)).geocode("TD Garden", None, "Boston") == (42.3662, -71.0621, "venue")
+
+
+def test_table_geocode_keeps_source_coordinates(tmp_path):
+    """Test that the table fills missing coordinates and keeps those a source gave."""
+    table = ConcertTable.from_concerts(
+        [
+            {"title": "A", "venue": "Robbins Library", "town": "Arlington"},
+            {"title": "B", "venue": "Somewhere", "town": "Boston", "latitude": 42.0, "longitude": -71.0},
+            {"title": "C", "venue": "Nowhere", "town": "Unknown"},
+        ]
+    )
+
+    geocoder = table.geocode(Geocoder(cache_path=str(tmp_path / "geocode.json")))
+    records = table.to_records()
+
+    assert (records[0]["latitude"], records[0]["longitude"]) == (42.4158, -71.1543)
+    assert (records[1]["latitude"], records[1]["longitude"]) == (42.0, -71.0)
+    assert records[2]["latitude"] is None
+    assert geocoder.stats == {"venue": 1, "source": 1, "unresolved": 1}
@@ -0,0 +1,79 @@
+"""Tests for source health history and the circuit breaker."""
+
+from datetime import datetime, timedelta
+
+from scraper.health import CLOSED, HALF_OPEN, OPEN, HealthStore
+
+START = datetime(2025, 6, 1, 8, 0)
+
+
+def make_store(tmp_path):
+    return HealthStore(
+        path=str(tmp_path / "health.json"), failure_threshold=3, cooldown=3600, max_cooldown=4 * 3600, history=5
+    )
+
+
+def fail(store, name, now, ok=False):
+    store.record(name, ok=ok, elapsed=30.0, events=0, error=None if ok else "timeout", now=now)
+
+
+def test_opens_after_repeated_failures(tmp_path):
+    store = make_store(tmp_path)
+    fail(store, "Broken", START)
+    fail(store, "Broken", START)
+    assert store.state("Broken", START) == CLOSED
+
+    fail(store, "Broken", START)
+
+    assert store.state("Broken", START) == OPEN
+    assert not store.should_run("Broken", START + timedelta(minutes=59))
+    assert store.state("Broken", START + timedelta(hours=1)) == HALF_OPEN
+    assert store.should_run("Broken", START + timedelta(hours=1))
+
+
+def test_zero_yield_counts_as_failure(tmp_path):
+    store = make_store(tmp_path)
+    for _ in range(3):
+        fail(store, "Empty", START, ok=True)
+
+    assert store.state("Empty", START) == OPEN
+
+
+def test_failed_probe_doubles_cooldown_up_to_max(tmp_path):
+    store = make_store(tmp_path)
+    now = START
+    for _ in range(3):
+        fail(store, "Broken", now)
+
+    for expected in (2, 4, 4):
+        now = datetime.fromisoformat(store.sources["Broken"]["retry_at"])
+        fail(store, "Broken", now)
+        assert store.sources["Broken"]["retry_at"] == (now + timedelta(hours=expected)).isoformat()
+
+
+def test_successful_probe_closes_circuit(tmp_path):
+    store = make_store(tmp_path)
+    for _ in range(3):
+        fail(store, "Flaky", START)
+
+    probe_time = START + timedelta(hours=2)
+    store.record("Flaky", ok=True, elapsed=2.0, events=12, now=probe_time)
+
+    assert store.state("Flaky", probe_time) == CLOSED
+    assert store.sources["Flaky"]["failures"] == 0
+
+
+def test_history_summary_and_persistence(tmp_path):
+    store = make_store(tmp_path)
+    for i in range(7):
+        store.record("Boston.gov", ok=True, elapsed=float(i), events=10, now=START + timedelta(days=i))
+    fail(store, "Boston.gov", START + timedelta(days=8))
+    store.save()
+
+    reloaded = make_store(tmp_path)
+    [row] = reloaded.summary(now=START + timedelta(days=8))
+
+    assert len(reloaded.sources["Boston.gov"]["runs"]) == 5
+    assert row["state"] == CLOSED
+    assert row["success_rate"] == 0.8
+    assert row["mean_events"] == 8.0
@@ -0,0 +1,79 @@
+"""Tests for heat-map grids."""
+
+import numpy as np
+import pytest
+
+from scraper.heatmap import HeatmapGrids, cell_index, gaussian_smooth
+
+BOUNDS = (42.0, -72.0, 43.0, -71.0)
+
+
+def concert(latitude, longitude, start=None):
+    return {"title": "Concert", "venue": "Hall", "latitude": latitude, "longitude": longitude, "start": start}
+
+
+def test_cell_index_puts_north_west_first():
+    """Test that row 0 is the northern edge and points outside the bounds are dropped."""
+    latitudes = np.array([42.99, 42.01, 42.6, 41.5, np.nan])
+    longitudes = np.array([-71.99, -71.01, -71.6, -71.5, -71.5])
+
+    assert cell_index(latitudes, longitudes, BOUNDS, 4).tolist() == [0, 15, 5, -1, -1]
+
+
+def test_gaussian_smooth_spreads_mass_symmetrically():
+    """Test that smoothing keeps the total and spreads a point evenly around it."""
+    grid = np.zeros((1, 9, 9))
+    grid[0, 4, 4] = 10
+
+    smoothed = gaussian_smooth(grid, 1.0)[0]
+
+    assert smoothed.sum() == pytest.approx(10, rel=1e-3)
+    assert smoothed[4, 4] == smoothed.max()
+    assert smoothed[3, 4] == pytest.approx(smoothed[5, 4]) == pytest.approx(smoothed[4, 3])
+
+
+def test_build_bins_levels_and_windows():
+    """Test counts per level, per month and year window, and that undated concerts count only towards all."""
+    grids = HeatmapGrids.build(
+        [
+            concert(42.99, -71.99, "2025-06-14T10:00:00-04:00"),
+            concert(42.99, -71.99, "2025-07-01T10:00:00-04:00"),
+            concert(42.01, -71.01, "2026-01-04T10:00:00-05:00"),
+            concert(42.01, -71.01),
+            concert(None, None, "2025-06-14T10:00:00-04:00"),
+        ],
+        bounds=BOUNDS,
+        levels=[2, 8],
+        smoothing=0,
+    )
+
+    assert grids.windows == ["all", "2025", "2026", "2025-06", "2025-07", "2026-01"]
+    assert grids.totals == {"all": 4, "2025": 2, "2026": 1, "2025-06": 1, "2025-07": 1, "2026-01": 1}
+    assert grids.grid(8)[0, 0] == 2 and grids.grid(8)[7, 7] == 2
+    assert grids.grid(2, "2025").tolist() == [[2, 0], [0, 0]]
+    assert grids.grid(2, "2026-01").tolist() == [[0, 0], [0, 1]]
+
+
+def test_levels_must_halve():
+    """Test that levels which are not the finest divided by powers of two are rejected."""
+    with pytest.raises(ValueError):
+        HeatmapGrids.build([concert(42.5, -71.5)], bounds=BOUNDS, levels=[3, 8])
+
+
+def test_save_load_and_tiles(tmp_path):
+    """Test that saved grids load back and are served as tiles."""
+    grids = HeatmapGrids.build([concert(42.99, -71.99, "2025-06-14")], bounds=BOUNDS, levels=[4, 8], smoothing=0.5)
+    path = tmp_path / "heatmap.npz"
+    grids.save(str(path))
+
+    loaded = HeatmapGrids.load(str(path))
+
+    assert loaded.levels == [4, 8]
+    assert loaded.windows == grids.windows
+    assert loaded.bounds == BOUNDS
+    np.testing.assert_array_equal(loaded.grid(8, "2025-06"), grids.grid(8, "2025-06"))
+    np.testing.assert_array_equal(loaded.tile(8, "all", 0, 0, size=4), grids.grid(8)[:4, :4])
+    with pytest.raises(IndexError):
+        loaded.tile(8, "all", 2, 0, size=4)
+    with pytest.raises(KeyError):
+        loaded.grid(16)
@@ -0,0 +1,180 @@
+"""Tests for the conditional-GET HTTP cache."""
+
+import requests
+from requests.adapters import BaseAdapter
+
+from scraper import fetcher, http_cache, parsers
+from scraper.base_scraper import BaseScraper
+from scraper.fetcher import SessionPool
+from scraper.http_cache import HttpCache
+
+
+def make_response(body, status=200, headers=None):
+    """Build a requests.Response without touching the network."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Transport adapter that replays a list of responses in order."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class ListingScraper(BaseScraper):
+    """Scraper that counts how often it parses a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.base_url = "https://www.bpl.org"
+        self.parse_count = 0
+
+    def scrape(self):
+        return self.concerts
+
+    def records(self, url):
+        return self.fetch_records(url, "listing").result()
+
+
+def install(monkeypatch, tmp_path, responses, scraper):
+    """Route BaseScraper fetches through a scripted adapter and a temp cache."""
+
+    def extract(content, encoding, base_url):
+        scraper.parse_count += 1
+        return [{"title": content.decode(), "venue": "Hall", "town": "Boston", "date": ""}]
+
+    monkeypatch.setitem(parsers.EXTRACTORS, "listing", (extract, extract))
+    adapter = ScriptedAdapter(responses)
+    pool = SessionPool(host_settings={}, default_settings={"pool_maxsize": 1, "connect_timeout": 1, "read_timeout": 1})
+    pool.session_for("https://www.bpl.org/").mount("https://", adapter)
+    cache = HttpCache(directory=str(tmp_path / "cache"), max_bytes=10_000)
+    monkeypatch.setattr(fetcher, "get_session_pool", lambda: pool)
+    monkeypatch.setattr(http_cache, "get_http_cache", lambda: cache)
+    return adapter, cache
+
+
+def test_not_modified_reuses_records(monkeypatch, tmp_path):
+    """Test that a 304 returns cached records without parsing."""
+    scraper = ListingScraper()
+    adapter, _ = install(
+        monkeypatch,
+        tmp_path,
+        [make_response(b"Kids Concert", headers={"ETag": '"v1"'}), make_response(b"", status=304)],
+        scraper,
+    )
+
+    first = scraper.records("https://www.bpl.org/calendar/")
+    second = scraper.records("https://www.bpl.org/calendar/")
+
+    assert first == second
+    assert scraper.parse_count == 1
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_identical_body_skips_parsing(monkeypatch, tmp_path):
+    """Test that a byte-identical body without validators is not re-parsed."""
+    scraper = ListingScraper()
+    install(monkeypatch, tmp_path, [make_response(b"Kids Concert"), make_response(b"Kids Concert")], scraper)
+
+    scraper.records("https://www.bpl.org/calendar/")
+    records = scraper.records("https://www.bpl.org/calendar/")
+
+    assert records[0]["title"] == "Kids Concert"
+    assert scraper.parse_count == 1
+
+
+def test_changed_body_is_parsed(monkeypatch, tmp_path):
+    """Test that a changed body is parsed again."""
+    scraper = ListingScraper()
+    install(monkeypatch, tmp_path, [make_response(b"Kids Concert"), make_response(b"Family Concert")], scraper)
+
+    scraper.records("https://www.bpl.org/calendar/")
+    records = scraper.records("https://www.bpl.org/calendar/")
+
+    assert records[0]["title"] == "Family Concert"
+    assert scraper.parse_count == 2
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that validators and records survive a new cache instance."""
+    cache = HttpCache(directory=str(tmp_path), max_bytes=10_000)
+    cache.store("https://a.example.com/", make_response(b"page", headers={"Last-Modified": "Mon, 01 Jan 2024"}))
+    cache.store_records("https://a.example.com/", [{"title": "x"}])
+
+    reloaded = HttpCache(directory=str(tmp_path), max_bytes=10_000)
+
+    assert reloaded.conditional_headers("https://a.example.com/") == {"If-Modified-Since": "Mon, 01 Jan 2024"}
+    assert reloaded.get_records("https://a.example.com/") == [{"title": "x"}]
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted past the size cap."""
+    cache = HttpCache(directory=str(tmp_path), max_bytes=250)
+    for name in ["a", "b", "c"]:
+        url = f"https://{name}.example.com/"
+        cache.store(url, make_response(name.encode() * 100))
+        cache.store_records(url, [])
+
+    assert list(cache.entries) == ["https://b.example.com/", "https://c.example.com/"]
+
+    cache.store("https://d.example.com/", make_response(b"d" * 100))
+    cache.store_records("https://d.example.com/", [])
+    cache.get_records("https://c.example.com/")
+    cache.store("https://e.example.com/", make_response(b"e" * 100))
+
+    assert "https://c.example.com/" in cache.entries
+    assert "https://d.example.com/" not in cache.entries
+    assert cache.total_bytes <= 250
+
+
+def test_changed_extractor_settings_parse_again(monkeypatch, tmp_path):
+    """Test that records cached by an older extractor or other options are not reused."""
+    scraper = ListingScraper()
+    adapter, _ = install(
+        monkeypatch,
+        tmp_path,
+        [
+            make_response(b"Kids Concert", headers={"ETag": '"v1"'}),
+            make_response(b"Kids Concert"),
+            make_response(b"", status=304),
+        ],
+        scraper,
+    )
+
+    scraper.records("https://www.bpl.org/calendar/")
+    monkeypatch.setattr(parsers, "EXTRACTOR_VERSION", parsers.EXTRACTOR_VERSION + 1)
+    scraper.records("https://www.bpl.org/calendar/")
+    scraper.records("https://www.bpl.org/calendar/")
+
+    assert "If-None-Match" not in adapter.requests[1].headers
+    assert scraper.parse_count == 2
+    key = parsers.extractor_key("listing", "https://x", {})
+    assert key != parsers.extractor_key("listing", "https://x", {"page": 2})
+
+
+def test_hit_does_not_rewrite_index(tmp_path):
+    """Test that reading cached records leaves the index file alone."""
+    cache = HttpCache(directory=str(tmp_path), max_bytes=10_000)
+    cache.store("https://a.example.com/", make_response(b"page"), key="k")
+    cache.store_records("https://a.example.com/", [{"title": "x"}], key="k")
+    before = (tmp_path / "index.json").stat().st_mtime_ns
+
+    assert cache.get_records("https://a.example.com/", "k") == [{"title": "x"}]
+    assert cache.get_records("https://a.example.com/", "other") is None
+    assert (tmp_path / "index.json").stat().st_mtime_ns == before
@@ -0,0 +1,51 @@
+"""Tests for the compiled keyword matcher."""
+
+from scraper.base_scraper import Concert
+from scraper.config import CHILD_FRIENDLY_KEYWORDS
+from scraper.keywords import CHILD_FRIENDLY, KeywordMatcher
+
+
+def test_substring_matching_is_case_insensitive():
+    """Test default matching behaves like keyword in text.lower()."""
+    matcher = KeywordMatcher(["kids", "all ages"])
+
+    assert matcher.search("KIDS Rock Concert")
+    assert matcher.search("Fun for All Ages!")
+    assert matcher.search("Kidstown jamboree")
+    assert not matcher.search("Adult Jazz Night")
+    assert not matcher.search("")
+
+
+def test_whole_words():
+    """Test that whole-word matching respects word boundaries."""
+    matcher = KeywordMatcher(["sing", "band"], whole_words=True)
+
+    assert matcher.search("Sing-along for families")
+    assert not matcher.search("Famous singer in concert")
+    assert not matcher.search("Bandstand tour")
+
+
+def test_matches_reports_keywords():
+    """Test that matches returns the canonical keywords found."""
+    matcher = KeywordMatcher(CHILD_FRIENDLY_KEYWORDS)
+
+    assert matcher.matches("Family concert for Children and YOUTH") == {"family", "children", "youth"}
+    assert matcher.matches("Jazz night") == set()
+
+
+def test_search_many_matches_individual_search():
+    """Test that batch results line up with per-text results."""
+    texts = ["Kids show", "", None, "Jazz", "toddler time", "all", "ages", "young at heart"]
+
+    assert CHILD_FRIENDLY.search_many(texts) == [CHILD_FRIENDLY.search(t or "") for t in texts]
+
+
+def test_filter_concerts():
+    """Test filtering concerts on title and description."""
+    concerts = [
+        Concert(title="Rock Night", venue="V", town="Boston", date="", description="For the whole family"),
+        Concert(title="Jazz Night", venue="V", town="Boston", date="", description=None),
+        Concert(title="Kids Sing-Along", venue="V", town="Boston", date=""),
+    ]
+
+    assert [c.title for c in CHILD_FRIENDLY.filter(concerts)] == ["Rock Night", "Kids Sing-Along"]
@@ -0,0 +1,74 @@
+"""Tests for the partitioned Parquet export."""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from scraper.base_scraper import Concert  # noqa: E402
+from scraper.parquet_export import read_parquet, write_parquet  # noqa: E402
+
+
+def concert(title, town, date, source="Boston.gov"):
+    return Concert(title=title, venue=f"{town} Hall", town=town, date=date, source=source, scraped_at="2025-06-01T08:00:00")
+
+
+def test_partitions_by_town_and_month(tmp_path):
+    """Test the Hive layout, column types and partition pruning."""
+    write_parquet(
+        [
+            concert("a", "Boston", "2025-06-14T10:00:00"),
+            concert("b", "Cambridge", "2025-06-20T10:00:00-04:00"),
+            concert("c", "Cambridge", "2025-07-01"),
+            concert("d", "Cambridge", "Saturday afternoon"),
+        ],
+        str(tmp_path),
+    )
+
+    assert (tmp_path / "town=Cambridge" / "month=2025-06" / "part-0.parquet").exists()
+    schema = pq.read_schema(tmp_path / "town=Cambridge" / "month=2025-06" / "part-0.parquet")
+    assert pa.types.is_dictionary(schema.field("venue").type)
+    assert pa.types.is_timestamp(schema.field("start").type)
+    assert pa.types.is_timestamp(schema.field("scraped_at").type)
+
+    june = read_parquet(str(tmp_path), columns=["title", "start"], towns=["Cambridge"], months=["2025-06"])
+    assert list(june["title"]) == ["b"]
+    assert str(june["start"][0]) == "2025-06-20 10:00:00"
+    assert sorted(read_parquet(str(tmp_path), columns=["title"])["title"]) == ["a", "b", "c", "d"]
+
+
+def test_partial_run_keeps_other_sources(tmp_path):
+    """Test that a later run replaces its own events and keeps other rows in the partitions it touches."""
+    write_parquet(
+        [
+            concert("a", "Boston", "2025-06-14"),
+            concert("b", "Boston", "2025-06-20", source="Eventbrite"),
+            concert("c", "Boston", "2025-07-14"),
+        ],
+        str(tmp_path),
+    )
+    changed = concert("a", "Boston", "2025-06-14")
+    changed.description = "Now with a sing-along"
+    write_parquet([changed, concert("d", "Boston", "2025-06-21")], str(tmp_path))
+
+    rows = read_parquet(str(tmp_path), columns=["title", "description", "event_id"])
+    assert sorted(rows["title"]) == ["a", "b", "c", "d"]
+    assert rows.set_index("title").loc["a", "description"] == "Now with a sing-along"
+    assert rows["event_id"].notna().all()
+
+
+def test_moved_event_leaves_its_old_partition(tmp_path):
+    """Test that an event moved to another town and month is stored once, and its emptied partition goes."""
+    moved = concert("a", "Boston", "Saturday afternoon")
+    moved.start = "2025-06-14T14:00:00"
+    write_parquet([moved, concert("b", "Boston", "2025-07-01")], str(tmp_path))
+
+    moved.town, moved.start = "Cambridge", "2025-08-16T14:00:00"
+    write_parquet([moved], str(tmp_path))
+
+    rows = read_parquet(str(tmp_path), columns=["title", "town", "month"])
+    assert sorted(zip(rows["title"], rows["town"], rows["month"])) == [
+        ("a", "Cambridge", "2025-08"),
+        ("b", "Boston", "2025-07"),
+    ]
+    assert not (tmp_path / "town=Boston" / "month=2025-06").exists()
@@ -0,0 +1,76 @@
+"""Tests for the event extractors."""
+
+from pathlib import Path
+
+import pytest
+import requests
+
+from scraper.parsers import EXTRACTORS, declared_encoding, extract_boston_gov, extract_library
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+LIBRARY_OPTIONS = {"town": "Boston", "source": "Boston Public Library", "default_venue": "Boston Public Library"}
+
+PAGES = [
+    ("boston_gov", "boston_gov_events.html", "https://www.boston.gov", {}),
+    ("library", "library_calendar.html", "https://www.bpl.org", LIBRARY_OPTIONS),
+    ("timeout", "timeout_listing.html", "https://www.timeout.com", {}),
+    ("boston_com", "boston_com_listing.html", "https://www.boston.com", {}),
+    ("boston_central", "boston_central_events.html", "https://www.bostoncentral.com", {}),
+]
+
+
+@pytest.mark.parametrize("site,fixture,base_url,options", PAGES)
+def test_fast_path_matches_soup_path(site, fixture, base_url, options):
+    """Test that the lxml fast path extracts exactly what BeautifulSoup does."""
+    content = (FIXTURES / fixture).read_bytes()
+    fast, soup = EXTRACTORS[site]
+
+    fast_records = fast(content, "utf-8", base_url, **options)
+
+    assert fast_records
+    assert fast_records == soup(content, "utf-8", base_url, **options)
+
+
+def test_boston_gov_fields():
+    """Test Boston.gov field extraction."""
+    content = (FIXTURES / "boston_gov_events.html").read_bytes()
+
+    records = extract_boston_gov(content, "utf-8", "https://www.boston.gov")
+
+    assert len(records) == 3
+    assert records[0]["title"] == "Family Music Festival on City Hall Plaza"
+    assert records[0]["url"] == "https://www.boston.gov/events/city-hall-plaza/family-music-festival"
+    assert records[0]["date"] == "Saturday, June 14, 2025 · 11:00AM - 3:00PM"
+    assert records[1]["title"] == "Storytime & Songs"
+    assert "café" in records[2]["description"]
+
+
+def test_library_music_filter():
+    """Test that non-music library events are skipped."""
+    content = (FIXTURES / "library_calendar.html").read_bytes()
+
+    records = extract_library(content, "utf-8", "https://www.bpl.org", **LIBRARY_OPTIONS)
+
+    titles = [r["title"] for r in records]
+    assert "Book Club" not in titles
+    assert records[0]["date"] == "2025-07-02T10:30:00-04:00"
+    assert records[1]["date"] == "Saturday, July 5"
+    assert records[1]["venue"] == "Jamaica Plain Branch"
+
+
+def test_empty_page():
+    """Test that an empty body yields no records."""
+    for fast, _ in EXTRACTORS.values():
+        options = LIBRARY_OPTIONS if fast is extract_library else {}
+        assert fast(b"", None, "https://example.com", **options) == []
+
+
+def test_declared_encoding():
+    """Test reading the charset from the Content-Type header."""
+    response = requests.Response()
+    response.headers["Content-Type"] = 'text/html; charset="ISO-8859-1"'
+    assert declared_encoding(response) == "ISO-8859-1"
+
+    response.headers["Content-Type"] = "text/html"
+    assert declared_encoding(response) is None
@@ -0,0 +1,33 @@
+"""Tests for the fetch/parse pipeline."""
+
+from pathlib import Path
+
+import pytest
+
+from scraper.pipeline import ParsePool
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_process_pool_matches_inline():
+    """Test that worker processes return the same plain records as inline parsing."""
+    content = (FIXTURES / "boston_gov_events.html").read_bytes()
+    pool = ParsePool(workers=2)
+    try:
+        futures = [pool.submit("boston_gov", content, "utf-8", "https://www.boston.gov") for _ in range(4)]
+        results = [f.result(timeout=60) for f in futures]
+    finally:
+        pool.shutdown()
+
+    inline = ParsePool(workers=0).submit("boston_gov", content, "utf-8", "https://www.boston.gov").result()
+    assert inline
+    assert all(records == inline for records in results)
+    assert all(isinstance(record, dict) for record in results[0])
+
+
+def test_inline_errors_surface_through_future():
+    """Test that extractor errors are raised from the future, not at submit time."""
+    future = ParsePool(workers=0).submit("no_such_site", b"", None, "")
+
+    with pytest.raises(KeyError):
+        future.result()
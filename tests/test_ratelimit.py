@@ -0,0 +1,56 @@
+"""Tests for the token-bucket rate limiter."""
+
+import pytest
+
+from scraper.ratelimit import TokenBucket, get_bucket
+
+
+class FakeClock:
+    """Clock that only moves when the bucket sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_then_throttled():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        assert bucket.acquire()
+
+    # Three tokens up front, then one every half second
+    assert clock.now == pytest.approx(1.0)
+    assert not bucket.try_acquire()
+
+
+def test_refill_is_capped_at_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire(2)
+
+    clock.now += 100
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+
+
+def test_acquire_gives_up_at_timeout():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+
+    assert not bucket.acquire(timeout=1)
+    assert clock.sleeps == []
+    assert bucket.acquire(timeout=2)
+
+
+def test_get_bucket_is_shared_by_name():
+    assert get_bucket("test-api", 1, 5) is get_bucket("test-api", 2, 10)
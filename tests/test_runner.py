@@ -0,0 +1,137 @@
+"""Tests for concurrent scraper orchestration."""
+
+import time
+
+from scraper.base_scraper import BaseScraper, Concert
+from scraper.health import HealthStore
+from scraper.runner import run_scrapers
+
+
+def make_scraper(name, delay=0.0, fail=False):
+    """Build a scraper class that sleeps, then returns one concert or raises."""
+
+    class DelayedScraper(BaseScraper):
+        def scrape(self):
+            time.sleep(delay)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            self.concerts.append(
+                Concert(title=f"{name} Kids Show", venue="Hall", town="Boston", date="", source=name)
+            )
+            return self.concerts
+
+    return DelayedScraper
+
+
+def test_run_scrapers_concurrently():
+    """Test that total time tracks the slowest source, not the sum."""
+    jobs = [(f"source{i}", make_scraper(f"source{i}", delay=0.3)) for i in range(4)]
+
+    start = time.monotonic()
+    results = list(run_scrapers(jobs, workers=4, deadline=5))
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 4
+    assert all(r.ok for r in results)
+    assert sum(len(r.concerts) for r in results) == 4
+    assert elapsed < 1.0
+
+
+def test_results_arrive_as_they_finish():
+    """Test that faster sources are yielded first."""
+    jobs = [
+        ("slow", make_scraper("slow", delay=0.4)),
+        ("fast", make_scraper("fast", delay=0.0)),
+    ]
+
+    names = [r.name for r in run_scrapers(jobs, workers=2, deadline=5)]
+
+    assert names == ["fast", "slow"]
+
+
+def test_failures_are_isolated():
+    """Test that one failing source does not affect the others."""
+    jobs = [
+        ("broken", make_scraper("broken", fail=True)),
+        ("working", make_scraper("working")),
+    ]
+
+    results = {r.name: r for r in run_scrapers(jobs, workers=2, deadline=5)}
+
+    assert not results["broken"].ok
+    assert "broken broke" in results["broken"].error
+    assert results["working"].ok
+    assert len(results["working"].concerts) == 1
+
+
+def test_deadline_abandons_slow_source():
+    """Test that a source missing its deadline is reported as timed out."""
+    jobs = [
+        ("hung", make_scraper("hung", delay=2.0)),
+        ("quick", make_scraper("quick")),
+    ]
+
+    start = time.monotonic()
+    results = {r.name: r for r in run_scrapers(jobs, workers=2, deadline=0.3)}
+    elapsed = time.monotonic() - start
+
+    assert results["hung"].timed_out
+    assert results["hung"].concerts == []
+    assert results["quick"].ok
+    assert elapsed < 1.5
+
+
+def test_open_circuit_skips_source(tmp_path):
+    """Test that a source with an open breaker is skipped and outcomes are recorded."""
+    health = HealthStore(path=str(tmp_path / "health.json"), failure_threshold=2)
+    jobs = [("broken", make_scraper("broken", fail=True)), ("good", make_scraper("good"))]
+
+    for _ in range(2):
+        list(run_scrapers(jobs, workers=2, deadline=5, health=health))
+    results = {r.name: r for r in run_scrapers(jobs, workers=2, deadline=5, health=health)}
+
+    assert results["broken"].skipped
+    assert not results["broken"].ok
+    assert results["good"].ok
+    assert len(health.sources["broken"]["runs"]) == 2
+    assert len(health.sources["good"]["runs"]) == 3
+
+    forced = {r.name: r for r in run_scrapers(jobs, workers=2, deadline=5, health=health, skip_open=False)}
+    assert not forced["broken"].skipped
+
+
+def test_incremental_source_may_find_nothing(tmp_path):
+    """Test that empty runs open the breaker, except for a source that only scrapes changes."""
+    health = HealthStore(path=str(tmp_path / "health.json"), failure_threshold=2)
+
+    class EmptyScraper(BaseScraper):
+        def scrape(self):
+            return self.concerts
+
+    class NothingNewScraper(EmptyScraper):
+        def __init__(self):
+            super().__init__()
+            self.incremental = True
+
+    jobs = [("empty", EmptyScraper), ("nothing new", NothingNewScraper)]
+    for _ in range(2):
+        list(run_scrapers(jobs, workers=2, deadline=5, health=health))
+
+    assert not health.should_run("empty")
+    assert health.should_run("nothing new")
+
+
+def test_abandoned_source_frees_its_slot():
+    """Test that with one worker, a source queued behind a hung one still runs once the hung one is abandoned."""
+    jobs = [
+        ("hung", make_scraper("hung", delay=5.0)),
+        ("queued", make_scraper("queued")),
+    ]
+
+    start = time.monotonic()
+    results = {r.name: r for r in run_scrapers(jobs, workers=1, deadline=0.3)}
+    elapsed = time.monotonic() - start
+
+    assert results["hung"].timed_out
+    assert results["queued"].ok
+    assert elapsed < 1.5
@@ -0,0 +1,109 @@
+"""Tests for the read-only query server."""
+
+import gzip
+import json
+import threading
+import urllib.request
+from urllib.error import HTTPError
+
+import pytest
+
+from scraper.server import ConcertIndex, ConcertServer
+
+
+def concert(eid, town="Cambridge", start="2025-06-14T10:00:00-04:00", source="Eventbrite"):
+    return {"event_id": eid, "title": f"Concert {eid}", "town": town, "start": start, "source": source}
+
+
+CONCERTS = [
+    concert("a", start="2025-06-30T19:00:00-04:00"),
+    concert("b", start="2025-06-01T10:00:00-04:00"),
+    concert("c", town="Boston", start="2025-06-15T10:00:00-04:00"),
+    concert("d", source="Boston.gov", start="2025-07-01T10:00:00-04:00"),
+    concert("e", start=None),
+]
+
+
+def ids(index, positions):
+    return [index.records[position]["event_id"] for position in positions]
+
+
+def test_query_by_town_source_and_dates():
+    """Test that filters combine, bounds are inclusive and results come in start order."""
+    index = ConcertIndex(CONCERTS)
+
+    assert ids(index, index.query(town="cambridge")) == ["b", "a", "d", "e"]
+    assert ids(index, index.query(town="Cambridge", since="2025-06-01", until="2025-06-30")) == ["b", "a"]
+    assert ids(index, index.query(until="2025-06-30T18:00")) == ["b", "c"]
+    assert ids(index, index.query(town="Cambridge", source="Boston.gov")) == ["d"]
+    assert ids(index, index.query(since="2025-06-02")) == ["c", "a", "d"]
+    assert index.query(town="Lowell") == []
+
+
+def test_page():
+    """Test that a page reports the total and the next offset."""
+    index = ConcertIndex(CONCERTS)
+    body = json.loads(index.page(index.query(town="Cambridge"), offset=1, limit=2))
+
+    assert (body["total"], body["next"]) == (4, 3)
+    assert [c["event_id"] for c in body["concerts"]] == ["a", "d"]
+    assert json.loads(index.page([], 0, 10)) == {"total": 0, "offset": 0, "limit": 10, "next": None, "concerts": []}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr("scraper.config.SERVER_GZIP_MIN_BYTES", 100)
+    path = tmp_path / "concerts.json"
+    path.write_text(json.dumps(CONCERTS))
+    server = ConcertServer(("127.0.0.1", 0), str(path), reload_interval=60)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, **headers):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}{path}", headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_gzip_etag_and_not_modified(server):
+    """Test gzipped responses, and a 304 for a request with a matching ETag."""
+    status, headers, body = get(server, "/concerts?town=Cambridge&limit=2", **{"Accept-Encoding": "gzip"})
+
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    assert [c["event_id"] for c in json.loads(gzip.decompress(body))["concerts"]] == ["b", "a"]
+
+    revalidate = {"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]}
+    status, _, body = get(server, "/concerts?limit=2&town=Cambridge", **revalidate)
+    assert (status, body) == (304, b"")
+    status, plain, _ = get(server, "/concerts?town=Cambridge&limit=2")
+    assert status == 200 and "Content-Encoding" not in plain and plain["ETag"] != headers["ETag"]
+
+
+def test_endpoints_and_errors(server):
+    """Test the detail and count endpoints, and rejected requests."""
+    assert json.loads(get(server, "/concerts/c")[2])["town"] == "Boston"
+    assert json.loads(get(server, "/towns")[2]) == {"Boston": 1, "Cambridge": 4}
+    assert get(server, "/concerts/missing")[0] == 404
+    assert get(server, "/nowhere")[0] == 404
+    assert get(server, "/concerts?limit=0")[0] == 400
+    assert get(server, "/concerts?since=June")[0] == 400
+
+
+def test_hot_swap(server, tmp_path):
+    """Test that a rewritten dataset is swapped in and changes the ETag."""
+    _, before, _ = get(server, "/towns")
+    assert server.reload() is False
+
+    (tmp_path / "concerts.json").write_text(json.dumps(CONCERTS + [concert("f", town="Newton")]))
+    assert server.reload() is True
+
+    status, after, body = get(server, "/towns", **{"If-None-Match": before["ETag"]})
+    assert status == 200 and after["ETag"] != before["ETag"]
+    assert json.loads(body)["Newton"] == 1
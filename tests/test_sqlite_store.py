@@ -0,0 +1,116 @@
+"""Tests for the SQLite storage backend."""
+
+import pytest
+
+from scraper.sqlite_store import ConcertStore, normalize_date
+
+
+def record(title, town="Boston", date="2025-06-14T10:00:00", source="Boston.gov", **fields):
+    return {
+        "title": title,
+        "venue": "Main Hall",
+        "town": town,
+        "date": date,
+        "url": f"https://example.com/{title}",
+        "description": "",
+        "address": None,
+        "source": source,
+        "scraped_at": "2025-06-01T00:00:00",
+        **fields,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ConcertStore(str(tmp_path / "concerts.db")) as store:
+        store.save(
+            [
+                record("a", date="2025-06-01"),
+                record("b", town="Cambridge", date="2025-06-14T10:00:00-04:00"),
+                record("c", town="Cambridge", date="2025-06-30T19:30", source="Eventbrite"),
+                record("d", town="Cambridge", date="2025-07-01T09:00:00"),
+                record("e", date="Saturday afternoon", sources=[{"source": "Boston.gov", "url": "u"}]),
+            ]
+        )
+        yield store
+
+
+def test_normalize_date():
+    """Test that ISO dates are truncated to a sortable form and others dropped."""
+    assert normalize_date("2025-06-14T10:00:00-04:00") == "2025-06-14T10:00:00"
+    assert normalize_date("2025-06-30T19:30") == "2025-06-30T19:30:00"
+    assert normalize_date("2025-06-01") == "2025-06-01"
+    assert normalize_date("Saturday afternoon") is None
+
+
+def test_query_by_town_and_date_range(store):
+    """Test that a bare --until day includes events later that day."""
+    rows = store.query(town="cambridge", since="2025-06-01", until="2025-06-30")
+
+    assert [r["title"] for r in rows] == ["b", "c"]
+
+
+def test_query_by_source_and_count(store):
+    """Test source filtering and counting."""
+    assert [r["title"] for r in store.query(source="Eventbrite")] == ["c"]
+    assert store.count(town="Boston") == 2
+    assert len(store) == 5
+
+
+def test_save_upserts_by_event_id(store):
+    """Test that saving an event again updates it and keeps first_seen."""
+    store.save([record("a", date="2025-06-01", description="Updated", scraped_at="2025-06-02T00:00:00")])
+
+    row = store.query(since="2025-06-01", until="2025-06-01")[0]
+    assert len(store) == 5
+    assert row["description"] == "Updated"
+    assert row["first_seen"] == "2025-06-01T00:00:00"
+    assert row["last_seen"] == "2025-06-02T00:00:00"
+
+
+def test_sources_round_trip(store):
+    """Test that provenance lists are stored as JSON."""
+    row = [r for r in store.query(town="Boston") if r["title"] == "e"][0]
+
+    assert row["sources"] == [{"source": "Boston.gov", "url": "u"}]
+    assert row["date_norm"] is None
+
+
+def test_queries_use_indexes(store):
+    """Test that town and date filters are answered from an index."""
+    plan = " ".join(
+        str(tuple(row))
+        for row in store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM concerts WHERE town = ? AND date_norm >= ? ORDER BY date_norm",
+            ("Boston", "2025-06-01"),
+        )
+    )
+
+    assert "idx_concerts_town_date" in plan
+
+
+def test_normalized_start_is_indexed(tmp_path):
+    """Test that a free-text date with a normalized start can be range-queried."""
+    with ConcertStore(str(tmp_path / "concerts.db")) as store:
+        store.save([record("f", date="Saturday, June 14, 2025 · 11:00AM", start="2025-06-14T11:00:00-04:00")])
+
+        [row] = store.query(since="2025-06-14", until="2025-06-14")
+        assert row["date_norm"] == "2025-06-14T11:00:00"
+        assert row["start"] == "2025-06-14T11:00:00-04:00"
+
+
+def test_adds_columns_to_older_database(tmp_path):
+    """Test that a database created before start/end and coordinates existed is upgraded in place."""
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE concerts (event_id TEXT PRIMARY KEY, title TEXT, date_norm TEXT)")
+    conn.commit()
+    conn.close()
+
+    with ConcertStore(path) as store:
+        store.save([record("g", start="2025-06-14T10:00:00-04:00", latitude=42.3601, longitude=-71.0589)])
+        [row] = store.query()
+        assert row["start"] == "2025-06-14T10:00:00-04:00"
+        assert (row["latitude"], row["longitude"]) == (42.3601, -71.0589)
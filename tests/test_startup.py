@@ -0,0 +1,72 @@
+"""Tests that the CLI starts without loading the heavy dependencies."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from scraper import registry
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["pandas", "numpy", "bs4", "lxml", "requests"]
+# Starting Python and importing main.py may take this many times as long as
+# starting a bare interpreter; measured at about 1.2x, while importing
+# requests alone takes about 4x and pandas about 15x
+STARTUP_BUDGET_FACTOR = float(os.environ.get("STARTUP_BUDGET_FACTOR", 3))
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_help_does_not_load_heavy_modules():
+    """Test that main.py --help prints usage without importing pandas, requests or the parsers."""
+    script = "import sys, main\nsys.argv = ['main.py', '--help']\ntry:\n    main.main()\nexcept SystemExit:\n    pass\n"
+    script += f"print('loaded:', [m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    output = run_python("-c", script).stdout
+    assert "--scrapers" in output
+    assert output.splitlines()[-1] == "loaded: []"
+
+
+def test_import_main_does_not_load_heavy_modules():
+    """Test that importing main.py defers every heavy dependency; benchmarks/bench_startup.py times it."""
+    script = f"import sys, main\nprint([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    assert run_python("-c", script).stdout.strip() == "[]"
+
+
+def startup_time(code, runs=5):
+    """Return the fastest of several wall-clock times to run ``code`` in a fresh interpreter."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_python("-c", code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_import_main_within_budget():
+    """Test that importing main.py costs a small multiple of a bare interpreter start, on this machine."""
+    baseline = startup_time("pass")
+    assert startup_time("import main") < STARTUP_BUDGET_FACTOR * baseline
+
+
+def test_build_jobs_loads_only_selected_scrapers():
+    """Test that building jobs imports only the selected scrapers' modules."""
+    script = (
+        "import sys\nfrom scraper.registry import build_jobs\n"
+        "jobs = build_jobs(['bostoncentral'])\n"
+        "print([label for label, _ in jobs], 'scraper.boston_events_scraper' in sys.modules)"
+    )
+    assert run_python("-c", script).stdout.strip() == "['BostonCentral'] False"
+
+
+def test_build_jobs_skips_scraper_without_api_key(monkeypatch):
+    """Test that Eventbrite is left out without an API key and built lazily with one."""
+    monkeypatch.delenv("EVENTBRITE_API_KEY", raising=False)
+    assert registry.build_jobs(["eventbrite"]) == []
+
+    monkeypatch.setenv("EVENTBRITE_API_KEY", "test")
+    [(label, factory)] = registry.build_jobs(["eventbrite"])
+    assert label == "Eventbrite"
+    assert factory().location == "Boston, MA"
@@ -0,0 +1,101 @@
+"""Tests for the columnar ConcertTable."""
+
+from datetime import datetime
+
+from scraper.base_scraper import Concert
+from scraper.table import ConcertTable
+
+
+def make_concert(title, town="Boston", date="2025-06-01T10:00:00", description=""):
+    return Concert(title=title, venue=f"{town} Hall", town=town, date=date, description=description, source="Test")
+
+
+def test_append_concerts_and_records():
+    """Test that Concert objects and record dicts land in the same columns."""
+    table = ConcertTable()
+    table.append(make_concert("Kids Rock", town="Cambridge"))
+    table.append({"title": "Family Folk", "venue": "Hall", "town": "Newton", "date": ""})
+
+    assert len(table) == 2
+    assert str(table.frame["town"].dtype) == "category"
+    assert [c.title for c in table] == ["Kids Rock", "Family Folk"]
+    assert table[1].town == "Newton"
+    assert table[1].scraped_at is not None
+
+
+def test_extend_merges_categories():
+    """Test that joining tables with different towns keeps categorical columns."""
+    first = ConcertTable.from_concerts([make_concert("A", town="Boston")])
+    second = ConcertTable.from_concerts([make_concert("B", town="Lexington")])
+
+    first.extend(second)
+
+    assert str(first.frame["town"].dtype) == "category"
+    assert list(first.frame["town"]) == ["Boston", "Lexington"]
+
+
+def test_filter_keywords():
+    """Test vectorized keyword filtering over title and description."""
+    table = ConcertTable.from_concerts(
+        [
+            make_concert("Kids Rock Concert"),
+            make_concert("Jazz Night", description="Late set"),
+            make_concert("Morning Music", description="Fun for the whole FAMILY"),
+        ]
+    )
+
+    filtered = table.filter_keywords(["kids", "family"])
+
+    assert [c.title for c in filtered] == ["Kids Rock Concert", "Morning Music"]
+
+
+def test_between_selects_date_range():
+    """Test date-range selection; unparseable dates are never selected."""
+    table = ConcertTable.from_concerts(
+        [
+            make_concert("May", date="2025-05-31T10:00:00"),
+            make_concert("June", date="2025-06-15T10:00:00-04:00"),
+            make_concert("July", date="2025-07-01"),
+            make_concert("Unknown", date="Saturday afternoon"),
+        ]
+    )
+
+    june = table.between(datetime(2025, 6, 1), datetime(2025, 7, 1))
+
+    assert [c.title for c in june] == ["June"]
+    assert [c.title for c in table.between(start=datetime(2025, 6, 1))] == ["June", "July"]
+
+
+def test_count_by_town():
+    """Test group-by counts, largest first."""
+    table = ConcertTable.from_concerts(
+        [make_concert("A", town="Cambridge"), make_concert("B"), make_concert("C", town="Cambridge")]
+    )
+
+    counts = table.count_by("town")
+
+    assert counts.to_dict() == {"Cambridge": 2, "Boston": 1}
+
+
+def test_records_use_none_for_missing_values():
+    """Test that missing values come back as None, as in Concert.to_dict()."""
+    table = ConcertTable.from_concerts([Concert(title="A", venue=None, town="Boston", date="")])
+
+    record = table.to_records()[0]
+
+    assert record["venue"] is None
+    assert record["url"] is None
+
+
+def test_iter_records_streams_pending_rows():
+    """Test that appended rows are streamed without building the frame, after any rows already in it."""
+    table = ConcertTable.from_concerts([make_concert("A")])
+    assert table._frame is None
+
+    assert [r["title"] for r in table.iter_records()] == ["A"]
+    assert table._frame is None
+
+    table.frame
+    table.append(make_concert("B"))
+    assert [r["title"] for r in table.iter_records(chunk_size=1)] == ["A", "B"]
+    assert table._pending_rows == 1
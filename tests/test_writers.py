@@ -0,0 +1,58 @@
+"""Tests for the streaming JSON Lines and CSV writers."""
+
+import csv
+import json
+
+import pytest
+
+from scraper.base_scraper import Concert
+from scraper.writers import FIELDS, atomic_open, read_jsonl, write_concerts
+
+
+def generate_concerts(count):
+    for i in range(count):
+        yield Concert(title=f"Concert {i}", venue="Hall, Main St", town="Boston", date="2025-06-01", url=None)
+
+
+def test_write_concerts_streams_a_generator(tmp_path):
+    """Test that a generator is written to both formats in one pass."""
+    jsonl_path = tmp_path / "out" / "concerts.jsonl"
+    csv_path = tmp_path / "out" / "concerts.csv"
+
+    count = write_concerts(generate_concerts(3), str(jsonl_path), str(csv_path))
+
+    assert count == 3
+    records = list(read_jsonl(str(jsonl_path)))
+    assert [r["title"] for r in records] == ["Concert 0", "Concert 1", "Concert 2"]
+    assert records[0]["url"] is None
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == FIELDS
+    assert rows[1]["venue"] == "Hall, Main St"
+    assert rows[1]["url"] == ""
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    """Test that an error mid-stream leaves the old output and no temp files."""
+    path = tmp_path / "concerts.jsonl"
+    path.write_text('{"title": "old"}\n')
+
+    def broken():
+        yield {"title": "new"}
+        raise RuntimeError("scraper crashed")
+
+    with pytest.raises(RuntimeError):
+        write_concerts(broken(), jsonl_path=str(path))
+
+    assert path.read_text() == '{"title": "old"}\n'
+    assert [p.name for p in tmp_path.iterdir()] == ["concerts.jsonl"]
+
+
+def test_atomic_open_replaces_file(tmp_path):
+    """Test that the destination is only replaced when the block succeeds."""
+    path = tmp_path / "data.json"
+
+    with atomic_open(path) as f:
+        json.dump({"ok": True}, f)
+
+    assert json.loads(path.read_text()) == {"ok": True}